@@ -0,0 +1,83 @@
+"""
+Dashboard rerun cost at large process counts.
+
+Compares the old rerun (pie, bar and a full 3D scatter built and
+serialized every time, plus a table styled by a Python function per row)
+with the new one (only the selected figure, 3D scatter downsampled,
+vectorized column styling). Figure caching makes repeated reruns on the
+same snapshot nearly free, so this measures the cost of a new snapshot.
+
+Usage (from the repository root):
+    python benchmarks/bench_charts.py --sizes 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import pandas as pd
+
+from src import charts
+
+
+def synthetic_snapshot(n_rows, rng):
+    prediction = (rng.random(n_rows) < 0.02).astype(int)
+    return pd.DataFrame({
+        "process_name": [f"proc-{i}" for i in range(n_rows)],
+        "pid": np.arange(n_rows) + 1000,
+        "cpu_usage": rng.gamma(1.0, 3.0, n_rows),
+        "memory_usage": rng.lognormal(3, 1.5, n_rows),
+        "network_packets": rng.poisson(5, n_rows),
+        "num_threads": rng.integers(1, 64, n_rows),
+        "prediction": prediction,
+        "threat_probability": np.where(prediction == 1, 0.8, 0.1),
+        "threat_score": rng.random(n_rows) * 3,
+    })
+
+
+def old_rerun(df):
+    payload = 0
+    for build in (charts.threat_pie, charts.top_cpu_bar):
+        payload += len(build(df).to_json())
+    payload += len(charts.scatter_3d(df, max_points=len(df)).to_json())
+
+    def color_row(row):
+        return [charts.SUSPICIOUS_CSS if row["prediction"] == 1 else charts.NORMAL_CSS for _ in row]
+    df.sort_values("threat_score", ascending=False).style.apply(color_row, axis=1)._compute()
+    return payload
+
+
+def new_rerun(df):
+    payload = len(charts.scatter_3d(df).to_json())
+    charts.highlight_predictions(df.sort_values("threat_score", ascending=False))._compute()
+    return payload
+
+
+def timed(fn, df):
+    started = time.perf_counter()
+    payload = fn(df)
+    return time.perf_counter() - started, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Old vs new dashboard rerun cost")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'processes':>10} {'old (s)':>9} {'old KB':>8} {'new (s)':>9} {'new KB':>8} {'speedup':>8}")
+    for n_rows in args.sizes:
+        df = synthetic_snapshot(n_rows, rng)
+        old_time, old_payload = timed(old_rerun, df)
+        new_time, new_payload = timed(new_rerun, df)
+        print(f"{n_rows:>10} {old_time:>9.3f} {old_payload / 1024:>8.0f} "
+              f"{new_time:>9.3f} {new_payload / 1024:>8.0f} {old_time / new_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
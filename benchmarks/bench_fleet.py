@@ -0,0 +1,85 @@
+"""
+Aggregator ingest load test on localhost.
+
+Starts the aggregator's HTTP server and fires batches from many
+simulated agents at once (one thread per agent, each sending a
+synthetic snapshot every round). Reports batch size, ingest throughput
+and how many hosts the fleet state ended up with. No model is needed:
+only the ingest path is measured.
+
+Usage (from the repository root):
+    python benchmarks/bench_fleet.py --agents 200 --processes 300 --rounds 5
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import pandas as pd
+
+from src.agent import encode_batch, send_batch
+from src.aggregator import FleetServer, FleetState
+from src.config import FEATURE_COLS
+
+
+def synthetic_features(n_rows, rng):
+    df = pd.DataFrame({col: rng.random(n_rows) * 100 for col in FEATURE_COLS})
+    df.insert(0, "process_name", [f"proc-{i % 97}" for i in range(n_rows)])
+    df.insert(1, "pid", np.arange(n_rows) + 1000)
+    df.insert(2, "create_time", 1.7e9 + np.arange(n_rows))
+    df["num_threads"] = rng.integers(1, 64, n_rows)
+    df["timestamp"] = "12:00:00"
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregator ingest throughput")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=300, help="processes per agent batch")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    fleet = FleetState()
+    server = FleetServer(("127.0.0.1", 0), fleet)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    df = synthetic_features(args.processes, np.random.default_rng(args.seed))
+    bodies = [encode_batch(df, f"host-{i:03d}", 1) for i in range(args.agents)]
+    raw_size = len(df.to_csv(index=False))
+    print(f"Batch: {args.processes} processes, {len(bodies[0]) / 1024:.1f} KB "
+          f"(CSV would be {raw_size / 1024:.1f} KB)")
+
+    failures = []
+
+    def agent(body):
+        for _ in range(args.rounds):
+            try:
+                send_batch(url, body)
+            except OSError as e:
+                failures.append(e)
+
+    threads = [threading.Thread(target=agent, args=(body,)) for body in bodies]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    sent = args.agents * args.rounds
+    print(f"{sent} batches from {args.agents} agents in {elapsed:.2f}s: "
+          f"{sent / elapsed:.0f} batches/s, {sent * args.processes / elapsed:,.0f} processes/s, "
+          f"{len(failures)} failed")
+    print(f"Fleet state: {len(fleet.status())} hosts, {fleet.batches} batches ingested")
+
+
+if __name__ == "__main__":
+    main()
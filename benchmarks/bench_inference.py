@@ -0,0 +1,85 @@
+"""
+Latency benchmark and sklearn parity check for the flattened forest.
+
+Compares the old dashboard path (scaler.transform, then model.predict +
+model.predict_proba on the sklearn RandomForestClassifier) with the
+InferenceEngine, which runs the flattened forest with the scaler folded
+into its thresholds on raw features. Fails if labels or probabilities
+differ.
+
+Usage (from the repository root):
+    python benchmarks/bench_inference.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from src.scoring import InferenceEngine, load_model
+
+
+def synthetic_rows(scaler, n_rows, rng):
+    """Raw feature rows spread around the training distribution"""
+    X = scaler.mean_ + scaler.scale_ * rng.normal(scale=1.5, size=(n_rows, len(scaler.mean_)))
+    X = np.clip(X, 0, None)
+    # Count-like features are integers in real snapshots
+    for i in (0, 3, 4, 5):
+        X[:, i] = X[:, i].round()
+    return X
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FlatForest vs sklearn inference")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    model, scaler = load_model()
+    engine = InferenceEngine.from_sklearn(model, scaler)
+    forest = engine.forest
+    started = time.perf_counter()
+    compiled = forest.compile() is not None
+    print(f"Forest: {forest.n_trees} trees, {forest.n_nodes} nodes, "
+          f"{'bitvector' if compiled else 'walk'} evaluation "
+          f"(compiled in {(time.perf_counter() - started) * 1000:.1f} ms)")
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'rows':>8} {'sklearn (ms)':>13} {'flat (ms)':>10} {'speedup':>8}  parity")
+    for n_rows in args.sizes:
+        X = synthetic_rows(scaler, n_rows, rng)
+
+        def sklearn_path():
+            X_scaled = scaler.transform(X)
+            return model.predict(X_scaled), model.predict_proba(X_scaled)[:, 1]
+
+        # Parity: identical labels, probabilities equal up to summation order
+        labels, proba = engine.predict(X)
+        expected_labels, expected_proba = sklearn_path()
+        if not (np.array_equal(labels, expected_labels)
+                and np.allclose(proba, expected_proba, rtol=0, atol=1e-12)):
+            print(f"❌ FlatForest disagrees with sklearn at {n_rows} rows")
+            sys.exit(1)
+
+        t_sklearn = best_of(sklearn_path, args.repeats)
+        t_flat = best_of(lambda: engine.predict(X), args.repeats)
+        print(f"{n_rows:>8} {t_sklearn * 1000:>13.1f} {t_flat * 1000:>10.1f} "
+              f"{t_sklearn / t_flat:>7.1f}x  ✅")
+
+
+if __name__ == "__main__":
+    main()
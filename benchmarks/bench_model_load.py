@@ -0,0 +1,164 @@
+"""
+Startup cost and memory of the model formats.
+
+Every format is loaded in a fresh interpreter, the way a dashboard,
+daemon or scoring worker starts:
+
+    joblib         model.pkl + scaler.pkl, scored with sklearn
+    npz            the previous .npz export, read into memory
+    forest         the flat forest file, read into memory
+    forest (mmap)  the flat forest file, mapped read-only
+
+Load time includes building the bitvector tables, which none of the
+files store.
+
+For each one the child reports import time, load time (until the first
+batch can be scored), the first-batch time and its RSS growth. Then
+--procs processes load the same format at once and their summed PSS
+(resident memory with shared pages divided among the sharers) shows how
+much of the model is shared. PSS needs Linux.
+
+Usage (from the repository root):
+    python benchmarks/bench_model_load.py --procs 8
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+FORMATS = ["joblib", "npz", "forest", "forest (mmap)"]
+
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def pss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+# ---------- CHILD ----------
+def child(fmt, paths, rows, wait):
+    import numpy as np
+
+    X = np.random.default_rng(0).random((rows, 7)).astype(np.float32) * 100
+    base = rss_kb()
+
+    started = time.perf_counter()
+    if fmt == "joblib":
+        import joblib
+        imported = time.perf_counter()
+        model = joblib.load(paths["model"])
+        scaler = joblib.load(paths["scaler"])
+        loaded = time.perf_counter()
+        model.predict_proba(scaler.transform(X))
+    else:
+        from src.forest import FlatForest
+        imported = time.perf_counter()
+        path = paths["npz"] if fmt == "npz" else paths["forest"]
+        forest, _ = FlatForest.load(path, mmap=fmt == "forest (mmap)")
+        forest.compile()
+        loaded = time.perf_counter()
+        forest.predict_proba(X)
+    scored = time.perf_counter()
+
+    print(json.dumps({"import_ms": (imported - started) * 1000,
+                      "load_ms": (loaded - imported) * 1000,
+                      "first_batch_ms": (scored - loaded) * 1000,
+                      "rss_growth_kb": rss_kb() - base}), flush=True)
+    if wait:
+        sys.stdin.readline()
+
+
+def spawn(fmt, paths, rows, wait=False):
+    cmd = [sys.executable, "-W", "ignore", os.path.abspath(__file__), "--child", fmt,
+           "--paths", json.dumps(paths), "--rows", str(rows)]
+    if wait:
+        cmd.append("--wait")
+    return subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+
+# ---------- PARENT ----------
+def write_legacy_npz(forest, feature_names, path):
+    """The export format used before the flat forest file"""
+    import numpy as np
+
+    np.savez(path, feature=forest.feature, threshold=forest.threshold, left=forest.left,
+             right=forest.right, value=forest.value, roots=forest.roots,
+             max_depth=np.int64(forest.max_depth), classes=forest.classes,
+             feature_names=np.asarray(feature_names, dtype=str))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model load time and memory per format")
+    parser.add_argument("--procs", type=int, default=8, help="processes sharing one model")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the first scored batch")
+    parser.add_argument("--child", choices=FORMATS, help=argparse.SUPPRESS)
+    parser.add_argument("--paths", help=argparse.SUPPRESS)
+    parser.add_argument("--wait", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, json.loads(args.paths), args.rows, args.wait)
+        return
+
+    from src.config import MODEL_PATH, RAW_FOREST_PATH, SCALER_PATH
+    from src.forest import FlatForest
+    from src.scoring import export_raw_forest, load_model
+
+    tmp = tempfile.mkdtemp(prefix="ctm-bench-")
+    forest_path = os.path.join(tmp, "forest.forest")
+    npz_path = os.path.join(tmp, "forest.npz")
+    model, scaler = load_model()
+    forest = export_raw_forest(model, scaler, forest_path)
+    write_legacy_npz(forest, FlatForest.load(forest_path)[1], npz_path)
+    paths = {"model": MODEL_PATH, "scaler": SCALER_PATH, "npz": npz_path, "forest": forest_path}
+
+    print(f"Model: {forest.n_trees} trees, {forest.n_nodes} nodes ({RAW_FOREST_PATH})")
+    for label, path in [("model.pkl + scaler.pkl", None), (".npz", npz_path), ("forest file", forest_path)]:
+        size = (os.path.getsize(MODEL_PATH) + os.path.getsize(SCALER_PATH)) if path is None \
+            else os.path.getsize(path)
+        print(f"   {label:<24} {size / 1024:>8.0f} KB")
+
+    print(f"\n{'format':>14} {'import ms':>10} {'load ms':>8} {'1st batch':>10} "
+          f"{'RSS +MB':>8} {f'PSS x{args.procs} MB':>13}")
+    for fmt in FORMATS:
+        runs = []
+        for _ in range(args.repeats):
+            proc = spawn(fmt, paths, args.rows)
+            runs.append(json.loads(proc.communicate()[0]))
+        best = {key: min(run[key] for run in runs) for key in runs[0]}
+
+        procs = [spawn(fmt, paths, args.rows, wait=True) for _ in range(args.procs)]
+        for proc in procs:
+            proc.stdout.readline()
+        total_pss = sum(pss_kb(proc.pid) for proc in procs)
+        for proc in procs:
+            proc.communicate("\n")
+
+        print(f"{fmt:>14} {best['import_ms']:>10.1f} {best['load_ms']:>8.1f} "
+              f"{best['first_batch_ms']:>10.1f} {best['rss_growth_kb'] / 1024:>8.1f} "
+              f"{total_pss / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Per-stage timings of one refresh: collect -> score -> render -> export.
+
+Every stage of a dashboard refresh is timed on its own (best and median
+of --repeats runs on the same input):
+
+    enumerate         sampler.sample_into (process table walk)
+    activity          ActivityProbe.collect (fds, I/O, sockets)
+    features          add_features + to_frame
+    rolling           RollingWindows.update_frame
+    lineage           PidIndex.update_frame (live only)
+    scaler.transform  the pre-folding path: StandardScaler on the features
+    predict (sklearn) model.predict + model.predict_proba on scaled rows
+    predict (engine)  InferenceEngine.predict on raw rows
+    threat_score      scoring.threat_score
+    table             filter/sort/page + styled page HTML
+    figures           every dashboard chart view
+    export csv        snapshot to CSV, and to CSV.gz
+
+Sources: "live" samples this machine with the configured backend;
+"synthetic" samples a fake /proc tree of each --sizes size with the
+procfs sampler, so the same table can be replayed on any machine.
+
+Results are printed and, with --output, written as JSON. With --baseline,
+each stage is compared with the stored run of the same source and size;
+stages slower by more than --tolerance (and --min-delta-ms) are flagged
+and the exit status is 1. --save-baseline stores this run.
+
+Usage (from the repository root):
+    python benchmarks/bench_pipeline.py --sizes 100 1000 10000 --output results.json
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from benchmarks.bench_collectors import build_fake_proc
+from src.baselines import Baselines
+from src.charts import CHART_VIEWS, build_figure, highlight_predictions
+from src.collector import add_features, make_sampler
+from src.config import COLLECTOR_BACKEND
+from src.export import snapshot_frames, write_frames
+from src.features import ActivityProbe
+from src.lineage import PidIndex
+from src.procfs import ProcfsSampler, procfs_available
+from src.rolling import RollingWindows
+from src.scoring import load_engine, load_model, threat_score
+from src.snapshot import ProcessSnapshot
+from src.table import filter_sort_page
+
+
+def time_stage(fn, repeats):
+    """(best ms, median ms, last result) over `repeats` calls after one warm-up call"""
+    fn()
+    times = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times), float(np.median(times)), result
+
+
+def synthetic_activity(pids, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(pids)
+    return dict(zip(pids, zip(rng.poisson(8, n).tolist(), rng.poisson(20, n).tolist(),
+                              rng.integers(0, 3, n).tolist())))
+
+
+# ---------- STAGES ----------
+def run_pipeline(sampler, activity_fn, lineage, model, scaler, engine, repeats):
+    """Time every stage; returns [(stage, best ms, median ms)] and the process count"""
+    results = []
+
+    def stage(name, fn):
+        best, median, result = time_stage(fn, repeats)
+        results.append((name, best, median))
+        return result
+
+    own = {os.getpid()}
+    snapshot = stage("enumerate", lambda: sampler.sample_into(ProcessSnapshot(), own))
+    pids = snapshot.pid.tolist()
+    activity = stage("activity", lambda: activity_fn(pids))
+
+    df = stage("features", lambda: add_features(snapshot, activity).to_frame())
+    rolling = RollingWindows()
+    df = stage("rolling", lambda: rolling.update_frame(df.copy()))
+    if lineage is not None:
+        df = stage("lineage", lambda: lineage.update_frame(df.copy()))
+
+    X = df[engine.feature_cols]
+    X_scaled = stage("scaler.transform", lambda: scaler.transform(X))
+    stage("predict (sklearn)", lambda: (model.predict(X_scaled), model.predict_proba(X_scaled)))
+    labels, proba = stage("predict (engine)", lambda: engine.predict(snapshot.feature_matrix()))
+    df["prediction"], df["threat_probability"] = labels, proba
+    baselines = Baselines()
+    df["threat_score"] = stage("threat_score", lambda: threat_score(df, baselines))
+
+    def table():
+        page, _ = filter_sort_page(df)
+        return highlight_predictions(page).to_html()
+
+    stage("table", table)
+    stage("figures", lambda: [build_figure(view, df) for view in CHART_VIEWS])
+    for fmt in ("csv", "csv.gz"):
+        stage(f"export {fmt}", lambda: write_frames(snapshot_frames(df), io.BytesIO(), fmt))
+    return results, len(df)
+
+
+# ---------- BASELINE ----------
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Rows of `results` slower than their baseline entry, with the baseline time"""
+    stored = {(r["source"], r["size"], r["stage"]): r["best_ms"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        before = stored.get((r["source"], r["size"], r["stage"]))
+        if before is None:
+            continue
+        if r["best_ms"] > before * (1 + tolerance) and r["best_ms"] - before > min_delta_ms:
+            regressions.append((r, before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="synthetic process table sizes")
+    parser.add_argument("--sources", nargs="+", choices=["live", "synthetic"],
+                        default=["live", "synthetic"])
+    parser.add_argument("--backend", choices=["auto", "procfs", "psutil"], default=COLLECTOR_BACKEND,
+                        help="sampler for the live source")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare with this stored run")
+    parser.add_argument("--save-baseline", help="store this run as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="relative slowdown flagged as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args()
+
+    model, scaler = load_model()
+    engine = load_engine()
+    results = []
+
+    def record(source, size, run):
+        stages, n = run
+        for name, best, median in stages:
+            results.append({"source": source, "size": size, "processes": n, "stage": name,
+                            "best_ms": best, "median_ms": median})
+
+    if "live" in args.sources:
+        probe = ActivityProbe()
+        # Live runs are compared with each other whatever the process count
+        record("live", "live", run_pipeline(make_sampler(args.backend), probe.collect, PidIndex(),
+                                            model, scaler, engine, args.repeats))
+
+    if "synthetic" in args.sources:
+        if not procfs_available():
+            print("⚠️ The synthetic source needs a Linux /proc layout; skipped")
+        for size in args.sizes if procfs_available() else []:
+            root = tempfile.mkdtemp(prefix="fake_proc_")
+            try:
+                build_fake_proc(root, size)
+                # Lineage reads the real /proc, which has none of the fake PIDs
+                record("synthetic", size, run_pipeline(ProcfsSampler(proc_root=root), synthetic_activity,
+                                                       None, model, scaler, engine, args.repeats))
+            finally:
+                shutil.rmtree(root, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+    flagged = {(r["source"], r["size"], r["stage"]): before for r, before in regressions}
+
+    print(f"{'source':>10} {'procs':>7} {'stage':>18} {'best ms':>9} {'median ms':>10}")
+    for r in results:
+        before = flagged.get((r["source"], r["size"], r["stage"]))
+        note = f"  ⚠️ was {before:.2f} ms" if before is not None else ""
+        print(f"{r['source']:>10} {r['processes']:>7} {r['stage']:>18} {r['best_ms']:>9.2f} "
+              f"{r['median_ms']:>10.2f}{note}")
+
+    run = {
+        "created_at": time.time(),
+        "machine": {"host": platform.node(), "python": platform.python_version(),
+                    "numpy": np.__version__, "cpus": os.cpu_count()},
+        "repeats": args.repeats,
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(run, f, indent=2)
+
+    if regressions:
+        print(f"❌ {len(regressions)} stage(s) slower than the baseline by more than "
+              f"{args.tolerance:.0%}")
+        sys.exit(1)
+    if args.baseline:
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
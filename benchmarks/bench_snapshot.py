@@ -0,0 +1,114 @@
+"""
+Memory and latency of the columnar ProcessSnapshot vs dict rows.
+
+The old collector path built one dict per process, then a DataFrame
+from the list, then pulled the feature columns back out as a float32
+matrix for the model. The new path appends straight into the snapshot's
+NumPy buffers and hands the feature block to the model as a view; the
+DataFrame is built from whole columns. Raw samples are synthetic, so
+this measures only the representation, not /proc reads.
+
+Usage (from the repository root):
+    python benchmarks/bench_snapshot.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+import pandas as pd
+
+from src.collector import NEUTRAL_FILE_ENTROPY, add_features
+from src.config import FEATURE_COLS
+from src.snapshot import ProcessSnapshot
+
+
+def synthetic_samples(n_rows, rng):
+    """(pid, name, create_time, cpu, rss MB, threads) tuples plus ActivityProbe-style activity"""
+    cpu = rng.gamma(1.0, 3.0, n_rows).tolist()
+    mem = rng.lognormal(3, 1.5, n_rows).tolist()
+    threads = rng.integers(1, 64, n_rows).tolist()
+    samples = [(1000 + i, f"proc-{i % 97}", 1.7e9 + i, cpu[i], mem[i], threads[i])
+               for i in range(n_rows)]
+    activity = {1000 + i: (i % 50, i % 7, i % 3) for i in range(n_rows)}
+    return samples, activity
+
+
+def dict_path(samples, activity):
+    """The collector before snapshots: dict per process, DataFrame, then the model matrix"""
+    logs = []
+    for pid, name, create_time, cpu, mem, threads in samples:
+        file_access, packets, ports = activity.get(pid, (0, 0, 0))
+        logs.append({
+            "process_name": name,
+            "pid": pid,
+            "create_time": create_time,
+            "file_access_count": file_access,
+            "cpu_usage": cpu,
+            "memory_usage": mem,
+            "network_packets": packets,
+            "network_ports": ports,
+            "privilege_escalation_attempt": 1 if mem > 500 else 0,
+            "file_entropy": NEUTRAL_FILE_ENTROPY,
+            "num_threads": threads,
+            "timestamp": "12:00:00",
+        })
+    df = pd.DataFrame(logs)
+    return df, df[FEATURE_COLS].to_numpy(dtype=np.float32)
+
+
+def snapshot_path(samples, activity, frame=True):
+    snapshot = ProcessSnapshot()
+    append = snapshot.append
+    for pid, name, create_time, cpu, mem, threads in samples:
+        append(pid, name, create_time, cpu, mem, threads)
+    add_features(snapshot, activity)
+    X = snapshot.feature_matrix(FEATURE_COLS)
+    return (snapshot.to_frame() if frame else None), X
+
+
+def measure(fn, *args, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ProcessSnapshot vs dict rows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'processes':>10} {'path':>22} {'time (ms)':>10} {'peak MB':>9}")
+    for n_rows in args.sizes:
+        samples, activity = synthetic_samples(n_rows, rng)
+        results = {}
+        for label, fn, extra in [("dicts + DataFrame", dict_path, ()),
+                                 ("snapshot + to_frame", snapshot_path, ()),
+                                 ("snapshot, matrix only", snapshot_path, (False,))]:
+            elapsed, peak, results[label] = measure(fn, samples, activity, *extra)
+            print(f"{n_rows:>10} {label:>22} {elapsed * 1000:>10.1f} {peak / 2**20:>9.2f}")
+
+        # Same model input and the same frame either way
+        old_df, old_X = results["dicts + DataFrame"]
+        new_df, new_X = results["snapshot + to_frame"]
+        assert np.array_equal(old_X, new_X), "feature matrices differ"
+        pd.testing.assert_frame_equal(old_df[FEATURE_COLS], new_df[FEATURE_COLS], check_exact=False,
+                                      rtol=1e-6)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,14 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import psutil
-import joblib
 import os
-import plotly.express as px
-import time
-from datetime import datetime
+import sys
 from streamlit_autorefresh import st_autorefresh
 
-# ---------- AUTO REFRESH ----------
-st_autorefresh(interval=5000, key="live_monitor")  # refresh every 5s
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.config import ROLLING_WINDOWS
+from src.dashboard_ui import (choose_source, get_live_snapshot, load_engine, show_chart,
+                              show_daemon_status, show_export, show_process_table,
+                              show_recent_alerts)
 
 # ---------- CONFIG ----------
 st.set_page_config(
@@ -20,83 +18,7 @@ st.set_page_config(
 )
 
 # ---------- LOAD MODEL ----------
-MODEL_PATH = "../models/cyber_model.pkl"
-SCALER_PATH = "../models/scaler.pkl"
-
-@st.cache_resource
-def load_model():
-    if os.path.exists(MODEL_PATH) and os.path.exists(SCALER_PATH):
-        model = joblib.load(MODEL_PATH)
-        scaler = joblib.load(SCALER_PATH)
-        return model, scaler
-    else:
-        st.error("❌ Model not found! Train the model first by running train_model.py")
-        st.stop()
-
-result = load_model()
-model, scaler = result
-
-# ---------- COLLECT LIVE DATA ----------
-def collect_live_data():
-    """Collect system processes excluding Streamlit itself"""
-    logs = []
-    current_pid = os.getpid()  # Skip Streamlit
-
-    # Initialize CPU percent
-    for proc in psutil.process_iter(['pid', 'name']):
-        try:
-            proc.cpu_percent(interval=None)
-        except:
-            continue
-    time.sleep(0.1)  # small delay
-
-    for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'num_threads']):
-        if proc.info['pid'] == current_pid:
-            continue  # skip Streamlit
-        try:
-            cpu = proc.cpu_percent(interval=None)
-            mem = proc.info['memory_info'].rss / (1024*1024) if proc.info['memory_info'] else 0
-            threads = proc.info['num_threads'] or 1
-
-            logs.append({
-                "process_name": proc.info['name'] or "Unknown",
-                "pid": proc.info['pid'],
-                "file_access_count": threads * 2,  # simulated
-                "cpu_usage": cpu,
-                "memory_usage": mem,
-                "network_packets": int(np.random.randint(0, 100) * (cpu/10)),  # simulated
-                "network_ports": 1 if cpu > 20 else 0,
-                "privilege_escalation_attempt": 1 if mem > 500 else 0,
-                "file_entropy": np.random.uniform(0, 8),
-                "timestamp": datetime.now().strftime("%H:%M:%S")
-            })
-
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-
-    return pd.DataFrame(logs)
-
-# ---------- PREDICT THREATS ----------
-def predict_threats(df):
-    if df.empty:
-        return df
-
-    feature_cols = ["file_access_count", "cpu_usage", "memory_usage",
-                    "network_packets", "network_ports",
-                    "privilege_escalation_attempt", "file_entropy"]
-    X = df[feature_cols]
-    X_scaled = scaler.transform(X)
-    df["prediction"] = model.predict(X_scaled)
-    df["threat_probability"] = model.predict_proba(X_scaled)[:, 1]
-
-    df["threat_score"] = (
-        df["cpu_usage"]/100 +
-        (df["memory_usage"]/df["memory_usage"].max() if df["memory_usage"].max() > 0 else 0) +
-        (df["network_packets"]/df["network_packets"].max() if df["network_packets"].max() > 0 else 0) +
-        df["privilege_escalation_attempt"]
-    )
-
-    return df
+load_engine()
 
 # ---------- MAIN APP ----------
 st.title("🛡️ Live Cyber Threat Monitor")
@@ -106,12 +28,17 @@ st.markdown("**Real-time monitoring of your laptop's processes**")
 st.sidebar.header("⚙️ Controls")
 refresh_rate = st.sidebar.slider("Refresh Rate (seconds)", 1, 10, 3)
 auto_refresh = st.sidebar.checkbox("Auto Refresh", value=True)
+source = choose_source()
+
+# ---------- AUTO REFRESH ----------
+if auto_refresh:
+    st_autorefresh(interval=refresh_rate * 1000, key="live_monitor")
 
 # Collect data
 with st.spinner("Collecting live data from your system..."):
-    live_df = collect_live_data()
+    live_df, daemon_stats, snapshot_key = get_live_snapshot(source)
+    show_daemon_status(daemon_stats)
     if not live_df.empty:
-        live_df = predict_threats(live_df)
 
         # ---------- METRICS ----------
         st.subheader("📊 Current System Status")
@@ -124,9 +51,12 @@ with st.spinner("Collecting live data from your system..."):
         col3.metric("📈 Total Monitored", len(live_df))
         col4.metric("⏰ Last Update", live_df['timestamp'].iloc[0])
 
-        # Alerts
+        # Alerts: the daemon reports transitions, an inline scan can only show the current state
+        if daemon_stats is not None:
+            show_recent_alerts(daemon_stats)
         if suspicious > 0:
-            st.error(f"⚠️ **ALERT**: {suspicious} suspicious processes detected!")
+            if daemon_stats is None:
+                st.error(f"⚠️ **ALERT**: {suspicious} suspicious processes detected!")
             st.subheader("🚨 Suspicious Processes")
             suspicious_df = live_df[live_df["prediction"] == 1].sort_values(
                 "threat_probability", ascending=False
@@ -139,62 +69,28 @@ with st.spinner("Collecting live data from your system..."):
         else:
             st.success("✅ All processes appear normal")
 
-        # ---------- VISUALIZATIONS ----------
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.subheader("🎯 Threat Distribution")
-            fig_pie = px.pie(
-                values=[normal, suspicious],
-                names=["Normal", "Suspicious"],
-                color_discrete_sequence=["#4CAF50", "#F44336"],
-                hole=0.4
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
-
-        with col2:
-            st.subheader("📊 Top CPU Consumers")
-            top_cpu = live_df.nlargest(10, "cpu_usage")
-            fig_bar = px.bar(
-                top_cpu,
-                x="process_name",
-                y="cpu_usage",
-                color="prediction",
-                color_discrete_map={0: "#4CAF50", 1: "#F44336"}
+        # ---------- BURSTY PROCESSES ----------
+        window = ROLLING_WINDOWS[0]
+        if f"cpu_usage_var_{window}" in live_df:
+            st.subheader(f"⚡ Most Variable Processes (last {window} samples)")
+            st.caption("Bursty processes stand out by CPU variance and peak even between bursts")
+            bursty = live_df.nlargest(10, f"cpu_usage_var_{window}")
+            st.dataframe(
+                bursty[["process_name", "pid", "cpu_usage",
+                        f"cpu_usage_mean_{window}", f"cpu_usage_max_{window}",
+                        f"cpu_usage_var_{window}", f"cpu_usage_slope_{window}",
+                        f"memory_usage_slope_{window}", "prediction"]],
+                use_container_width=True
             )
-            st.plotly_chart(fig_bar, use_container_width=True)
-
-        # 3D Scatter
-        st.subheader("🌐 CPU vs Memory vs Network (3D)")
-        fig_3d = px.scatter_3d(
-            live_df,
-            x="cpu_usage",
-            y="memory_usage",
-            z="network_packets",
-            color="prediction",
-            size="threat_score",
-            hover_data=["process_name"],
-            color_discrete_map={0: "#4CAF50", 1: "#F44336"},
-            labels={"prediction": "Threat Status"}
-        )
-        st.plotly_chart(fig_3d, use_container_width=True)
+
+        # ---------- VISUALIZATIONS ----------
+        show_chart(snapshot_key, live_df)
 
         # ---------- DETAILED TABLE ----------
-        st.subheader("📋 All Monitored Processes")
-        st.dataframe(
-            live_df.sort_values("threat_score", ascending=False),
-            use_container_width=True
-        )
+        show_process_table(live_df)
 
         # ---------- DOWNLOAD ----------
-        st.subheader("💾 Export Data")
-        csv = live_df.to_csv(index=False)
-        st.download_button(
-            label="Download Current Snapshot as CSV",
-            data=csv,
-            file_name=f"threat_snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+        show_export(live_df)
 
     else:
         st.error("❌ No data collected. Check permissions.")
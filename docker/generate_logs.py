@@ -2,7 +2,9 @@ import pandas as pd
 import numpy as np
 import os
 
-os.makedirs("/data", exist_ok=True)
+# The image mounts the data volume at /data; CTM_DATA_DIR overrides it outside Docker
+DATA_DIR = os.environ.get("CTM_DATA_DIR", "/data")
+os.makedirs(DATA_DIR, exist_ok=True)
 
 n_samples = 500
 
@@ -29,5 +31,6 @@ suspicious = pd.DataFrame({
 })
 
 df = pd.concat([normal, suspicious], ignore_index=True).sample(frac=1).reset_index(drop=True)
-df.to_csv("/data/generated_behavior.csv", index=False)
-print("Logs generated successfully in /data/generated_behavior.csv")
+output_path = os.path.join(DATA_DIR, "generated_behavior.csv")
+df.to_csv(output_path, index=False)
+print(f"Logs generated successfully in {output_path}")
@@ -0,0 +1,131 @@
+"""
+Headless collection agent.
+
+Runs the same collection as the collector daemon (process sampling,
+activity probe, executable entropy, rolling windows, lineage) but does
+not load the model: every tick the feature frame is encoded as a
+zstd-compressed Arrow IPC stream and POSTed to the aggregator, which
+scores all hosts centrally.
+
+Usage (from the repository root):
+    python -m src.agent --aggregator http://monitor-host:8750 --interval 5
+"""
+
+import argparse
+import io
+import os
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import pyarrow as pa
+
+from src.collector import collect_live_data, make_sampler
+from src.config import (ACTIVITY_BUDGET, AGGREGATOR_TOKEN, AGGREGATOR_URL, COLLECT_INTERVAL,
+                        COLLECTOR_BACKEND, ENTROPY_BUDGET)
+from src.entropy import EntropyProbe
+from src.features import ActivityProbe
+from src.lineage import PidIndex
+from src.rolling import RollingWindows
+
+CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+
+# ---------- WIRE FORMAT ----------
+def encode_batch(df, host, snapshot_id, created_at=None):
+    """DataFrame -> zstd-compressed Arrow IPC stream, with host and snapshot id in the schema metadata"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata.update({
+        b"ctm_host": host.encode(),
+        b"ctm_snapshot_id": str(snapshot_id).encode(),
+        b"ctm_created_at": repr(created_at if created_at is not None else time.time()).encode(),
+    })
+    table = table.replace_schema_metadata(metadata)
+
+    sink = io.BytesIO()
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def decode_batch(body):
+    """Inverse of encode_batch: returns (DataFrame, {"host", "snapshot_id", "created_at"})"""
+    table = pa.ipc.open_stream(body).read_all()
+    metadata = table.schema.metadata or {}
+    meta = {
+        "host": metadata[b"ctm_host"].decode(),
+        "snapshot_id": int(metadata[b"ctm_snapshot_id"]),
+        "created_at": float(metadata[b"ctm_created_at"]),
+    }
+    return table.to_pandas(), meta
+
+
+def send_batch(url, body, token=AGGREGATOR_TOKEN, timeout=10.0):
+    headers = {"Content-Type": CONTENT_TYPE}
+    if token:
+        headers["X-CTM-Token"] = token
+    request = urllib.request.Request(f"{url.rstrip('/')}/ingest", data=body, headers=headers,
+                                     method="POST")
+    with urllib.request.urlopen(request, timeout=timeout):
+        pass
+
+
+# ---------- AGENT LOOP ----------
+def run(url=AGGREGATOR_URL, interval=COLLECT_INTERVAL, host=None, backend=COLLECTOR_BACKEND,
+        token=AGGREGATOR_TOKEN, max_ticks=None):
+    host = host or socket.gethostname()
+    sampler = make_sampler(backend)
+    probe = ActivityProbe(budget=min(ACTIVITY_BUDGET, interval / 2))
+    entropy = EntropyProbe(budget=min(ENTROPY_BUDGET, interval / 4))
+    rolling = RollingWindows()
+    lineage = PidIndex()
+    own_pid = os.getpid()
+    snapshot_id = 0
+
+    print(f"🛰️ Agent '{host}' started (pid {own_pid}, every {interval}s)")
+    print(f"   Backend: {type(sampler).__name__}")
+    print(f"   Shipping batches to {url}")
+
+    while max_ticks is None or snapshot_id < max_ticks:
+        started = time.monotonic()
+
+        df = collect_live_data(exclude_pids={own_pid}, sampler=sampler, probe=probe,
+                               rolling=rolling, lineage=lineage, entropy=entropy)
+        snapshot_id += 1
+        body = encode_batch(df, host, snapshot_id)
+        try:
+            send_batch(url, body, token)
+            status = "sent"
+        except (urllib.error.URLError, OSError) as e:
+            # The aggregator only needs the latest batch, so a failed one is not retried
+            status = f"not delivered ({e})"
+
+        elapsed = time.monotonic() - started
+        print(f"[{time.strftime('%H:%M:%S')}] batch {snapshot_id}: {len(df)} processes, "
+              f"{len(body) / 1024:.1f} KB {status}")
+
+        time.sleep(max(0.0, interval - elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live Cyber Threat Monitor collection agent")
+    parser.add_argument("--aggregator", default=AGGREGATOR_URL, help="aggregator base URL")
+    parser.add_argument("--interval", type=float, default=COLLECT_INTERVAL,
+                        help="seconds between batches")
+    parser.add_argument("--host-name", default=None,
+                        help="name reported for this host (default: hostname)")
+    parser.add_argument("--backend", choices=["auto", "procfs", "psutil"], default=COLLECTOR_BACKEND,
+                        help="process collection backend")
+    args = parser.parse_args()
+
+    try:
+        run(url=args.aggregator, interval=args.interval, host=args.host_name, backend=args.backend)
+    except KeyboardInterrupt:
+        print("\n✅ Agent stopped")
+
+
+if __name__ == "__main__":
+    main()
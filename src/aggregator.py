@@ -0,0 +1,223 @@
+"""
+Central aggregator for many agents.
+
+Agents POST Arrow batches to /ingest. A ThreadingHTTPServer decodes them
+concurrently (one thread per connection) and keeps only the latest batch
+per host. Once per interval the aggregator scores the hosts that sent a
+new batch, drops hosts that went quiet, runs the alert engine over the
+fleet (alerts are keyed by host as well as process) and publishes one
+fleet-wide snapshot with a `host` column to FLEET_SNAPSHOT_PATH, next to
+the local daemon's snapshot, so the dashboards can show the whole fleet.
+GET /status lists the connected hosts.
+
+Usage (from the repository root):
+    python -m src.aggregator --port 8750 --interval 5
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from src.agent import decode_batch
+from src.alerts import AlertEngine, sinks_from_config
+from src.baselines import Baselines
+from src.config import (AGGREGATOR_PORT, AGGREGATOR_TOKEN, BASELINES_PATH, COLLECT_INTERVAL,
+                        FLEET_ALERTS_PATH, FLEET_SNAPSHOT_PATH, MAX_BATCH_BYTES,
+                        STALE_AFTER_INTERVALS)
+from src.scoring import ScoreCache, load_engine, predict_threats
+from src.snapshot_store import publish_snapshot
+
+
+# ---------- FLEET STATE ----------
+class FleetState:
+    """Latest batch per host, shared between the ingest threads and the publisher"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}    # host -> (df, meta) received since the last publish
+        self._last_seen = {}  # host -> (received_at, snapshot_id, rows)
+        self.batches = 0
+        self.bytes = 0
+
+    def ingest(self, df, meta, size):
+        with self._lock:
+            self._pending[meta["host"]] = (df, meta)
+            self._last_seen[meta["host"]] = (time.time(), meta["snapshot_id"], len(df))
+            self.batches += 1
+            self.bytes += size
+
+    def take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def forget(self, host):
+        with self._lock:
+            self._last_seen.pop(host, None)
+            self._pending.pop(host, None)
+
+    def status(self):
+        with self._lock:
+            return {host: {"last_seen": seen, "snapshot_id": snapshot_id, "processes": rows}
+                    for host, (seen, snapshot_id, rows) in self._last_seen.items()}
+
+
+# ---------- HTTP ----------
+class _IngestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/ingest":
+            return self._reply(404)
+        token = self.server.token
+        if token and self.headers.get("X-CTM-Token") != token:
+            return self._reply(403)
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0 or length > MAX_BATCH_BYTES:
+            return self._reply(413 if length > 0 else 400)
+
+        body = self.rfile.read(length)
+        try:
+            df, meta = decode_batch(body)
+        except Exception:
+            return self._reply(400)
+        self.server.fleet.ingest(df, meta, len(body))
+        self._reply(204)
+
+    def do_GET(self):
+        if self.path != "/status":
+            return self._reply(404)
+        body = json.dumps(self.server.fleet.status()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply(self, code):
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FleetServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for hundreds of agents connecting in the same instant
+    request_queue_size = 512
+
+    def __init__(self, address, fleet, token=AGGREGATOR_TOKEN):
+        super().__init__(address, _IngestHandler)
+        self.fleet = fleet
+        self.token = token
+
+
+# ---------- AGGREGATOR ----------
+class Aggregator:
+    def __init__(self, engine, fleet, interval=COLLECT_INTERVAL, baselines=None):
+        self.engine = engine
+        self.fleet = fleet
+        self.interval = interval
+        self.baselines = baselines if baselines is not None else Baselines()
+        self._caches = {}  # host -> ScoreCache, since pids repeat across hosts
+        self._scored = {}  # host -> (received_at, scored frame)
+
+    def build_snapshot(self, now=None):
+        """Score new batches, drop quiet hosts and return the fleet frame"""
+        now = now if now is not None else time.time()
+        for host, (df, meta) in self.fleet.take_pending().items():
+            cache = self._caches.setdefault(host, ScoreCache())
+            scored = predict_threats(df, self.engine, cache=cache, baselines=self.baselines)
+            scored.insert(0, "host", host)
+            self._scored[host] = (now, scored)
+
+        stale_after = self.interval * STALE_AFTER_INTERVALS
+        for host in [h for h, (seen, _) in self._scored.items() if now - seen > stale_after]:
+            del self._scored[host]
+            self._caches.pop(host, None)
+            self.fleet.forget(host)
+
+        frames = [scored for _, scored in self._scored.values() if not scored.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    @property
+    def hosts(self):
+        return sorted(self._scored)
+
+
+def run(bind="127.0.0.1", port=AGGREGATOR_PORT, interval=COLLECT_INTERVAL,
+        snapshot_path=FLEET_SNAPSHOT_PATH, alerts_path=FLEET_ALERTS_PATH, token=AGGREGATOR_TOKEN,
+        max_ticks=None):
+    fleet = FleetState()
+    server = FleetServer((bind, port), fleet, token)
+    aggregator = Aggregator(load_engine(), fleet, interval, Baselines.load(BASELINES_PATH))
+    alerts = AlertEngine(sinks_from_config(alerts_path))
+    threading.Thread(target=server.serve_forever, name="fleet-ingest", daemon=True).start()
+    snapshot_id = 0
+    batches, received = 0, 0
+
+    print(f"🛡️ Aggregator listening on http://{bind}:{server.server_address[1]}/ingest "
+          f"(every {interval}s)")
+    print(f"   Publishing fleet snapshots to {snapshot_path}")
+    print(f"   Alert sinks: {', '.join(repr(sink) for sink in alerts.sinks)}")
+
+    try:
+        while max_ticks is None or snapshot_id < max_ticks:
+            started = time.monotonic()
+
+            df = aggregator.build_snapshot()
+            events = alerts.process(df)
+            snapshot_id += 1
+            stats = {
+                "hosts": len(aggregator.hosts),
+                "active_alerts": len(alerts.active),
+                "alerts_dropped": alerts.dropped,
+                "batches_received": fleet.batches - batches,
+                "bytes_received": fleet.bytes - received,
+            }
+            batches, received = fleet.batches, fleet.bytes
+            publish_snapshot(df, snapshot_id, interval, path=snapshot_path, stats=stats)
+
+            elapsed = time.monotonic() - started
+            print(f"[{time.strftime('%H:%M:%S')}] fleet snapshot {snapshot_id}: "
+                  f"{stats['hosts']} hosts, {len(df)} processes, "
+                  f"{stats['batches_received']} batches ({stats['bytes_received'] / 1024:.0f} KB) "
+                  f"in {elapsed:.2f}s")
+            for event in events:
+                icon = "🚨" if event["event"] == "raised" else "✅"
+                print(f"   {icon} {event['event']}: {event['process_name']} on {event['host']} "
+                      f"(pid {event['pid']}, p={event['threat_probability']:.2f})")
+
+            time.sleep(max(0.0, interval - elapsed))
+    finally:
+        server.shutdown()
+        server.server_close()
+        alerts.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live Cyber Threat Monitor fleet aggregator")
+    parser.add_argument("--bind", default="127.0.0.1",
+                        help="address to listen on (0.0.0.0 to accept remote agents)")
+    parser.add_argument("--port", type=int, default=AGGREGATOR_PORT)
+    parser.add_argument("--interval", type=float, default=COLLECT_INTERVAL,
+                        help="seconds between fleet snapshots")
+    parser.add_argument("--snapshot-path", default=FLEET_SNAPSHOT_PATH,
+                        help="where to publish the fleet snapshot")
+    parser.add_argument("--alerts-path", default=FLEET_ALERTS_PATH,
+                        help="JSONL log of fleet alert events")
+    args = parser.parse_args()
+
+    try:
+        run(bind=args.bind, port=args.port, interval=args.interval,
+            snapshot_path=args.snapshot_path, alerts_path=args.alerts_path)
+    except KeyboardInterrupt:
+        print("\n✅ Aggregator stopped")
+
+
+if __name__ == "__main__":
+    main()
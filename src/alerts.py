@@ -0,0 +1,311 @@
+"""
+Streaming alert engine.
+
+AlertEngine is fed every scored snapshot and keeps alert state per
+process, keyed by (host, pid, process_name, create_time); host is None
+unless the snapshot has a host column (fleet snapshots). It only emits on
+transitions: "raised" when threat_probability reaches the raise level
+and "cleared" once it falls back to the clear level (or the process
+exits). Repeats in between are deduplicated; the gap between the two
+levels is the hysteresis that stops a process hovering around the
+threshold from flapping. Processes that started and exited between two
+snapshots are reported once through report(), with no state to clear.
+
+Events go to pluggable sinks. Each sink has its own bounded queue and
+worker thread, so a slow or failing sink never stalls collection: when
+a queue is full the event is dropped for that sink and counted.
+
+Usage (local webhook stand-in, from the repository root):
+    python -m src.alerts --serve-webhook 8765
+"""
+
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.config import (ALERT_CLEAR_AT, ALERT_QUEUE_SIZE, ALERT_RAISE_AT, ALERT_SYSLOG_ADDRESS,
+                        ALERT_WEBHOOK_URL, ALERTS_PATH)
+
+
+# ---------- SINKS ----------
+class JsonlSink:
+    """Appends one JSON object per line"""
+
+    def __init__(self, path=ALERTS_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def send(self, event):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+    def __repr__(self):
+        return f"JsonlSink({self.path})"
+
+
+class SyslogSink:
+    """Sends events to syslog; `address` is a socket path or a (host, port) UDP tuple"""
+
+    def __init__(self, address=ALERT_SYSLOG_ADDRESS):
+        self.address = address
+        handler = logging.handlers.SysLogHandler(address=address)
+        handler.setFormatter(logging.Formatter("cyber-threat-monitor: %(message)s"))
+        self._logger = logging.getLogger(f"{__name__}.syslog.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(handler)
+
+    def send(self, event):
+        level = logging.WARNING if event["event"] == "raised" else logging.INFO
+        self._logger.log(level, json.dumps(event))
+
+    def __repr__(self):
+        return f"SyslogSink({self.address})"
+
+
+class WebhookSink:
+    """POSTs each event as JSON to `url`"""
+
+    def __init__(self, url=ALERT_WEBHOOK_URL, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(event).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def __repr__(self):
+        return f"WebhookSink({self.url})"
+
+
+def sinks_from_config(path=ALERTS_PATH):
+    """Sinks enabled by the CTM_ALERT_* settings (the JSONL file at `path` is always on)"""
+    sinks = [JsonlSink(path)]
+    if ALERT_SYSLOG_ADDRESS:
+        sinks.append(SyslogSink(ALERT_SYSLOG_ADDRESS))
+    if ALERT_WEBHOOK_URL:
+        sinks.append(WebhookSink(ALERT_WEBHOOK_URL))
+    return sinks
+
+
+# ---------- DISPATCH ----------
+class _SinkWorker:
+    """Bounded queue plus a daemon thread draining it into one sink"""
+
+    def __init__(self, sink, queue_size):
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.failed = 0
+        self.thread = threading.Thread(target=self._run, name=f"alert-sink-{sink!r}", daemon=True)
+        self.thread.start()
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                break
+            try:
+                self.sink.send(event)
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Alert sink {self.sink!r} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+
+# ---------- ALERT ENGINE ----------
+def _process_keys(df):
+    """(host, pid, process_name, create_time) per row"""
+    hosts = df["host"] if "host" in df.columns else [None] * len(df)
+    return list(zip(hosts, df["pid"], df["process_name"], df["create_time"]))
+
+
+class AlertEngine:
+    def __init__(self, sinks=None, raise_at=ALERT_RAISE_AT, clear_at=ALERT_CLEAR_AT,
+                 queue_size=ALERT_QUEUE_SIZE):
+        if clear_at > raise_at:
+            raise ValueError("clear_at must not be above raise_at")
+        self.raise_at = raise_at
+        self.clear_at = clear_at
+        self._workers = [_SinkWorker(sink, queue_size) for sink in (sinks or [])]
+        self._active = {}  # (host, pid, process_name, create_time) -> event that raised it
+        self.raised = 0
+        self.cleared = 0
+
+    @property
+    def sinks(self):
+        return [worker.sink for worker in self._workers]
+
+    @property
+    def active(self):
+        return dict(self._active)
+
+    @property
+    def dropped(self):
+        return sum(worker.dropped for worker in self._workers)
+
+    def process(self, df):
+        """Update alert state from a scored snapshot and return the events emitted"""
+        if df.empty or "threat_probability" not in df.columns:
+            # Nothing scored (e.g. predict_threats on an empty frame): only expire
+            # alerts of processes that are no longer in the snapshot
+            keys = set() if df.empty else set(_process_keys(df))
+            events = []
+            for key in [key for key in self._active if key not in keys]:
+                alert = self._active.pop(key)
+                events.append(self._event("cleared", key, 0.0, alert["threat_score"],
+                                          peak=alert["peak_probability"], reason="process exited"))
+            self._dispatch(events)
+            return events
+
+        rows = {key: i for i, key in enumerate(_process_keys(df))}
+        # Rows at or below the clear level can only matter for already-active alerts
+        hot = df[df["threat_probability"] > self.clear_at]
+
+        events = []
+        still_hot = set()
+        for key, proba, score in zip(_process_keys(hot), hot["threat_probability"], hot["threat_score"]):
+            alert = self._active.get(key)
+            if alert is None:
+                if proba >= self.raise_at:
+                    alert = self._event("raised", key, proba, score, peak=proba)
+                    self._active[key] = alert
+                    events.append(alert)
+                    still_hot.add(key)
+            else:
+                alert["peak_probability"] = max(alert["peak_probability"], float(proba))
+                still_hot.add(key)
+
+        for key in [key for key in self._active if key not in still_hot]:
+            alert = self._active.pop(key)
+            if key in rows:
+                row = df.iloc[rows[key]]
+                proba, score, reason = row["threat_probability"], row["threat_score"], "below threshold"
+            else:
+                proba, score, reason = 0.0, alert["threat_score"], "process exited"
+            events.append(self._event("cleared", key, proba, score,
+                                      peak=alert["peak_probability"], reason=reason))
+
+        self._dispatch(events)
+        return events
+
+    def report(self, df, reason="short-lived process"):
+        """
+        One-off "raised" events for scored rows of processes that have
+        already exited (e.g. started and died between two snapshots), so
+        no alert state is kept for them
+        """
+        if df.empty or "threat_probability" not in df.columns:
+            return []
+        hot = df[df["threat_probability"] >= self.raise_at]
+        events = [self._event("raised", key, proba, score, peak=proba, reason=reason)
+                  for key, proba, score in zip(_process_keys(hot), hot["threat_probability"],
+                                               hot["threat_score"])]
+        self._dispatch(events)
+        return events
+
+    def _dispatch(self, events):
+        for event in events:
+            if event["event"] == "raised":
+                self.raised += 1
+            else:
+                self.cleared += 1
+            for worker in self._workers:
+                worker.offer(dict(event))
+
+    def _event(self, kind, key, proba, score, peak, reason=None):
+        host, pid, name, create_time = key
+        event = {
+            "event": kind,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "pid": int(pid),
+            "process_name": name,
+            "create_time": float(create_time),
+            "threat_probability": float(proba),
+            "peak_probability": float(peak),
+            "threat_score": float(score),
+        }
+        if host is not None:
+            event["host"] = host
+        if reason:
+            event["reason"] = reason
+        return event
+
+    def close(self, timeout=5.0):
+        """Flush queued events and stop the sink workers"""
+        for worker in self._workers:
+            worker.queue.put(None)
+        for worker in self._workers:
+            worker.thread.join(timeout)
+
+
+def read_recent_alerts(path=ALERTS_PATH, limit=20, tail_bytes=64 * 1024):
+    """Last `limit` events from a JSONL alert log, newest first, without reading the whole file"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - tail_bytes))
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    if size > tail_bytes:
+        lines = lines[1:]  # first line may be cut in half
+    events = []
+    for line in reversed(lines[-limit:]):
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events
+
+
+# ---------- WEBHOOK STAND-IN ----------
+class _WebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        print(f"🔔 {body.decode(errors='replace')}")
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alert webhook stand-in")
+    parser.add_argument("--serve-webhook", type=int, metavar="PORT", required=True,
+                        help="listen on localhost:PORT and print every alert posted to it")
+    args = parser.parse_args()
+
+    server = HTTPServer(("127.0.0.1", args.serve_webhook), _WebhookHandler)
+    print(f"🔔 Webhook stand-in listening on http://127.0.0.1:{args.serve_webhook}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✅ Webhook stand-in stopped")
+
+
+if __name__ == "__main__":
+    main()
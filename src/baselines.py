@@ -0,0 +1,155 @@
+"""
+Streaming baselines for the threat score.
+
+The threat score used to divide memory and packets by the maximum of the
+current frame, so one process's score depended on every other process.
+Baselines instead tracks a high quantile of each metric with the P²
+algorithm (Jain & Chlamtac, 1985): five markers per quantile, O(1)
+memory and O(1) work per observation, no samples stored. Each tick
+feeds a bounded random subsample of the snapshot, and the estimators
+are persisted as JSON so the scale survives restarts and scores stay
+comparable across snapshots and in history.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from src.config import (BASELINE_METRICS, BASELINE_QUANTILE, BASELINE_SAMPLE, BASELINE_WARMUP,
+                        BASELINES_PATH)
+
+
+# ---------- P² QUANTILE ----------
+class P2Quantile:
+    """Streaming estimate of the `q` quantile"""
+
+    def __init__(self, q):
+        if not 0 < q < 1:
+            raise ValueError("q must be between 0 and 1")
+        self.q = q
+        self.count = 0
+        self._heights = []  # marker heights
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self._increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    @property
+    def value(self):
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            # Not enough markers yet: exact quantile of what has been seen
+            return float(np.quantile(self._heights, self.q))
+        return self._heights[2]
+
+    def update(self, x):
+        x = float(x)
+        self.count += 1
+        h = self._heights
+        if self.count <= 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = self._parabolic(i, d)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = candidate
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        h, n = self._heights, self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def to_dict(self):
+        return {"q": self.q, "count": self.count, "heights": self._heights,
+                "positions": self._positions, "desired": self._desired}
+
+    @classmethod
+    def from_dict(cls, state):
+        estimator = cls(state["q"])
+        estimator.count = state["count"]
+        estimator._heights = list(state["heights"])
+        estimator._positions = list(state["positions"])
+        estimator._desired = list(state["desired"])
+        return estimator
+
+
+# ---------- BASELINES ----------
+class Baselines:
+    def __init__(self, metrics=BASELINE_METRICS, quantile=BASELINE_QUANTILE,
+                 sample_size=BASELINE_SAMPLE, warmup=BASELINE_WARMUP, seed=0):
+        self.quantile = quantile
+        self.sample_size = sample_size
+        self.warmup = warmup
+        self.estimators = {metric: P2Quantile(quantile) for metric in metrics}
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, df):
+        """Feed a random subsample of at most `sample_size` rows of the snapshot"""
+        if df.empty:
+            return
+        rows = np.arange(len(df))
+        if len(df) > self.sample_size:
+            rows = self._rng.choice(rows, size=self.sample_size, replace=False)
+        for metric, estimator in self.estimators.items():
+            for x in df[metric].to_numpy()[rows]:
+                estimator.update(x)
+
+    def scale(self, metric):
+        """Quantile to normalize `metric` by, or None while still warming up"""
+        estimator = self.estimators[metric]
+        if estimator.count < self.warmup or not estimator.value:
+            return None
+        return estimator.value
+
+    # ---------- PERSISTENCE ----------
+    def save(self, path=BASELINES_PATH):
+        """Atomically write the estimator state to `path` as JSON"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        state = {metric: estimator.to_dict() for metric, estimator in self.estimators.items()}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=BASELINES_PATH, **kwargs):
+        """Baselines restored from `path`; fresh ones if it is missing or unreadable"""
+        baselines = cls(**kwargs)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return baselines
+        for metric, estimator_state in state.items():
+            if metric in baselines.estimators and estimator_state["q"] == baselines.quantile:
+                baselines.estimators[metric] = P2Quantile.from_dict(estimator_state)
+        return baselines
@@ -0,0 +1,147 @@
+"""
+Offline scoring of large log files.
+
+The input (CSV, CSV.gz or Parquet) is read in chunks and the chunks are
+fanned out to a process pool. Each worker loads the model once, in the
+pool initializer (the forest file is memory-mapped, so the workers share
+it), and scores chunks. Only the float32 feature block goes to a worker
+and only labels and probabilities come back; the parent keeps the chunk
+and writes it out with prediction and threat_probability columns, in
+input order, as soon as its turn comes. At most `workers * 2` chunks are
+in flight, so memory stays bounded whatever the input size.
+
+Usage (from the repository root):
+    python -m src.batch_score data/history.parquet scored.parquet --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.config import RAW_FOREST_PATH
+from src.export import FORMATS, write_frames
+from src.scoring import load_engine
+
+CHUNK_ROWS = 100_000
+
+
+# ---------- INPUT ----------
+def input_format(path):
+    return "parquet" if path.endswith(".parquet") else "csv"
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS, columns=None):
+    """DataFrames of up to `chunk_rows` rows from a CSV (optionally compressed) or Parquet file"""
+    if input_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows, usecols=columns)
+
+
+# ---------- WORKERS ----------
+_worker_engine = None
+
+
+def _init_worker(raw_forest_path):
+    global _worker_engine
+    _worker_engine = load_engine(raw_forest_path)
+
+
+def _score(X):
+    return _worker_engine.predict(X)
+
+
+def scored_chunks(chunks, workers=0, raw_forest_path=RAW_FOREST_PATH, stats=None):
+    """
+    Yield each chunk with prediction and threat_probability added, in
+    input order. `stats` (a dict) is updated with rows and suspicious counts.
+    """
+    workers = workers if workers > 0 else os.cpu_count() or 1
+    stats = stats if stats is not None else {}
+    stats.setdefault("rows", 0)
+    stats.setdefault("suspicious", 0)
+
+    def finish(chunk, labels, proba):
+        chunk["prediction"] = labels
+        chunk["threat_probability"] = proba
+        stats["rows"] += len(chunk)
+        stats["suspicious"] += int(np.count_nonzero(labels == 1))
+        return chunk
+
+    if workers == 1:
+        _init_worker(raw_forest_path)
+        for chunk in chunks:
+            yield finish(chunk, *_score(chunk[_worker_engine.feature_cols].to_numpy(np.float32)))
+        return
+
+    feature_cols = load_engine(raw_forest_path).feature_cols
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(raw_forest_path,)) as pool:
+        for chunk in chunks:
+            X = np.ascontiguousarray(chunk[feature_cols].to_numpy(np.float32))
+            pending.append((chunk, pool.submit(_score, X)))
+            # Bounded look-ahead: wait for the oldest chunk before reading more
+            while len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield finish(chunk, *future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield finish(chunk, *future.result())
+
+
+# ---------- SCORE A FILE ----------
+def score_file(input_path, output_path, fmt=None, chunk_rows=CHUNK_ROWS, workers=0,
+               raw_forest_path=RAW_FOREST_PATH, progress_every=10, verbose=True):
+    """Score `input_path` into `output_path`; returns {"rows", "suspicious", "seconds"}"""
+    if fmt is None:
+        fmt = "parquet" if output_path.endswith(".parquet") else \
+            "csv.gz" if output_path.endswith(".gz") else "csv"
+    stats = {}
+    started = time.perf_counter()
+
+    def progress(frames):
+        for i, frame in enumerate(frames, 1):
+            if verbose and i % progress_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"   {stats['rows']:,} rows ({stats['rows'] / elapsed:,.0f} rows/s)",
+                      file=sys.stderr)
+            yield frame
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp = f"{output_path}.tmp"
+    with open(tmp, "wb") as f:
+        write_frames(progress(scored_chunks(read_chunks(input_path, chunk_rows), workers,
+                                            raw_forest_path, stats)), f, fmt)
+    os.replace(tmp, output_path)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large log file in parallel chunks")
+    parser.add_argument("input", help="CSV, CSV.gz or Parquet file with the model feature columns")
+    parser.add_argument("output", help="scored output file")
+    parser.add_argument("--format", choices=list(FORMATS), help="default: from the output extension")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=0, help="scoring processes (0 = all cores)")
+    parser.add_argument("--model", default=RAW_FOREST_PATH, help="forest file to score with")
+    args = parser.parse_args()
+
+    stats = score_file(args.input, args.output, args.format, args.chunk_rows, args.workers, args.model)
+    print(f"✅ Scored {stats['rows']:,} rows in {stats['seconds']:.1f}s "
+          f"({stats['rows'] / max(stats['seconds'], 1e-9):,.0f} rows/s), "
+          f"{stats['suspicious']:,} suspicious -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
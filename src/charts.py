@@ -0,0 +1,167 @@
+"""
+Dashboard figures and table styling.
+
+Figures are built from a snapshot DataFrame only, so the dashboards can
+build one per (snapshot, view) and cache it across reruns and sessions.
+The 3D scatter keeps every suspicious process but samples the normal
+ones down to SCATTER_MAX_POINTS, which keeps the browser payload bounded
+on hosts with thousands of processes.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from src.config import SCATTER_MAX_POINTS, TREE_MAX_NODES
+
+COLORS = {0: "#4CAF50", 1: "#F44336"}
+
+NORMAL_CSS = f"background-color: {COLORS[0]}; color: white"
+SUSPICIOUS_CSS = f"background-color: {COLORS[1]}; color: white"
+
+# Columns coloured by prediction in the process table
+HIGHLIGHT_COLS = ["process_name", "pid", "prediction", "threat_probability", "threat_score"]
+
+
+# ---------- FIGURES ----------
+def threat_pie(df):
+    suspicious = int((df["prediction"] == 1).sum())
+    return px.pie(
+        values=[len(df) - suspicious, suspicious],
+        names=["Normal", "Suspicious"],
+        color_discrete_sequence=[COLORS[0], COLORS[1]],
+        hole=0.4
+    )
+
+
+def top_cpu_bar(df, n=10):
+    return px.bar(
+        df.nlargest(n, "cpu_usage"),
+        x="process_name",
+        y="cpu_usage",
+        color="prediction",
+        color_discrete_map=COLORS
+    )
+
+
+def downsample_for_scatter(df, max_points=SCATTER_MAX_POINTS, seed=0):
+    """All suspicious rows plus a seeded sample of normal rows, at most `max_points` in total"""
+    if len(df) <= max_points:
+        return df
+    is_suspicious = df["prediction"] == 1
+    suspicious = df[is_suspicious]
+    normal = df[~is_suspicious]
+    keep = max(max_points - len(suspicious), 0)
+    if len(normal) > keep:
+        normal = normal.sample(n=keep, random_state=seed)
+    return pd.concat([suspicious, normal])
+
+
+def scatter_3d(df, max_points=SCATTER_MAX_POINTS):
+    points = downsample_for_scatter(df, max_points)
+    fig = px.scatter_3d(
+        points,
+        x="cpu_usage",
+        y="memory_usage",
+        z="network_packets",
+        color="prediction",
+        size="threat_score",
+        hover_data=["process_name"],
+        color_discrete_map=COLORS,
+        labels={"prediction": "Threat Status"}
+    )
+    if len(points) < len(df):
+        fig.update_layout(title=f"All suspicious processes, {len(points)} of {len(df)} shown")
+    return fig
+
+
+def _tree_nodes(df, max_nodes):
+    """
+    Node ids and parent ids (host-qualified in fleet snapshots) for the
+    rows to draw: the highest threat scores first, each with its ancestors
+    so every drawn node stays attached to the tree
+    """
+    prefix = df["host"].astype(str) + ":" if "host" in df.columns else ""
+    ids = prefix + df["pid"].astype(str)
+    parents = prefix + df["parent_pid"].astype(str)
+    parent_of = dict(zip(ids, parents))
+
+    keep = set()
+    if len(df) > max_nodes:
+        for node in ids[df["threat_score"].sort_values(ascending=False).index]:
+            while node in parent_of and node not in keep:
+                keep.add(node)
+                node = parent_of[node]
+            if len(keep) >= max_nodes:
+                break
+    else:
+        keep = set(ids)
+
+    mask = ids.isin(keep)
+    # Parents outside the drawn rows (pid 0, kthreadd's parent, ...) make a node a root
+    parents = parents.where(parents.isin(keep), "")
+    return ids[mask], parents[mask], mask
+
+
+def process_tree(df, max_nodes=TREE_MAX_NODES):
+    """Collapsible treemap of the process tree, coloured by threat probability"""
+    if "parent_pid" not in df.columns:
+        return px.treemap(title="Lineage columns are not in this snapshot")
+    ids, parents, mask = _tree_nodes(df, max_nodes)
+    nodes = df[mask].assign(
+        node_id=ids,
+        node_parent=parents,
+        label=df.loc[mask, "process_name"].astype(str) + " (" + df.loc[mask, "pid"].astype(str) + ")",
+    )
+    if "host" in nodes.columns:
+        hosts = pd.DataFrame({"node_id": nodes["host"].unique(), "node_parent": "",
+                              "threat_probability": 0.0})
+        hosts["label"] = hosts["node_id"]
+        nodes["node_parent"] = nodes["node_parent"].where(nodes["node_parent"] != "", nodes["host"])
+        nodes = pd.concat([hosts, nodes], ignore_index=True)
+
+    fig = px.treemap(
+        nodes,
+        ids="node_id",
+        parents="node_parent",
+        names="label",
+        color="threat_probability",
+        color_continuous_scale=[COLORS[0], COLORS[1]],
+        range_color=[0, 1],
+        hover_data={col: True for col in ["parent_name", "lineage_depth", "child_count", "spawn_rate"]
+                    if col in nodes.columns},
+        maxdepth=3,
+    )
+    if mask.sum() < len(df):
+        fig.update_layout(title=f"Highest threat scores with their ancestors, "
+                                f"{mask.sum()} of {len(df)} processes shown")
+    return fig
+
+
+CHART_VIEWS = {
+    "🎯 Threat Distribution": threat_pie,
+    "📊 Top CPU Consumers": top_cpu_bar,
+    "🌐 CPU vs Memory vs Network (3D)": scatter_3d,
+    "🌳 Process Tree": process_tree,
+}
+
+
+def build_figure(view, df):
+    return CHART_VIEWS[view](df)
+
+
+# ---------- TABLE STYLING ----------
+def _prediction_colors(frame, prediction):
+    css = np.where(prediction.loc[frame.index].to_numpy() == 1, SUSPICIOUS_CSS, NORMAL_CSS)
+    return pd.DataFrame(np.repeat(css[:, None], frame.shape[1], axis=1),
+                        index=frame.index, columns=frame.columns)
+
+
+def highlight_predictions(df):
+    """
+    Styler colouring the key columns by prediction. The CSS for all
+    cells is built in one vectorized call (axis=None) instead of calling
+    a Python function per row.
+    """
+    subset = [col for col in HIGHLIGHT_COLS if col in df.columns]
+    return df.style.apply(_prediction_colors, axis=None, subset=subset, prediction=df["prediction"])
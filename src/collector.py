@@ -0,0 +1,262 @@
+"""
+Process collection for the live monitor.
+
+A sampler walks the running processes once per tick and keeps state
+between ticks, so CPU usage can be computed from cpu_times deltas over
+the real refresh interval. ProcessSampler uses psutil; ProcfsSampler
+(src/procfs.py) reads /proc directly on Linux. An ActivityProbe
+(src/features.py) adds network and file activity, and an EntropyProbe
+(src/entropy.py) the entropy of each process's executable. Samplers fill a
+columnar ProcessSnapshot (src/snapshot.py) in place, which holds one row
+of model features per process, and RollingWindows (src/rolling.py)
+appends per-process window statistics and PidIndex (src/lineage.py) the
+process-tree lineage columns.
+"""
+
+import os
+import time
+
+import psutil
+
+from src.config import COLLECTOR_BACKEND
+from src.entropy import NEUTRAL_ENTROPY, EntropyProbe
+from src.features import ActivityProbe
+from src.lineage import PidIndex
+from src.rolling import RollingWindows
+from src.snapshot import ProcessSnapshot
+
+
+# ---------- CPU DELTAS ----------
+class CpuDeltaTracker:
+    """
+    Turns cumulative per-PID CPU seconds into CPU% between ticks.
+
+    CPU% is the change in user+system time divided by the wall time since
+    the previous reading, which matches psutil's cpu_percent semantics
+    (100 = one full core). A PID seen for the first time reports 0% until
+    it has a baseline.
+    """
+
+    def __init__(self):
+        self._prev = {}  # pid -> (cpu seconds, monotonic time)
+
+    def update(self, pid, cpu_total, now):
+        cpu = 0.0
+        prev = self._prev.get(pid)
+        if prev is not None:
+            prev_total, prev_time = prev
+            elapsed = now - prev_time
+            # A negative delta means the PID was reused by a new process
+            if elapsed > 0 and cpu_total >= prev_total:
+                cpu = (cpu_total - prev_total) / elapsed * 100
+        self._prev[pid] = (cpu_total, now)
+        return cpu
+
+    def forget(self, pid):
+        self._prev.pop(pid, None)
+
+    def retain(self, live_pids):
+        """Drop baselines for PIDs not in `live_pids`"""
+        for pid in [pid for pid in self._prev if pid not in live_pids]:
+            del self._prev[pid]
+
+
+# ---------- PROCESS SAMPLER ----------
+class ProcessSampler:
+    """
+    Single-pass psutil process sampler.
+
+    Per-PID psutil.Process handles and the previous cpu_times reading are
+    kept across ticks, so each tick is one walk over the process table.
+    """
+
+    def __init__(self):
+        self._procs = {}  # pid -> psutil.Process
+        self._last = {}  # pid -> last appended sample, for carried PIDs
+        self._cpu = CpuDeltaTracker()
+
+    def __len__(self):
+        return len(self._procs)
+
+    def sample(self, exclude_pids=()):
+        """Return a list of raw per-process samples (dicts)"""
+        snapshot = ProcessSnapshot()
+        self.sample_into(snapshot, exclude_pids)
+        return snapshot.records()
+
+    def sample_into(self, snapshot, exclude_pids=(), pids=None, carry=()):
+        """
+        Append every readable process (of `pids`, default all) to
+        `snapshot`; PIDs in `carry` repeat their last sample unread
+        """
+        now = time.monotonic()
+        pids = psutil.pids() if pids is None else list(pids)
+        append = snapshot.append
+
+        for pid in pids:
+            if pid in exclude_pids:
+                continue
+            if pid in carry:
+                last = self._last.get(pid)
+                if last is not None:
+                    append(*last)
+                    continue
+
+            proc = self._procs.get(pid)
+            if proc is None:
+                try:
+                    proc = psutil.Process(pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+                self._procs[pid] = proc
+
+            try:
+                with proc.oneshot():
+                    name = proc.name()
+                    cpu_times = proc.cpu_times()
+                    rss = proc.memory_info().rss
+                    threads = proc.num_threads()
+            except psutil.NoSuchProcess:
+                self._forget(pid)
+                continue
+            except psutil.AccessDenied:
+                continue
+
+            sample = (pid, name or "Unknown", proc.create_time(),
+                      self._cpu.update(pid, cpu_times.user + cpu_times.system, now),
+                      rss / (1024*1024), threads or 1)
+            self._last[pid] = sample
+            append(*sample)
+
+        # Evict handles for processes that have exited
+        live = set(pids)
+        for pid in [pid for pid in self._procs if pid not in live]:
+            self._forget(pid)
+
+        return snapshot
+
+    def _forget(self, pid):
+        self._procs.pop(pid, None)
+        self._last.pop(pid, None)
+        self._cpu.forget(pid)
+
+
+def make_sampler(backend=COLLECTOR_BACKEND):
+    """
+    Build the process sampler selected by `backend`.
+
+    "procfs" reads /proc directly, "psutil" uses psutil and "auto" picks
+    procfs on Linux and psutil everywhere else.
+    """
+    if backend not in ("auto", "procfs", "psutil"):
+        raise ValueError(f"Unknown collector backend: {backend!r}")
+
+    if backend != "psutil":
+        from src.procfs import ProcfsSampler, procfs_available
+        if procfs_available():
+            return ProcfsSampler()
+        if backend == "procfs":
+            print("⚠️ /proc is not available on this host, falling back to psutil")
+
+    return ProcessSampler()
+
+
+# ---------- FEATURES ----------
+# File entropy for processes whose executable is unknown or not hashed yet
+NEUTRAL_FILE_ENTROPY = NEUTRAL_ENTROPY
+
+
+def add_features(snapshot, activity=None, entropy=None):
+    """
+    Complete the model features of a sampled snapshot in place.
+
+    `activity` maps pid -> (file_access_count, network_packets,
+    network_ports) as returned by ActivityProbe.collect; `entropy` is the
+    per-row executable entropy from EntropyProbe.collect.
+    """
+    snapshot.fill_activity(activity)
+    snapshot.feature("privilege_escalation_attempt")[:] = snapshot.feature("memory_usage") > 500
+    snapshot.feature("file_entropy")[:] = NEUTRAL_FILE_ENTROPY if entropy is None else entropy
+    return snapshot
+
+
+def build_features(samples, activity=None, entropy=None):
+    """Build the model feature frame from a list of raw process samples (dicts)"""
+    return add_features(ProcessSnapshot.from_records(samples), activity, entropy).to_frame()
+
+
+# ---------- COLLECT LIVE DATA ----------
+_default_sampler = None
+_default_probe = None
+_default_entropy = None
+_default_rolling = None
+_default_lineage = None
+
+
+def collect_snapshot(exclude_pids=None, sampler=None, probe=None, entropy=None, pids=None,
+                     scheduler=None):
+    """
+    Collect system processes (`pids`, default all), skipping
+    `exclude_pids` (defaults to this process), into a ProcessSnapshot with
+    every model feature filled in. With a SamplingScheduler, only the
+    processes it marks as due are read; the others repeat their last
+    sample and activity values.
+    """
+    global _default_sampler, _default_probe, _default_entropy
+    if exclude_pids is None:
+        exclude_pids = {os.getpid()}
+    if sampler is None:
+        if _default_sampler is None:
+            _default_sampler = make_sampler()
+        sampler = _default_sampler
+    if probe is None:
+        if _default_probe is None:
+            _default_probe = ActivityProbe()
+        probe = _default_probe
+    if entropy is None:
+        if _default_entropy is None:
+            _default_entropy = EntropyProbe()
+        entropy = _default_entropy
+
+    carry = scheduler.carry() if scheduler is not None else ()
+    snapshot = sampler.sample_into(ProcessSnapshot(), exclude_pids, pids, carry)
+    pids = snapshot.pid.tolist()
+    create_times = snapshot.create_time.tolist()
+    due = scheduler.due(pids, create_times) if scheduler is not None else None
+    return add_features(snapshot, probe.collect(pids, due),
+                        entropy.collect(pids, create_times, snapshot.process_name))
+
+
+def collect_live_data(exclude_pids=None, sampler=None, probe=None, rolling=None, lineage=None,
+                      entropy=None):
+    """
+    Collect system processes as a DataFrame, skipping `exclude_pids`
+    (defaults to this process), and add the rolling window statistics
+    and lineage columns
+    """
+    global _default_rolling, _default_lineage
+    if rolling is None:
+        if _default_rolling is None:
+            _default_rolling = RollingWindows()
+        rolling = _default_rolling
+    if lineage is None:
+        if _default_lineage is None:
+            _default_lineage = PidIndex()
+        lineage = _default_lineage
+    df = collect_snapshot(exclude_pids, sampler, probe, entropy).to_frame()
+    return lineage.update_frame(rolling.update_frame(df))
+
+
+def collect_once(warmup=1.0, exclude_pids=None):
+    """
+    One-off collection for scripts: takes a baseline tick, waits `warmup`
+    seconds and returns the second tick, so CPU and I/O rates are real.
+    """
+    sampler = make_sampler()
+    probe = ActivityProbe()
+    rolling = RollingWindows()
+    lineage = PidIndex()
+    collect_live_data(exclude_pids, sampler=sampler, probe=probe, rolling=rolling, lineage=lineage)
+    time.sleep(warmup)
+    return collect_live_data(exclude_pids, sampler=sampler, probe=probe, rolling=rolling,
+                             lineage=lineage)
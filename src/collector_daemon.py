@@ -0,0 +1,187 @@
+"""
+Standalone collector daemon.
+
+Samples the system on its own schedule, scores every process and
+publishes the result to the shared snapshot store. Dashboards only read
+the latest snapshot, so collection cost stays the same however many
+viewers are connected.
+
+A ProcessWatcher (src/proc_events.py) follows process starts and exits
+between ticks: its live PID set replaces the /proc listing, and processes
+that started and exited since the previous tick are scored on their own,
+recorded in the history and alerted on, instead of going unseen.
+
+A SamplingScheduler (src/scheduler.py) decides which processes are re-read
+each tick (the others carry their last sample forward), and stretches the tick interval when the
+host is under heavy load.
+
+Usage (from the repository root):
+    python -m src.collector_daemon --interval 5
+"""
+
+import argparse
+import os
+import time
+
+from src.alerts import AlertEngine, sinks_from_config
+from src.baselines import Baselines
+from src.collector import add_features, collect_snapshot, make_sampler
+from src.config import (ACTIVITY_BUDGET, BASELINES_PATH, COLLECT_INTERVAL, COLLECTOR_BACKEND,
+                        COMPACT_INTERVAL, ENTROPY_BUDGET, HISTORY_PATH, PROC_EVENTS,
+                        SAMPLE_SCHEDULER, SNAPSHOT_PATH)
+from src.entropy import EntropyProbe
+from src.features import ActivityProbe
+from src.history import HistoryStore
+from src.lineage import PidIndex
+from src.proc_events import make_watcher
+from src.rolling import RollingWindows
+from src.scheduler import SamplingScheduler
+from src.scoring import ScoreCache, load_engine, predict_threats
+from src.snapshot import ProcessSnapshot
+from src.snapshot_store import publish_snapshot
+
+
+def score_short_lived(watcher, snapshot, engine, baselines):
+    """
+    Score the processes that started and exited between two ticks, as
+    drained from `watcher`. Activity and entropy can no longer be read, so
+    those features keep their neutral values.
+    """
+    gone = watcher.drain(zip(snapshot.pid.tolist(), snapshot.create_time.tolist()))
+    df = add_features(ProcessSnapshot.from_records(gone)).to_frame()
+    return predict_threats(df, engine, baselines=baselines)
+
+
+def run(interval=COLLECT_INTERVAL, snapshot_path=SNAPSHOT_PATH, backend=COLLECTOR_BACKEND,
+        history_path=HISTORY_PATH, events_backend=PROC_EVENTS, adaptive=SAMPLE_SCHEDULER,
+        max_ticks=None):
+    engine = load_engine()
+    cache = ScoreCache()
+    baselines = Baselines.load(BASELINES_PATH)
+    history = HistoryStore(history_path) if history_path else None
+    next_maintenance = time.monotonic() + COMPACT_INTERVAL
+    sampler = make_sampler(backend)
+    probe = ActivityProbe(budget=min(ACTIVITY_BUDGET, interval / 2))
+    entropy = EntropyProbe(budget=min(ENTROPY_BUDGET, interval / 4))
+    rolling = RollingWindows()
+    lineage = PidIndex()
+    alerts = AlertEngine(sinks_from_config())
+    watcher = make_watcher(events_backend)
+    scheduler = SamplingScheduler() if adaptive else None
+    own_pid = os.getpid()
+    snapshot_id = 0
+
+    print(f"🛡️ Collector daemon started (pid {own_pid}, every {interval}s)")
+    print(f"   Backend: {type(sampler).__name__}")
+    if watcher is not None:
+        print(f"   Process events: {watcher.backend}")
+    if scheduler is not None:
+        print(f"   Adaptive sampling: processes read every 1/{scheduler.normal_every}/"
+              f"{scheduler.slow_every} ticks (fast/normal/slow)")
+    print(f"   Publishing snapshots to {snapshot_path}")
+    if history is not None:
+        print(f"   Recording history to {history_path}")
+    print(f"   Alert sinks: {', '.join(repr(sink) for sink in alerts.sinks)}")
+
+    try:
+        while max_ticks is None or snapshot_id < max_ticks:
+            started = time.monotonic()
+
+            snapshot = collect_snapshot(exclude_pids={own_pid}, sampler=sampler, probe=probe,
+                                        entropy=entropy,
+                                        pids=watcher.live_pids() if watcher is not None else None,
+                                        scheduler=scheduler)
+            df = lineage.update_frame(rolling.update_frame(snapshot.to_frame()))
+            # The model reads the snapshot's feature block directly when it covers every input
+            features = None
+            if set(engine.feature_cols) <= set(snapshot.feature_cols):
+                features = snapshot.feature_matrix(engine.feature_cols)
+            hits, misses = cache.hits, cache.misses
+            df = predict_threats(df, engine, cache=cache, baselines=baselines, features=features)
+            tick_hits, tick_misses = cache.hits - hits, cache.misses - misses
+            tick_interval = interval
+            if scheduler is not None:
+                scheduler.update(df)
+                tick_interval = interval * scheduler.backoff
+            events = alerts.process(df)
+            short_lived = None
+            if watcher is not None:
+                short_lived = score_short_lived(watcher, snapshot, engine, baselines)
+                events += alerts.report(short_lived)
+            snapshot_id += 1
+            stats = {
+                "active_alerts": len(alerts.active),
+                "alerts_dropped": alerts.dropped,
+                "cache_hits": tick_hits,
+                "cache_misses": tick_misses,
+                "cache_hit_rate": cache.hit_rate,
+                "entropy_cached_binaries": len(entropy.cache),
+                "entropy_pending": entropy.pending,
+            }
+            if watcher is not None:
+                stats["process_starts"] = watcher.started
+                stats["process_exits"] = watcher.exited
+                stats["short_lived_scored"] = len(short_lived)
+            if scheduler is not None:
+                stats["sampled"] = scheduler.last_due
+                stats["sampling_tiers"] = scheduler.tier_counts()
+                stats["sampling_backoff"] = scheduler.backoff
+            publish_snapshot(df, snapshot_id, tick_interval, path=snapshot_path, stats=stats)
+
+            if history is not None:
+                history.append(df)
+                if short_lived is not None:
+                    history.append(short_lived)
+            if time.monotonic() >= next_maintenance:
+                if history is not None:
+                    history.compact()
+                baselines.save(BASELINES_PATH)
+                next_maintenance = time.monotonic() + COMPACT_INTERVAL
+
+            elapsed = time.monotonic() - started
+            short_note = f", {len(short_lived)} short-lived" if short_lived is not None else ""
+            sample_note = f", read {scheduler.last_due}" if scheduler is not None else ""
+            print(f"[{time.strftime('%H:%M:%S')}] snapshot {snapshot_id}: "
+                  f"{len(df)} processes in {elapsed:.2f}s "
+                  f"(re-scored {tick_misses}, cached {tick_hits}{short_note}{sample_note})")
+            for event in events:
+                icon = "🚨" if event["event"] == "raised" else "✅"
+                print(f"   {icon} {event['event']}: {event['process_name']} (pid {event['pid']}, "
+                      f"p={event['threat_probability']:.2f})")
+
+            # Sleep for the rest of the interval so ticks stay on schedule
+            time.sleep(max(0.0, tick_interval - elapsed))
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        alerts.close()
+        baselines.save(BASELINES_PATH)
+        entropy.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live Cyber Threat Monitor collector daemon")
+    parser.add_argument("--interval", type=float, default=COLLECT_INTERVAL,
+                        help="seconds between snapshots")
+    parser.add_argument("--snapshot-path", default=SNAPSHOT_PATH,
+                        help="where to publish the latest snapshot")
+    parser.add_argument("--backend", choices=["auto", "procfs", "psutil"], default=COLLECTOR_BACKEND,
+                        help="process collection backend")
+    parser.add_argument("--history-path", default=HISTORY_PATH,
+                        help="SQLite history store ('' to disable)")
+    parser.add_argument("--events", choices=["auto", "netlink", "procdiff", "off"], default=PROC_EVENTS,
+                        help="process start/exit event source")
+    parser.add_argument("--no-adaptive", action="store_true",
+                        help="read every process in full on every tick")
+    args = parser.parse_args()
+
+    try:
+        run(interval=args.interval, snapshot_path=args.snapshot_path, backend=args.backend,
+            history_path=args.history_path, events_backend=args.events,
+            adaptive=not args.no_adaptive)
+    except KeyboardInterrupt:
+        print("\n✅ Collector daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
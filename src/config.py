@@ -0,0 +1,209 @@
+"""
+Shared paths and runtime settings for the monitor.
+
+Every value can be overridden with an environment variable so the
+dashboards, the collector daemon and the scripts agree on one layout
+no matter which directory they are started from.
+"""
+
+import os
+
+# ---------- PATHS ----------
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_DIR = os.environ.get("CTM_DATA_DIR", os.path.join(ROOT_DIR, "data"))
+MODELS_DIR = os.environ.get("CTM_MODELS_DIR", os.path.join(ROOT_DIR, "models"))
+
+MODEL_PATH = os.environ.get("CTM_MODEL_PATH", os.path.join(MODELS_DIR, "cyber_model.pkl"))
+SCALER_PATH = os.environ.get("CTM_SCALER_PATH", os.path.join(MODELS_DIR, "scaler.pkl"))
+
+# Flattened forest with the scaler folded into its thresholds (runs on raw features),
+# in the memory-mappable format of FlatForest.save
+RAW_FOREST_PATH = os.environ.get("CTM_RAW_FOREST_PATH",
+                                 os.path.join(MODELS_DIR, "cyber_forest_raw.forest"))
+
+# Latest scored snapshot published by the collector daemon
+SNAPSHOT_PATH = os.environ.get("CTM_SNAPSHOT_PATH", os.path.join(DATA_DIR, "live", "latest.pkl"))
+
+# Time-series store of every scored snapshot
+HISTORY_PATH = os.environ.get("CTM_HISTORY_PATH", os.path.join(DATA_DIR, "live", "history.db"))
+
+# ---------- COLLECTION ----------
+COLLECT_INTERVAL = float(os.environ.get("CTM_COLLECT_INTERVAL", "5"))
+
+# "auto" (procfs on Linux, psutil elsewhere), "procfs" or "psutil"
+COLLECTOR_BACKEND = os.environ.get("CTM_COLLECTOR_BACKEND", "auto")
+
+# Seconds per tick allowed for per-process fd / I/O counter reads
+ACTIVITY_BUDGET = float(os.environ.get("CTM_ACTIVITY_BUDGET", "1.0"))
+
+# A snapshot older than this many intervals is treated as stale
+STALE_AFTER_INTERVALS = 3
+
+# ---------- PROCESS EVENTS ----------
+# Process starts and exits between ticks: "auto" (netlink proc connector when
+# privileged, else a /proc directory diff), "netlink", "procdiff" or "off"
+PROC_EVENTS = os.environ.get("CTM_PROC_EVENTS", "auto")
+# Seconds between /proc diffs and between re-reads of newly started processes
+PROC_EVENTS_INTERVAL = float(os.environ.get("CTM_PROC_EVENTS_INTERVAL", "0.25"))
+# Processes started between two ticks kept for scoring; the oldest are dropped beyond this
+PROC_EVENTS_MAX_PENDING = 4096
+
+# ---------- FILE ENTROPY ----------
+# Executable entropy is cached by (device, inode, mtime, size) in an LRU of
+# this many binaries, saved every ENTROPY_SAVE_INTERVAL seconds when it changed
+ENTROPY_CACHE_PATH = os.environ.get("CTM_ENTROPY_CACHE_PATH",
+                                    os.path.join(DATA_DIR, "live", "entropy_cache.json"))
+ENTROPY_CACHE_SIZE = 4096
+ENTROPY_SAVE_INTERVAL = 300
+# Seconds per tick spent hashing binaries not in the cache yet
+ENTROPY_BUDGET = float(os.environ.get("CTM_ENTROPY_BUDGET", "0.5"))
+# Larger files are sampled in evenly spaced blocks totalling this many bytes
+ENTROPY_MAX_BYTES = 32 * 1024 * 1024
+
+# ---------- MODEL FEATURES ----------
+FEATURE_COLS = ["file_access_count", "cpu_usage", "memory_usage",
+                "network_packets", "network_ports",
+                "privilege_escalation_attempt", "file_entropy"]
+
+# ---------- TRAINING ----------
+# Every trained model is kept in its own version directory with a manifest;
+# the promoted version is copied to MODEL_PATH / SCALER_PATH / RAW_FOREST_PATH
+MODEL_VERSIONS_DIR = os.environ.get("CTM_MODEL_VERSIONS_DIR", os.path.join(MODELS_DIR, "versions"))
+MODEL_MANIFEST_PATH = os.environ.get("CTM_MODEL_MANIFEST_PATH", os.path.join(MODELS_DIR, "manifest.json"))
+
+# Worker processes for cross-validation and cores for the final fit (0 = all)
+TRAIN_N_JOBS = int(os.environ.get("CTM_TRAIN_N_JOBS", "0"))
+TRAIN_CV_FOLDS = 5
+# Hyperparameter combinations tried per run, sampled from training.SEARCH_SPACE
+TRAIN_MAX_CANDIDATES = int(os.environ.get("CTM_TRAIN_MAX_CANDIDATES", "12"))
+
+# Model selection: the forest must score TICK_ROWS processes within the
+# budget and stay under the size cap; among the candidates whose F1 is within
+# TRAIN_F1_TOLERANCE of the best, the fastest wins
+INFERENCE_BUDGET_MS = float(os.environ.get("CTM_INFERENCE_BUDGET_MS", "20"))
+TICK_ROWS = int(os.environ.get("CTM_TICK_ROWS", "1000"))
+MODEL_MAX_BYTES = int(os.environ.get("CTM_MODEL_MAX_BYTES", str(16 * 1024 * 1024)))
+TRAIN_F1_TOLERANCE = 0.01
+
+# ---------- INCREMENTAL SCORING ----------
+# A cached score is reused while every feature stays in the same bucket of
+# this width; features not listed here must match exactly.
+SCORE_TOLERANCES = {
+    "file_access_count": 2,
+    "cpu_usage": 2.0,
+    "memory_usage": 5.0,
+    "network_packets": 10,
+    "network_ports": 1,
+    "privilege_escalation_attempt": 1,
+    "file_entropy": 0.1,
+}
+
+# Seconds before a cached score is recomputed even if nothing moved
+SCORE_CACHE_TTL = float(os.environ.get("CTM_SCORE_CACHE_TTL", "60"))
+
+# ---------- THREAT SCORE BASELINES ----------
+# Memory and packets are scored relative to a streaming high quantile of
+# each metric instead of the maximum of the current frame
+BASELINE_METRICS = ["memory_usage", "network_packets"]
+BASELINE_QUANTILE = 0.99
+# Processes sampled into the baselines per tick
+BASELINE_SAMPLE = 64
+# Observations before a baseline replaces the per-frame maximum
+BASELINE_WARMUP = 200
+BASELINES_PATH = os.environ.get("CTM_BASELINES_PATH", os.path.join(DATA_DIR, "live", "baselines.json"))
+
+# ---------- FLEET ----------
+# Agents POST compressed Arrow batches to the aggregator, which scores them
+# centrally and publishes one fleet-wide snapshot with a host column
+AGGREGATOR_PORT = int(os.environ.get("CTM_AGGREGATOR_PORT", "8750"))
+AGGREGATOR_URL = os.environ.get("CTM_AGGREGATOR_URL", f"http://127.0.0.1:{AGGREGATOR_PORT}")
+# Shared secret sent by agents in the X-CTM-Token header ('' = no check)
+AGGREGATOR_TOKEN = os.environ.get("CTM_AGGREGATOR_TOKEN", "")
+# Batches larger than this are rejected
+MAX_BATCH_BYTES = 32 * 1024 * 1024
+# The fleet snapshot and its alert log, kept apart from the local daemon's so
+# both can run on the monitoring host
+FLEET_SNAPSHOT_PATH = os.environ.get("CTM_FLEET_SNAPSHOT_PATH",
+                                     os.path.join(DATA_DIR, "live", "fleet.pkl"))
+FLEET_ALERTS_PATH = os.environ.get("CTM_FLEET_ALERTS_PATH",
+                                   os.path.join(DATA_DIR, "live", "fleet_alerts.jsonl"))
+
+# ---------- DASHBOARD ----------
+# Points drawn in the 3D scatter; suspicious processes are always kept
+SCATTER_MAX_POINTS = int(os.environ.get("CTM_SCATTER_MAX_POINTS", "2000"))
+
+# Processes drawn in the process tree (ancestors of the riskiest first)
+TREE_MAX_NODES = int(os.environ.get("CTM_TREE_MAX_NODES", "500"))
+
+# Rows per page of the process table
+TABLE_PAGE_SIZE = int(os.environ.get("CTM_TABLE_PAGE_SIZE", "50"))
+
+# History rows a dashboard download may cover; the file is built in the
+# Streamlit process's memory, so longer ranges go through python -m src.export
+EXPORT_MAX_ROWS = int(os.environ.get("CTM_EXPORT_MAX_ROWS", "500000"))
+
+# ---------- LINEAGE ----------
+# Seconds over which a process's child spawns are counted for spawn_rate
+LINEAGE_SPAWN_WINDOW = 60
+
+# ---------- HISTORY RETENTION ----------
+# Seconds each resolution is kept before it is rolled up (raw -> 1 min -> 1 h) or dropped
+RETENTION_RAW = int(os.environ.get("CTM_RETENTION_RAW", str(6 * 3600)))
+RETENTION_1M = int(os.environ.get("CTM_RETENTION_1M", str(7 * 86400)))
+RETENTION_1H = int(os.environ.get("CTM_RETENTION_1H", str(90 * 86400)))
+
+# Seconds between compaction runs in the collector daemon
+COMPACT_INTERVAL = 300
+
+# ---------- ROLLING WINDOWS ----------
+# Per-process metrics tracked over the last N samples (N = each window size)
+ROLLING_METRICS = ["cpu_usage", "memory_usage", "num_threads"]
+ROLLING_WINDOWS = [int(w) for w in os.environ.get("CTM_ROLLING_WINDOWS", "12").split(",")]
+
+# The window aggregates are snapshot columns like any other feature: a model
+# trained on data that includes them (see rolling.rolling_columns) uses them,
+# since the engine scores whichever columns its artifact lists.
+
+# ---------- ALERTS ----------
+# Hysteresis on threat_probability: raise at or above, clear at or below
+ALERT_RAISE_AT = float(os.environ.get("CTM_ALERT_RAISE_AT", "0.6"))
+ALERT_CLEAR_AT = float(os.environ.get("CTM_ALERT_CLEAR_AT", "0.4"))
+
+# Events buffered per sink before new ones are dropped
+ALERT_QUEUE_SIZE = 1000
+
+ALERTS_PATH = os.environ.get("CTM_ALERTS_PATH", os.path.join(DATA_DIR, "live", "alerts.jsonl"))
+
+# Optional sinks: a syslog socket path or host:port, and a webhook URL
+_syslog = os.environ.get("CTM_ALERT_SYSLOG", "")
+if ":" in _syslog:
+    _host, _port = _syslog.rsplit(":", 1)
+    ALERT_SYSLOG_ADDRESS = (_host, int(_port))
+else:
+    ALERT_SYSLOG_ADDRESS = _syslog
+ALERT_WEBHOOK_URL = os.environ.get("CTM_ALERT_WEBHOOK_URL", "")
+
+# ---------- ADAPTIVE SAMPLING ----------
+# Per-process reads (stat/statm, fds, I/O) run every tick for the fast tier and
+# every SAMPLE_NORMAL_EVERY / SAMPLE_SLOW_EVERY ticks for the other tiers,
+# which carry their last sample forward in between
+SAMPLE_SCHEDULER = os.environ.get("CTM_SAMPLE_SCHEDULER", "1") == "1"
+SAMPLE_NORMAL_EVERY = int(os.environ.get("CTM_SAMPLE_NORMAL_EVERY", "3"))
+SAMPLE_SLOW_EVERY = int(os.environ.get("CTM_SAMPLE_SLOW_EVERY", "12"))
+# Fast tier: threat_probability at or above this in the last SAMPLE_HOLD_TICKS
+# ticks, a CPU coefficient of variation above SAMPLE_FAST_CV over the rolling
+# window, or younger than SAMPLE_YOUNG_SECONDS
+SAMPLE_HOT_AT = ALERT_CLEAR_AT
+SAMPLE_HOLD_TICKS = 12
+SAMPLE_FAST_CV = 0.5
+SAMPLE_YOUNG_SECONDS = 60
+# Slow tier: below SAMPLE_QUIET_BELOW for SAMPLE_SETTLE_TICKS ticks in a row
+# and older than SAMPLE_OLD_SECONDS
+SAMPLE_QUIET_BELOW = 0.1
+SAMPLE_SETTLE_TICKS = 12
+SAMPLE_OLD_SECONDS = 600
+# Above this 1-minute load per CPU the tick interval and the normal and slow
+# cadences are stretched in proportion, up to SAMPLE_MAX_BACKOFF times
+SAMPLE_BACKOFF_LOAD = float(os.environ.get("CTM_SAMPLE_BACKOFF_LOAD", "1.0"))
+SAMPLE_MAX_BACKOFF = 4.0
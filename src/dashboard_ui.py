@@ -0,0 +1,206 @@
+"""
+Streamlit building blocks shared by the dashboard pages.
+
+dashboards/dashboard.py and dashboards/live_threat_monitor.py render the
+same snapshot, alert feed, process table and export controls; both import
+them from here so a change is made once.
+"""
+
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from src import charts, export, scoring, table
+from src.alerts import read_recent_alerts
+from src.collector import collect_live_data
+from src.config import (ALERTS_PATH, COLLECT_INTERVAL, EXPORT_MAX_ROWS, FLEET_ALERTS_PATH,
+                        FLEET_SNAPSHOT_PATH, HISTORY_PATH, SNAPSHOT_PATH)
+from src.scoring import predict_threats
+from src.snapshot_store import is_stale, read_latest
+
+
+# ---------- LOAD MODEL ----------
+@st.cache_resource
+def load_engine():
+    try:
+        return scoring.load_engine()
+    except FileNotFoundError:
+        st.error("❌ Model not found! Train the model first by running train_model.py")
+        st.stop()
+
+
+# ---------- LIVE SNAPSHOT ----------
+@st.cache_data(ttl=COLLECT_INTERVAL, show_spinner=False)
+def collect_inline():
+    """
+    Fallback when the collector daemon is not running (shared by all
+    sessions); returns the scored frame and when it was collected
+    """
+    return predict_threats(collect_live_data(), load_engine()), time.time()
+
+
+SNAPSHOT_SOURCES = {"This host": SNAPSHOT_PATH, "Fleet": FLEET_SNAPSHOT_PATH}
+
+
+def choose_source():
+    """Sidebar choice of snapshot, offered once the fleet aggregator has published one"""
+    if not os.path.exists(FLEET_SNAPSHOT_PATH):
+        return "This host"
+    return st.sidebar.radio("Snapshot", list(SNAPSHOT_SOURCES), key="snapshot_source")
+
+
+def get_live_snapshot(source="This host"):
+    """
+    Latest snapshot from the collector daemon (or the fleet aggregator),
+    its tick stats and a key identifying it, or an inline scan of this host
+    (stats None) if the daemon is not running. Publishers restart their
+    snapshot ids at 1, so the key includes the publish time.
+    """
+    snapshot = read_latest(SNAPSHOT_SOURCES[source])
+    if source != "This host" and is_stale(snapshot):
+        st.sidebar.warning("⚠️ The fleet aggregator is not publishing, showing this host")
+        snapshot = read_latest(SNAPSHOT_PATH)
+    if not is_stale(snapshot):
+        return (snapshot["data"], snapshot.get("stats", {}),
+                f"{snapshot['created_at']!r}-{snapshot['snapshot_id']}")
+    df, collected_at = collect_inline()
+    return df, None, f"inline-{collected_at!r}"
+
+
+def show_daemon_status(daemon_stats):
+    """Sidebar note on where the snapshot came from and how the daemon is doing"""
+    if daemon_stats is None:
+        st.sidebar.info("ℹ️ Collector daemon not running, scanning inline. "
+                        "Start it with `python -m src.collector_daemon`.")
+    elif "hosts" in daemon_stats:
+        st.sidebar.caption(f"Fleet view: {daemon_stats['hosts']} hosts reporting to the aggregator")
+    elif "cache_hits" in daemon_stats:
+        st.sidebar.caption(f"Scoring: {daemon_stats['cache_misses']} re-scored, "
+                           f"{daemon_stats['cache_hits']} cached "
+                           f"({daemon_stats['cache_hit_rate']:.0%} hit rate)")
+    if daemon_stats and "sampling_tiers" in daemon_stats:
+        tiers = daemon_stats["sampling_tiers"]
+        backoff = daemon_stats["sampling_backoff"]
+        st.sidebar.caption(f"Sampling: {tiers['fast']} fast, {tiers['normal']} normal, "
+                           f"{tiers['slow']} slow" + (f" (backed off x{backoff:.1f})" if backoff > 1 else ""))
+
+
+# ---------- CHARTS ----------
+@st.cache_resource(max_entries=16, show_spinner=False)
+def cached_figure(snapshot_key, view, _df):
+    """Each figure is built once per snapshot and shared by every session"""
+    return charts.build_figure(view, _df)
+
+
+def show_chart(snapshot_key, df):
+    """Only the selected chart is built and sent to the browser"""
+    view = st.radio("Chart", list(charts.CHART_VIEWS), horizontal=True, key="chart_view")
+    st.subheader(view)
+    st.plotly_chart(cached_figure(snapshot_key, view, df), use_container_width=True)
+
+
+# ---------- ALERT FEED ----------
+def show_recent_alerts(daemon_stats):
+    """Alert transitions from the daemon or the aggregator, so each raise/clear shows up once"""
+    fleet = "hosts" in daemon_stats
+    active = daemon_stats.get("active_alerts", 0)
+    if active:
+        st.error(f"⚠️ **ALERT**: {active} process(es) currently above the alert threshold")
+    st.subheader("🔔 Recent Alerts")
+    events = read_recent_alerts(FLEET_ALERTS_PATH if fleet else ALERTS_PATH, limit=20)
+    if events:
+        columns = ["time", "event", "process_name", "pid", "threat_probability",
+                   "peak_probability", "reason"]
+        if fleet:
+            columns.insert(2, "host")
+        alerts_df = pd.DataFrame(events).reindex(columns=columns)
+        st.dataframe(alerts_df, use_container_width=True)
+    else:
+        st.caption("No alerts raised yet")
+
+
+# ---------- PROCESS TABLE ----------
+def show_process_table(df, highlight=False):
+    """
+    Filtered, sorted page of the snapshot; widget state survives autorefresh
+    reruns. `highlight` colours the rows by prediction.
+    """
+    st.subheader("📋 All Monitored Processes")
+    col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 1])
+    name = col1.text_input("Process name contains", key="table_name")
+    prediction = col2.selectbox("Prediction", list(table.PREDICTION_FILTERS), key="table_prediction")
+    min_probability = col3.slider("Min threat probability", 0.0, 1.0, 0.0, 0.05,
+                                  key="table_min_probability")
+    sort_by = col4.selectbox("Sort by", table.SORT_COLUMNS, key="table_sort_by")
+    ascending = col5.checkbox("Ascending", key="table_ascending")
+    host = None
+    if "host" in df.columns:
+        host = st.selectbox("Host", ["All hosts"] + sorted(df["host"].unique()), key="table_host")
+        host = None if host == "All hosts" else host
+
+    filtered = table.filter_processes(df, name, table.PREDICTION_FILTERS[prediction], min_probability,
+                                      host)
+    n_pages = table.page_count(len(filtered))
+    # Keep the page in range when the filter or the snapshot shrinks
+    if st.session_state.get("table_page", 1) > n_pages:
+        st.session_state["table_page"] = n_pages
+    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key="table_page")
+    page_df = table.sort_page(filtered, sort_by, ascending, int(page))
+
+    st.caption(f"{len(filtered)} of {len(df)} processes match, page {int(page)} of {n_pages}")
+    st.dataframe(charts.highlight_predictions(page_df) if highlight else page_df,
+                 use_container_width=True)
+
+
+# ---------- EXPORT ----------
+EXPORT_RANGES = {
+    "Current snapshot": None,
+    "History: last hour": 3600,
+    "History: last 24 hours": 86400,
+    "History: last 7 days": 7 * 86400,
+}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def history_rows(since):
+    """Rows in the last `since` seconds of history, re-counted at most once a minute"""
+    return export.count_history(time.time() - since)
+
+
+def export_data(df, source, fmt):
+    """
+    Runs only when the download button is clicked; rows are written chunk
+    by chunk and the file object is handed to Streamlit as is
+    """
+    since = EXPORT_RANGES[source]
+    if since is None:
+        frames = export.snapshot_frames(df)
+    else:
+        frames = export.history_frames(time.time() - since)
+    return export.export_to_buffer(frames, fmt)
+
+
+def show_export(df):
+    st.subheader("💾 Export Data")
+    sources = list(EXPORT_RANGES) if os.path.exists(HISTORY_PATH) else ["Current snapshot"]
+    col1, col2 = st.columns(2)
+    source = col1.selectbox("Data", sources, key="export_source")
+    fmt = col2.selectbox("Format", list(export.FORMATS), key="export_format")
+    since = EXPORT_RANGES[source]
+    # The snapshot is in memory already; a history range is bounded before it is built
+    rows = history_rows(since) if since is not None else 0
+    if rows > EXPORT_MAX_ROWS:
+        st.warning(f"{rows:,} rows in this range, more than the dashboard exports "
+                   f"({EXPORT_MAX_ROWS:,}). Export it from the command line instead: "
+                   f"`python -m src.export --since {since // 3600}h --format {fmt} --output <file>`")
+        return
+    name = "threat_snapshot" if since is None else "threat_history"
+    st.download_button(
+        label="Download",
+        data=lambda: export_data(df, source, fmt),
+        file_name=f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}",
+        mime=export.FORMATS[fmt]
+    )
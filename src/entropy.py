@@ -0,0 +1,199 @@
+"""
+Shannon entropy of each process's executable.
+
+Packed or encrypted binaries sit near the 8 bits/byte maximum, ordinary
+executables well below it. The file is memory-mapped and its byte
+histogram taken with one np.bincount; files over ENTROPY_MAX_BYTES are
+sampled in evenly spaced blocks.
+
+Hashing is expensive, so results are cached by the binary's (device,
+inode, mtime, size): a binary shared by many processes is read once, and
+a changed binary gets a new key. The cache is an LRU bounded at
+ENTROPY_CACHE_SIZE entries and saved to ENTROPY_CACHE_PATH, so a restart
+does not re-read everything. EntropyProbe resolves each process to its
+cache key once per (pid, create_time, name) and spends at most `budget`
+seconds per tick hashing binaries it has not seen; the rest get
+NEUTRAL_ENTROPY until a later tick.
+"""
+
+import json
+import mmap
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+import psutil
+
+from src.config import (ENTROPY_BUDGET, ENTROPY_CACHE_PATH, ENTROPY_CACHE_SIZE, ENTROPY_MAX_BYTES,
+                        ENTROPY_SAVE_INTERVAL)
+
+_HAS_PROC = sys.platform.startswith("linux") and os.path.exists("/proc/self/exe")
+
+# Value for processes without a readable executable (kernel threads, access denied)
+# and for binaries not hashed yet: the middle of the model's 0-8 training range
+NEUTRAL_ENTROPY = 4.0
+
+# Blocks read from files larger than ENTROPY_MAX_BYTES
+SAMPLE_BLOCKS = 16
+
+
+# ---------- ENTROPY ----------
+def _entropy_from_counts(counts):
+    p = counts[counts > 0] / counts.sum()
+    # abs() turns the -0.0 of a single-valued file into 0.0
+    return float(abs((p * np.log2(p)).sum()))
+
+
+def byte_entropy(data):
+    """Shannon entropy in bits per byte of a uint8 array"""
+    if len(data) == 0:
+        return 0.0
+    return _entropy_from_counts(np.bincount(data, minlength=256))
+
+
+def file_entropy(path, max_bytes=ENTROPY_MAX_BYTES):
+    """Entropy of a file, read through mmap; large files are sampled in SAMPLE_BLOCKS blocks"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0.0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                if size <= max_bytes:
+                    return byte_entropy(data)
+                block = max_bytes // SAMPLE_BLOCKS
+                starts = np.linspace(0, size - block, SAMPLE_BLOCKS).astype(np.int64)
+                return _entropy_from_counts(
+                    sum(np.bincount(data[s:s + block], minlength=256) for s in starts))
+            finally:
+                # The view must go before the map can close
+                del data
+
+
+# ---------- CACHE ----------
+class EntropyCache:
+    """LRU of (dev, inode, mtime_ns, size) -> entropy, persisted as JSON"""
+
+    def __init__(self, capacity=ENTROPY_CACHE_SIZE):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        self.dirty = True
+
+    def save(self, path=ENTROPY_CACHE_PATH):
+        """Write the entries, least recently used first, atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump([[*key, value] for key, value in self._entries.items()], f)
+        os.replace(tmp, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=ENTROPY_CACHE_PATH, capacity=ENTROPY_CACHE_SIZE):
+        """Cache from a saved file; an empty cache if it is missing or unreadable"""
+        cache = cls(capacity)
+        try:
+            with open(path) as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        for *key, value in rows[-capacity:]:
+            cache._entries[tuple(key)] = value
+        return cache
+
+
+def _stat_key(st):
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _exe_path(pid):
+    # /proc/<pid>/exe opens the binary itself, even from another mount namespace
+    # or after it was deleted; psutil only gives a path
+    return f"/proc/{pid}/exe" if _HAS_PROC else psutil.Process(pid).exe()
+
+
+# ---------- PER-PROCESS PROBE ----------
+class EntropyProbe:
+    def __init__(self, cache=None, budget=ENTROPY_BUDGET, path=ENTROPY_CACHE_PATH,
+                 save_interval=ENTROPY_SAVE_INTERVAL):
+        self.path = path
+        self.cache = cache if cache is not None else EntropyCache.load(path)
+        self.budget = budget
+        self.save_interval = save_interval
+        self._last_save = time.monotonic()
+        self._known = {}  # (pid, create_time) -> (name, entropy)
+        self.pending = 0  # processes left at NEUTRAL_ENTROPY last tick
+
+    def _entropy(self, pid, deadline):
+        """Entropy of `pid`'s executable, or None when the budget ran out before hashing it"""
+        try:
+            path = _exe_path(pid)
+            key = _stat_key(os.stat(path))
+        except (OSError, psutil.Error):
+            return NEUTRAL_ENTROPY
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        if time.monotonic() > deadline:
+            return None
+        try:
+            value = file_entropy(path)
+        except (OSError, ValueError):
+            return NEUTRAL_ENTROPY
+        self.cache.put(key, value)
+        return value
+
+    def collect(self, pids, create_times, names):
+        """float32 array of executable entropy, aligned with `pids`"""
+        deadline = time.monotonic() + self.budget
+        known = {}
+        out = np.full(len(pids), NEUTRAL_ENTROPY, dtype=np.float32)
+        self.pending = 0
+
+        for i, (pid, create_time, name) in enumerate(zip(pids, create_times, names)):
+            entry = self._known.get((pid, create_time))
+            # A changed name means the process exec'd another binary
+            if entry is None or entry[0] != name:
+                value = self._entropy(pid, deadline)
+                if value is None:
+                    self.pending += 1
+                    continue
+                entry = (name, value)
+            known[(pid, create_time)] = entry
+            out[i] = entry[1]
+        self._known = known
+
+        if self.cache.dirty and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return out
+
+    def save(self):
+        try:
+            self.cache.save(self.path)
+        except OSError:
+            pass  # read-only data dir: the cache just stays in memory
+        self._last_save = time.monotonic()
@@ -0,0 +1,185 @@
+"""
+Chunked export of snapshots and history ranges.
+
+Exports are written chunk by chunk to gzip-compressed CSV, plain CSV or
+Parquet, so a long history range is never held in memory at once: rows
+come from HistoryStore.iter_query() and each chunk is written out before
+the next one is read. Snapshot and history exports start with the same
+columns, history.HISTORY_COLS; a snapshot export keeps its other columns
+(host, rolling window and lineage columns, ...) after them.
+
+The dashboard builds its downloads in memory (st.download_button holds
+the whole file), so it only exports history ranges of up to
+EXPORT_MAX_ROWS rows; the command line has no limit.
+
+Usage (from the repository root):
+    python -m src.export --since 24h --format parquet --output history.parquet
+"""
+
+import argparse
+import gzip
+import io
+import time
+
+from src.config import HISTORY_PATH
+from src.history import HISTORY_COLS, ROLLUP_METRICS, HistoryStore
+
+FORMATS = {
+    "csv.gz": "application/gzip",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+CHUNK_ROWS = 50_000
+
+
+def iter_chunks(df, chunksize=CHUNK_ROWS):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+# ---------- WRITERS ----------
+def _write_csv(frames, f, compress):
+    out = gzip.open(f, "wt", newline="") if compress else _TextWriter(f)
+    rows = 0
+    with out:
+        for i, frame in enumerate(frames):
+            frame.to_csv(out, index=False, header=(i == 0))
+            rows += len(frame)
+    return rows
+
+
+class _TextWriter:
+    """Minimal text wrapper for a binary file that leaves it open on close"""
+
+    def __init__(self, f):
+        self._f = f
+
+    def write(self, text):
+        return self._f.write(text.encode())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.flush()
+
+
+def _write_parquet(frames, f):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+
+    writer = None
+    rows = 0
+    try:
+        for frame in frames:
+            batch = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(f, batch.schema, compression="zstd")
+            writer.write_table(batch.cast(writer.schema))
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_frames(frames, f, fmt="csv.gz"):
+    """Write an iterable of DataFrames to the binary file object `f`; returns the row count"""
+    if fmt == "parquet":
+        return _write_parquet(frames, f)
+    if fmt in ("csv", "csv.gz"):
+        return _write_csv(frames, f, compress=(fmt == "csv.gz"))
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_to_buffer(frames, fmt="csv.gz"):
+    """
+    Export into a BytesIO rewound to the start. st.download_button keeps
+    the file in memory either way and takes the BytesIO's buffer without
+    copying it; callers bound the size (see EXPORT_MAX_ROWS).
+    """
+    buffer = io.BytesIO()
+    write_frames(frames, buffer, fmt)
+    buffer.seek(0)
+    return buffer
+
+
+# ---------- SOURCES ----------
+def snapshot_rows(df, ts=None):
+    """
+    A scored snapshot as one raw sample per process at `ts`: HISTORY_COLS
+    first, then every other snapshot column in its original order
+    """
+    rows = df.reindex(columns=HISTORY_COLS + [col for col in df.columns if col not in HISTORY_COLS])
+    rows["ts"] = int(ts if ts is not None else time.time())
+    rows["resolution"] = 0
+    rows["samples"] = 1
+    for metric in ROLLUP_METRICS:
+        rows[f"{metric}_max"] = rows[metric]
+    return rows
+
+
+def snapshot_frames(df, chunksize=CHUNK_ROWS, ts=None):
+    return iter_chunks(snapshot_rows(df, ts), chunksize)
+
+
+def history_frames(start, end=None, pid=None, resolution="auto", path=HISTORY_PATH,
+                   chunksize=CHUNK_ROWS):
+    """History rows (HISTORY_COLS) between `start` and `end`, read `chunksize` rows at a time"""
+    store = HistoryStore(path)
+    try:
+        yield from store.iter_query(start, end, pid=pid, resolution=resolution, chunksize=chunksize)
+    finally:
+        store.close()
+
+
+def count_history(start, end=None, pid=None, resolution="auto", path=HISTORY_PATH):
+    store = HistoryStore(path)
+    try:
+        return store.count(start, end, pid=pid, resolution=resolution)
+    finally:
+        store.close()
+
+
+def export_history(output, start, end=None, fmt="csv.gz", pid=None, resolution="auto",
+                   path=HISTORY_PATH, chunksize=CHUNK_ROWS):
+    with open(output, "wb") as f:
+        return write_frames(history_frames(start, end, pid, resolution, path, chunksize), f, fmt)
+
+
+# ---------- CLI ----------
+def parse_duration(text):
+    """Seconds from '90', '15m', '6h' or '7d'"""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored history")
+    parser.add_argument("--since", default="1h", help="how far back to export, e.g. 90m, 24h, 7d")
+    parser.add_argument("--until", default="0", help="stop this long before now (default: now)")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv.gz")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--pid", type=int, help="only this process")
+    parser.add_argument("--resolution", default="auto", choices=["auto", "0", "60", "3600"],
+                        help="0 = raw samples, 60 / 3600 = one rollup table (default: all, finest available)")
+    parser.add_argument("--history-path", default=HISTORY_PATH)
+    args = parser.parse_args()
+
+    now = time.time()
+    resolution = args.resolution if args.resolution == "auto" else int(args.resolution)
+    started = time.perf_counter()
+    rows = export_history(args.output, now - parse_duration(args.since),
+                          now - parse_duration(args.until) + 1, fmt=args.format, pid=args.pid,
+                          resolution=resolution, path=args.history_path)
+    print(f"✅ Exported {rows} rows to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
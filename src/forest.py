@@ -0,0 +1,432 @@
+"""
+Flattened Random Forest for vectorized batch inference.
+
+FlatForest copies every tree of a fitted sklearn RandomForestClassifier
+into a handful of contiguous NumPy node arrays (feature, threshold,
+left/right child, leaf class probabilities). Probabilities are computed
+once per batch and labels are derived from them, instead of separate
+predict() and predict_proba() forest walks.
+
+Evaluation uses the bitvector scheme from QuickScorer: each split that
+sends a row right rules out the leaves of its left subtree, so a tree's
+exit leaf is the leftmost leaf not ruled out by any split. Splits are
+sorted per feature, and the AND of their leaf masks is precomputed for
+every prefix, so evaluating a row is one searchsorted per feature plus
+a few row gathers over all trees at once. Forests with more than 64
+leaves per tree fall back to a level-by-level walk of all trees.
+
+save() writes the node arrays to one flat file of 64-byte aligned
+arrays behind a small JSON header. load() maps it read-only, so a
+process pays no unpickling at startup and every process scoring with the
+same file shares one copy of its pages. The bitvector tables are built
+from the node arrays on first use (milliseconds, and many times the size
+of the nodes on disk); save(compiled=True) stores them in the file too.
+"""
+
+import json
+import mmap as _mmap
+import os
+import struct
+
+import numpy as np
+
+# Rows evaluated per step; keeps the per-chunk (rows, n_trees) arrays in cache
+CHUNK_ROWS = 512
+
+# Largest leaf count the 64-bit leaf masks can represent
+MAX_BITVECTOR_LEAVES = 64
+
+# Upper bound on the prefix-mask tables before falling back to the walk
+MAX_TABLE_BYTES = 256 * 1024 * 1024
+
+_ALL_LEAVES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Forest file: magic, little-endian u64 header length, JSON header, then every
+# array at a 64-byte aligned offset (relative to the aligned end of the header)
+FILE_MAGIC = b"CTMFRST\x00"
+FILE_VERSION = 1
+FILE_ALIGN = 64
+
+
+def _align(n):
+    return -(-n // FILE_ALIGN) * FILE_ALIGN
+
+
+def _float32_thresholds(threshold):
+    """
+    Largest float32 <= each threshold. sklearn compares float32 inputs
+    against float64 thresholds; comparing against these instead gives
+    identical results entirely in float32.
+    """
+    t32 = threshold.astype(np.float32)
+    over = t32.astype(np.float64) > threshold
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+def _snap_raw_thresholds(t, mean, scale, max_steps=16):
+    """
+    Raw-space equivalents of scaled thresholds `t`: the largest float32 v
+    with float32((v - mean) / scale) <= t, i.e. exactly the raw values
+    sklearn would send left. Thresholds often sit on a training value, so
+    the plain t * scale + mean can land an ulp on the wrong side.
+    """
+    def goes_left(v):
+        return ((v.astype(np.float64) - mean) / scale).astype(np.float32) <= t
+
+    v = _float32_thresholds(t * scale + mean)
+    up, down = np.float32(np.inf), np.float32(-np.inf)
+    for _ in range(max_steps):
+        nxt = np.nextafter(v, up)
+        move = goes_left(nxt)
+        if not move.any():
+            break
+        v = np.where(move, nxt, v)
+    for _ in range(max_steps):
+        wrong = ~goes_left(v)
+        if not wrong.any():
+            break
+        v = np.where(wrong, np.nextafter(v, down), v)
+    return v.astype(np.float64)
+
+
+class FlatForest:
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes):
+        self.feature = feature        # int32 (n_nodes,), split feature (0 at leaves)
+        self.threshold = threshold    # float64 (n_nodes,), go left when x <= threshold
+        self.left = left              # int32 (n_nodes,), leaves point at themselves
+        self.right = right            # int32 (n_nodes,)
+        self.value = value            # float64 (n_nodes, n_classes), leaf class probabilities
+        self.roots = roots            # int32 (n_trees,), root node of each tree
+        self.max_depth = int(max_depth)
+        self.classes = classes
+        self._compiled = None
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def n_features(self):
+        return int(self.feature.max()) + 1 if self.n_nodes else 0
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flatten a fitted RandomForestClassifier (single-output)"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n, dtype=np.int32)
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            values.append(value / totals)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_),
+        )
+
+    def fold_scaler(self, scaler):
+        """
+        Return a copy whose split thresholds are mapped back to raw feature
+        space through a fitted StandardScaler, so it can be evaluated on
+        unscaled features. Splits are invariant to the scaler's positive
+        affine transform: (x - mean) / scale <= t  <=>  x <= t * scale + mean.
+        """
+        n_features = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n_features)
+
+        is_leaf = self.left == np.arange(self.n_nodes)
+        split = np.flatnonzero(~is_leaf)
+        f = self.feature[split]
+        t = self.threshold[split]
+        raw = _snap_raw_thresholds(t, mean[f], scale[f])
+
+        threshold = np.zeros_like(self.threshold)
+        threshold[split] = raw
+        return FlatForest(self.feature, threshold, self.left, self.right, self.value,
+                          self.roots, self.max_depth, self.classes)
+
+    # ---------- SERIALIZATION ----------
+    def save(self, path, feature_names=None, compiled=False):
+        """
+        Write the forest as a single flat file (no pickled objects). With
+        `compiled`, the bitvector tables are stored too, so loading does
+        no work beyond mapping the file, at several times the file size.
+        """
+        arrays = {"feature": self.feature, "threshold": self.threshold, "left": self.left,
+                  "right": self.right, "value": self.value, "roots": self.roots,
+                  "classes": self.classes}
+        # "stored", "unsupported" (too many leaves or splits) or None (not saved)
+        bitvector = None
+        n_tables = 0
+        if compiled:
+            tables = self.compile()
+            bitvector = "stored" if tables is not None else "unsupported"
+            if tables is not None:
+                n_tables = len(tables.sorted_thresholds)
+                for f, (thresholds, masks) in enumerate(zip(tables.sorted_thresholds,
+                                                            tables.prefix_masks)):
+                    arrays[f"bv_thresholds_{f}"] = thresholds
+                    arrays[f"bv_masks_{f}"] = masks
+                for c, values in enumerate(tables.leaf_values):
+                    arrays[f"bv_values_{c}"] = values
+
+        header = {
+            "format_version": FILE_VERSION,
+            "max_depth": self.max_depth,
+            "feature_names": list(feature_names) if feature_names is not None else [],
+            "bitvector": bitvector,
+            "bitvector_features": n_tables,
+            "arrays": {},
+        }
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            arrays[name] = array
+            header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape),
+                                      "offset": offset}
+            offset = _align(offset + array.nbytes)
+
+        header_bytes = json.dumps(header).encode()
+        data_start = _align(len(FILE_MAGIC) + 8 + len(header_bytes))
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(FILE_MAGIC)
+            f.write(struct.pack("<Q", len(header_bytes)))
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                f.seek(data_start + header["arrays"][name]["offset"])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a forest written by save(); returns (forest, feature_names).
+        With `mmap` the arrays are read-only views of the mapped file, so
+        processes loading the same file share its pages. Legacy .npz
+        exports are still read (into memory). Bitvector tables not stored
+        in the file are built on first use.
+        """
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                return cls._load_npz(path)
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_len))
+            if header["format_version"] > FILE_VERSION:
+                raise ValueError(f"{path} uses forest file format {header['format_version']}, "
+                                 f"this version reads up to {FILE_VERSION}")
+            data_start = _align(len(FILE_MAGIC) + 8 + header_len)
+            if mmap:
+                buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            else:
+                f.seek(0)
+                buffer = f.read()
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                         offset=data_start + spec["offset"]).reshape(spec["shape"])
+
+        forest = cls(arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"],
+                     arrays["value"], arrays["roots"], header["max_depth"], arrays["classes"])
+        if header["bitvector"] == "stored":
+            n_tables = header["bitvector_features"]
+            forest._compiled = _BitvectorForest(
+                [arrays[f"bv_thresholds_{f}"] for f in range(n_tables)],
+                [arrays[f"bv_masks_{f}"] for f in range(n_tables)],
+                [arrays[f"bv_values_{c}"] for c in range(forest.value.shape[1])],
+                forest.n_trees,
+            )
+        elif header["bitvector"] == "unsupported":
+            forest._compiled = False
+        return forest, header["feature_names"]
+
+    @classmethod
+    def _load_npz(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            forest = cls(data["feature"], data["threshold"], data["left"], data["right"],
+                         data["value"], data["roots"], int(data["max_depth"]), data["classes"])
+            feature_names = [str(name) for name in data["feature_names"]]
+        return forest, feature_names
+
+    # ---------- PREDICTION ----------
+    def predict_proba(self, X, chunk_rows=CHUNK_ROWS):
+        """Class probabilities for every row of X, shape (n_rows, n_classes)"""
+        X = np.asarray(X, dtype=np.float32)
+        proba = np.empty((len(X), self.value.shape[1]), dtype=np.float64)
+        compiled = self.compile()
+        for start in range(0, len(X), chunk_rows):
+            chunk = X[start:start + chunk_rows]
+            if compiled is not None:
+                proba[start:start + len(chunk)] = compiled.proba(chunk)
+            else:
+                proba[start:start + len(chunk)] = self._walk_proba(chunk)
+        return proba
+
+    def labels_from_proba(self, proba):
+        return self.classes.take(np.argmax(proba, axis=1))
+
+    def predict(self, X):
+        """Return (labels, probabilities) from a single forest evaluation"""
+        proba = self.predict_proba(X)
+        return self.labels_from_proba(proba), proba
+
+    def compile(self):
+        """Build (once) the bitvector evaluator, or return None if the forest doesn't fit it"""
+        if self._compiled is None:
+            self._compiled = _BitvectorForest.build(self) or False
+        return self._compiled or None
+
+    def _walk_proba(self, X):
+        """Level-by-level walk of all trees for all rows, compacting finished rows"""
+        n_rows, n_features = X.shape
+        flat_x = np.ascontiguousarray(X).ravel()
+        children = np.stack([self.left, self.right], axis=1).ravel().astype(np.intp)
+        threshold = _float32_thresholds(self.threshold)
+        feature = self.feature.astype(np.intp)
+        is_leaf = self.left == np.arange(self.n_nodes)
+
+        leaf = np.repeat(self.roots.astype(np.intp), n_rows)  # (n_trees * n_rows,)
+        pos = np.flatnonzero(~is_leaf[leaf])
+        node = leaf[pos]
+        row_offset = (pos % n_rows) * n_features
+
+        while node.size:
+            x = flat_x.take(row_offset + feature.take(node))
+            node = children.take(node * 2 + (x > threshold.take(node)))
+            done = is_leaf.take(node)
+            leaf[pos[done]] = node[done]
+            keep = ~done
+            node, pos, row_offset = node[keep], pos[keep], row_offset[keep]
+
+        return self.value.take(leaf, axis=0).reshape(self.n_trees, n_rows, -1).sum(axis=0) / self.n_trees
+
+
+class _BitvectorForest:
+    """Precomputed per-feature prefix leaf masks for a FlatForest"""
+
+    def __init__(self, sorted_thresholds, prefix_masks, leaf_values, n_trees):
+        self.sorted_thresholds = sorted_thresholds  # per feature, float32 split thresholds ascending
+        self.prefix_masks = prefix_masks            # per feature, uint64 (n_splits + 1, n_trees)
+        self.leaf_values = leaf_values              # per class, float64 (n_trees * 64,)
+        self.n_trees = n_trees
+        self.tree_offsets = np.arange(n_trees, dtype=np.int64) * MAX_BITVECTOR_LEAVES
+
+    @classmethod
+    def build(cls, forest):
+        n_trees = forest.n_trees
+        is_leaf = forest.left == np.arange(forest.n_nodes)
+        n_splits = int((~is_leaf).sum())
+        if n_splits * n_trees * 8 > MAX_TABLE_BYTES:
+            return None
+
+        split_nodes = np.empty(n_splits, dtype=np.int64)
+        split_trees = np.empty(n_splits, dtype=np.int64)
+        split_masks = np.empty(n_splits, dtype=np.uint64)
+        leaf_slots = np.empty(forest.n_nodes, dtype=np.int64)
+        n_found = 0
+
+        for t, root in enumerate(forest.roots):
+            # Number leaves left to right; each subtree covers a contiguous leaf range
+            leaf_range = {}
+            n_leaves = 0
+            stack = [(int(root), False)]
+            while stack:
+                node, expanded = stack.pop()
+                if is_leaf[node]:
+                    leaf_slots[node] = t * MAX_BITVECTOR_LEAVES + n_leaves
+                    leaf_range[node] = (n_leaves, n_leaves + 1)
+                    n_leaves += 1
+                    if n_leaves > MAX_BITVECTOR_LEAVES:
+                        return None
+                elif expanded:
+                    left, right = int(forest.left[node]), int(forest.right[node])
+                    lo, hi = leaf_range[left][0], leaf_range[right][1]
+                    leaf_range[node] = (lo, hi)
+                    # Going right rules out every leaf of the left subtree
+                    left_lo, left_hi = leaf_range[left]
+                    left_bits = ((1 << left_hi) - 1) ^ ((1 << left_lo) - 1)
+                    split_nodes[n_found] = node
+                    split_trees[n_found] = t
+                    split_masks[n_found] = ~left_bits & 0xFFFFFFFFFFFFFFFF
+                    n_found += 1
+                else:
+                    stack.append((node, True))
+                    stack.append((int(forest.right[node]), False))
+                    stack.append((int(forest.left[node]), False))
+
+        thresholds = _float32_thresholds(forest.threshold[split_nodes])
+        split_features = forest.feature[split_nodes]
+        sorted_thresholds, prefix_masks = [], []
+        for f in range(forest.n_features):
+            idx = np.flatnonzero(split_features == f)
+            idx = idx[np.argsort(thresholds[idx], kind="stable")]
+            table = np.full((len(idx) + 1, n_trees), _ALL_LEAVES, dtype=np.uint64)
+            table[np.arange(1, len(idx) + 1), split_trees[idx]] = split_masks[idx]
+            np.bitwise_and.accumulate(table, axis=0, out=table)
+            sorted_thresholds.append(thresholds[idx])
+            prefix_masks.append(table)
+
+        leaf_nodes = np.flatnonzero(is_leaf)
+        leaf_values = []
+        for c in range(forest.value.shape[1]):
+            values = np.zeros(n_trees * MAX_BITVECTOR_LEAVES, dtype=np.float64)
+            values[leaf_slots[leaf_nodes]] = forest.value[leaf_nodes, c]
+            leaf_values.append(values)
+
+        return cls(sorted_thresholds, prefix_masks, leaf_values, n_trees)
+
+    def proba(self, X):
+        # Splits with threshold < x send the row right; they form a prefix per feature
+        reachable = None
+        for f, (thresholds, masks) in enumerate(zip(self.sorted_thresholds, self.prefix_masks)):
+            rows = masks.take(np.searchsorted(thresholds, X[:, f], side="left"), axis=0)
+            if reachable is None:
+                reachable = rows
+            else:
+                reachable &= rows
+        if reachable is None:  # no splits at all: every tree is a single leaf
+            reachable = np.full((len(X), self.n_trees), _ALL_LEAVES, dtype=np.uint64)
+
+        # Exit leaf = lowest set bit; its index is the float64 exponent of that bit
+        reachable &= ~reachable + np.uint64(1)
+        slots = (reachable.astype(np.float64).view(np.int64) >> 52) - 1023
+        slots += self.tree_offsets
+
+        proba = np.empty((len(X), len(self.leaf_values)), dtype=np.float64)
+        for c, values in enumerate(self.leaf_values):
+            proba[:, c] = values.take(slots).sum(axis=1) / self.n_trees
+        return proba
@@ -0,0 +1,226 @@
+"""
+Historical snapshot store.
+
+Every scored snapshot is appended to a local SQLite database keyed by
+(timestamp, pid, create_time), so a short-lived process and a process
+that reuses its PID never overwrite each other. compact() applies the retention policy: raw samples
+older than the raw retention are rolled up into 1-minute aggregates,
+1-minute rows into 1-hour aggregates, and 1-hour rows are eventually
+dropped, so weeks of history fit in bounded disk space. Queries read
+every table the range reaches and return one column schema (HISTORY_COLS).
+"""
+
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from src.config import (FEATURE_COLS, HISTORY_PATH, RETENTION_1H, RETENTION_1M,
+                        RETENTION_RAW)
+
+RAW_TABLE = "samples"
+ROLLUP_TABLES = {60: "samples_1m", 3600: "samples_1h"}
+
+SCORE_COLS = ["prediction", "threat_probability", "threat_score"]
+RAW_COLS = ["ts", "pid", "create_time", "process_name"] + FEATURE_COLS + SCORE_COLS
+
+# 2: create_time is part of every primary key (version 1 keyed by pid alone)
+SCHEMA_VERSION = 2
+
+# Per-metric aggregates kept in the rollup tables
+ROLLUP_METRICS = ["cpu_usage", "memory_usage", "network_packets", "threat_probability", "threat_score"]
+
+# Columns of every query result, whichever tables the rows come from. Raw
+# rows have resolution 0, one sample and their own value as the max; rollup
+# rows carry the bucket start in ts, the bucket average under the raw column
+# name, prediction 1 if any sample was suspicious, and NULL for the columns
+# that are not rolled up (create_time is 0 in rollups migrated from version 1)
+HISTORY_COLS = (["ts", "resolution", "samples"] + RAW_COLS[1:]
+                + [f"{metric}_max" for metric in ROLLUP_METRICS])
+
+
+def _rollup_columns():
+    cols = ["bucket INTEGER NOT NULL", "pid INTEGER NOT NULL", "create_time REAL NOT NULL",
+            "process_name TEXT", "n INTEGER NOT NULL", "suspicious INTEGER NOT NULL"]
+    for metric in ROLLUP_METRICS:
+        cols += [f"{metric}_avg REAL", f"{metric}_max REAL"]
+    return cols
+
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_PATH, retention_raw=RETENTION_RAW,
+                 retention_1m=RETENTION_1M, retention_1h=RETENTION_1H):
+        self.path = path
+        self.retention = {RAW_TABLE: retention_raw, 60: retention_1m, 3600: retention_1h}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL lets dashboards read while the daemon writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            # DDL included, so a migration is all or nothing
+            self._conn.execute("BEGIN")
+            self._migrate()
+            self._create_tables()
+
+    def close(self):
+        self._conn.close()
+
+    def _create_tables(self):
+        raw_cols = ["ts INTEGER NOT NULL", "pid INTEGER NOT NULL", "create_time REAL NOT NULL",
+                    "process_name TEXT"]
+        raw_cols += [f"{col} REAL" for col in FEATURE_COLS]
+        raw_cols += ["prediction INTEGER", "threat_probability REAL", "threat_score REAL"]
+
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {RAW_TABLE} ({', '.join(raw_cols)}, "
+            f"PRIMARY KEY (ts, pid, create_time)) WITHOUT ROWID"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {RAW_TABLE}_pid_ts ON {RAW_TABLE} (pid, ts)")
+        for table in ROLLUP_TABLES.values():
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(_rollup_columns())}, "
+                f"PRIMARY KEY (bucket, pid, create_time)) WITHOUT ROWID"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_pid_bucket ON {table} (pid, bucket)")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate(self):
+        """Move a version 1 database (keyed by pid without create_time) onto the current tables"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        tables = {name for (name,) in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if version >= SCHEMA_VERSION or RAW_TABLE not in tables:
+            return
+        old = {table: f"{table}_v1" for table in [RAW_TABLE, *ROLLUP_TABLES.values()]}
+        for table, renamed in old.items():
+            self._conn.execute(f"DROP INDEX IF EXISTS {table}_pid_ts")
+            self._conn.execute(f"DROP INDEX IF EXISTS {table}_pid_bucket")
+            self._conn.execute(f"ALTER TABLE {table} RENAME TO {renamed}")
+        self._create_tables()
+        self._conn.execute(f"INSERT INTO {RAW_TABLE} SELECT * FROM {old[RAW_TABLE]} "
+                           f"WHERE create_time IS NOT NULL")
+        # Version 1 rollups did not record create_time
+        rolled = ", ".join(f"{m}_avg, {m}_max" for m in ROLLUP_METRICS)
+        for table in ROLLUP_TABLES.values():
+            self._conn.execute(f"INSERT INTO {table} SELECT bucket, pid, 0, process_name, n, "
+                               f"suspicious, {rolled} FROM {old[table]}")
+        for renamed in old.values():
+            self._conn.execute(f"DROP TABLE {renamed}")
+
+    # ---------- WRITE ----------
+    def append(self, df, ts=None):
+        """Append one scored snapshot taken at unix time `ts` (default now)"""
+        if df.empty:
+            return 0
+        ts = int(ts if ts is not None else time.time())
+        rows = df.reindex(columns=RAW_COLS[1:])
+        rows.insert(0, "ts", ts)
+        placeholders = ", ".join("?" * len(RAW_COLS))
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {RAW_TABLE} ({', '.join(RAW_COLS)}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None),
+            )
+        return len(rows)
+
+    def compact(self, now=None):
+        """Roll up and expire data past its retention; returns rows removed per table"""
+        now = int(now if now is not None else time.time())
+        removed = {}
+        with self._conn:
+            # raw -> 1 minute, then 1 minute -> 1 hour
+            removed[RAW_TABLE] = self._rollup_raw(now - self.retention[RAW_TABLE])
+            removed[ROLLUP_TABLES[60]] = self._rollup_minutes(now - self.retention[60])
+            cutoff = now - self.retention[3600]
+            removed[ROLLUP_TABLES[3600]] = self._conn.execute(
+                f"DELETE FROM {ROLLUP_TABLES[3600]} WHERE bucket < ?", (cutoff,)
+            ).rowcount
+        return removed
+
+    def _rollup_raw(self, cutoff):
+        # Only whole buckets are rolled up, so a bucket is never split across runs
+        cutoff -= cutoff % 60
+        aggregates = ", ".join(f"AVG({m}), MAX({m})" for m in ROLLUP_METRICS)
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {ROLLUP_TABLES[60]} "
+            f"SELECT (ts / 60) * 60, pid, create_time, MAX(process_name), COUNT(*), MAX(prediction), "
+            f"{aggregates} FROM {RAW_TABLE} WHERE ts < ? GROUP BY ts / 60, pid, create_time",
+            (cutoff,),
+        )
+        return self._conn.execute(f"DELETE FROM {RAW_TABLE} WHERE ts < ?", (cutoff,)).rowcount
+
+    def _rollup_minutes(self, cutoff):
+        cutoff -= cutoff % 3600
+        source, target = ROLLUP_TABLES[60], ROLLUP_TABLES[3600]
+        # Averages are re-weighted by sample count
+        aggregates = ", ".join(f"SUM({m}_avg * n) / SUM(n), MAX({m}_max)" for m in ROLLUP_METRICS)
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO {target} "
+            f"SELECT (bucket / 3600) * 3600, pid, create_time, MAX(process_name), SUM(n), MAX(suspicious), "
+            f"{aggregates} FROM {source} WHERE bucket < ? GROUP BY bucket / 3600, pid, create_time",
+            (cutoff,),
+        )
+        return self._conn.execute(f"DELETE FROM {source} WHERE bucket < ?", (cutoff,)).rowcount
+
+    # ---------- READ ----------
+    def _tier_select(self, resolution):
+        """SELECT of one table mapped onto HISTORY_COLS, filtered by a time range"""
+        if resolution == 0:
+            exprs = ["ts", "0", "1"] + RAW_COLS[1:] + ROLLUP_METRICS
+            time_filter = "ts >= ? AND ts < ?"
+            table = RAW_TABLE
+        else:
+            rolled = {metric: f"{metric}_avg" for metric in ROLLUP_METRICS}
+            rolled["prediction"] = "suspicious"
+            exprs = ["bucket", str(resolution), "n"]
+            exprs += [col if col in ("pid", "create_time", "process_name") else rolled.get(col, "NULL")
+                      for col in RAW_COLS[1:]]
+            exprs += [f"{metric}_max" for metric in ROLLUP_METRICS]
+            # A bucket that straddles `start` is included
+            time_filter = f"bucket > ? - {resolution} AND bucket < ?"
+            table = ROLLUP_TABLES[resolution]
+        columns = ", ".join(f"{expr} AS {col}" for expr, col in zip(exprs, HISTORY_COLS))
+        return f"SELECT {columns} FROM {table} WHERE {time_filter}"
+
+    def _union(self, start, end, pid=None, resolution="auto"):
+        # compact() moves rows from one table to the next, so the tables hold
+        # disjoint time ranges and "auto" is simply their union
+        resolutions = [3600, 60, 0] if resolution == "auto" else [resolution]
+        selects, params = [], []
+        for res in resolutions:
+            sql = self._tier_select(res)
+            params += [int(start), int(end)]
+            if pid is not None:
+                sql += " AND pid = ?"
+                params.append(int(pid))
+            selects.append(sql)
+        return " UNION ALL ".join(selects), params
+
+    def _select(self, start, end, pid=None, resolution="auto"):
+        sql, params = self._union(start, end, pid, resolution)
+        return f"SELECT * FROM ({sql}) ORDER BY ts, pid", params
+
+    def count(self, start, end=None, pid=None, resolution="auto"):
+        """Number of rows query() would return"""
+        end = end if end is not None else time.time() + 1
+        sql, params = self._union(start, end, pid, resolution)
+        return self._conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+    def query(self, start, end=None, pid=None, resolution="auto"):
+        """
+        History between unix times `start` and `end` as a DataFrame with
+        HISTORY_COLS. `resolution` is 0 (raw), 60 or 3600 to read one table,
+        or "auto" for every retained sample: raw rows for the recent part of
+        the range, rollups for the older parts.
+        """
+        end = end if end is not None else time.time() + 1
+        sql, params = self._select(start, end, pid, resolution)
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def iter_query(self, start, end=None, pid=None, resolution="auto", chunksize=50_000):
+        """Like query() but yields DataFrames of at most `chunksize` rows"""
+        end = end if end is not None else time.time() + 1
+        sql, params = self._select(start, end, pid, resolution)
+        yield from pd.read_sql_query(sql, self._conn, params=params, chunksize=chunksize)
@@ -0,0 +1,202 @@
+"""
+Process lineage features.
+
+PidIndex keeps pid -> (ppid, create_time, name, exe) across ticks. Only
+processes that appeared since the last tick are read (/proc/[pid]/stat
+and the exe link, or psutil elsewhere); exited processes are dropped and
+their children, which the kernel reparents, are re-read. From the index
+the collector derives per-process lineage columns:
+
+    parent_pid, parent_name  direct parent
+    lineage_depth            hops from the root of the process tree
+    child_count              live direct children (fan-out)
+    spawn_rate               children started per minute over the spawn window
+
+The columns feed the Process Tree chart and the history, but not the
+model yet: it is trained on FEATURE_COLS only, and neither training nor
+src/synthetic.py produces lineage columns (synthetic time series only
+carry parent_pid).
+"""
+
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import psutil
+
+from src.config import LINEAGE_SPAWN_WINDOW
+
+_HAS_PROC = sys.platform.startswith("linux") and os.path.exists("/proc/self/stat")
+
+LINEAGE_COLS = ["parent_pid", "parent_name", "lineage_depth", "child_count", "spawn_rate"]
+
+
+# ---------- PER-PROCESS READS ----------
+def _read_lineage_procfs(pid):
+    """(ppid, exe path) from /proc; exe is '' when the link is not readable"""
+    with open(f"/proc/{pid}/stat", "rb") as f:
+        stat = f.read()
+    ppid = int(stat[stat.rindex(b")") + 2:].split(None, 2)[1])
+    try:
+        exe = os.readlink(f"/proc/{pid}/exe")
+    except OSError:
+        exe = ""
+    return ppid, exe
+
+
+def _read_lineage_psutil(pid):
+    proc = psutil.Process(pid)
+    ppid = proc.ppid()
+    try:
+        exe = proc.exe()
+    except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+        exe = ""
+    return ppid, exe
+
+
+# ---------- PID INDEX ----------
+class PidIndex:
+    def __init__(self, spawn_window=LINEAGE_SPAWN_WINDOW):
+        self.spawn_window = spawn_window
+        self._read = _read_lineage_procfs if _HAS_PROC else _read_lineage_psutil
+        self._entries = {}   # pid -> [ppid, create_time, name, exe]
+        self._children = {}  # pid -> set of child pids
+        self._spawns = {}    # pid -> deque of times children were first seen
+        self._depth = {}     # pid -> depth, cleared when the tree is rewired
+        # Processes present at the first update are not counted as spawns
+        self._primed = False
+        self.added = 0
+        self.removed = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, pid):
+        """(ppid, create_time, name, exe) for `pid`, or None"""
+        entry = self._entries.get(pid)
+        return tuple(entry) if entry is not None else None
+
+    # ---------- UPDATE ----------
+    def update(self, pids, create_times, names):
+        """Sync the index with the live processes of this tick"""
+        live = {pid: (create_time, name) for pid, create_time, name in zip(pids, create_times, names)}
+
+        # Exited processes, including PIDs reused by a new process
+        gone = [pid for pid, entry in self._entries.items()
+                if pid not in live or live[pid][0] != entry[1]]
+        orphans = set()
+        for pid in gone:
+            orphans |= self._remove(pid)
+
+        new = [pid for pid in live if pid not in self._entries]
+        for pid in new:
+            create_time, name = live[pid]
+            try:
+                ppid, exe = self._read(pid)
+            except (OSError, ValueError, psutil.Error):
+                ppid, exe = 0, ""  # exited or unreadable: keep it as a root
+            self._entries[pid] = [ppid, create_time, name, exe]
+            self._children.setdefault(ppid, set()).add(pid)
+            if self._primed:
+                self._spawns.setdefault(ppid, deque()).append(time.time())
+
+        # The kernel reparents the children of exited processes
+        for pid in orphans:
+            if pid in self._entries and pid in live:
+                try:
+                    ppid, _ = self._read(pid)
+                except (OSError, ValueError, psutil.Error):
+                    continue
+                self._set_parent(pid, ppid)
+
+        # Names change on exec, so they are refreshed from the snapshot
+        for pid, (_, name) in live.items():
+            self._entries[pid][2] = name
+
+        if gone or orphans:
+            self._depth.clear()
+        self.added, self.removed = len(new), len(gone)
+        self._primed = True
+
+    def _remove(self, pid):
+        ppid = self._entries.pop(pid)[0]
+        siblings = self._children.get(ppid)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[ppid]
+        self._spawns.pop(pid, None)
+        return self._children.pop(pid, set())
+
+    def _set_parent(self, pid, ppid):
+        entry = self._entries[pid]
+        if entry[0] == ppid:
+            return
+        old = self._children.get(entry[0])
+        if old is not None:
+            old.discard(pid)
+        entry[0] = ppid
+        self._children.setdefault(ppid, set()).add(pid)
+
+    # ---------- FEATURES ----------
+    def depth(self, pid):
+        """Hops from `pid` up to a process with no known parent"""
+        chain = []
+        node = pid
+        while node in self._entries and node not in self._depth and node not in chain:
+            chain.append(node)
+            node = self._entries[node][0]
+        base = self._depth[node] + 1 if node in self._depth else 0
+        for node in reversed(chain):
+            self._depth[node] = base
+            base += 1
+        return self._depth.get(pid, 0)
+
+    def spawn_rate(self, pid, now=None):
+        """Children started per minute over the spawn window"""
+        spawns = self._spawns.get(pid)
+        if not spawns:
+            return 0.0
+        cutoff = (now if now is not None else time.time()) - self.spawn_window
+        while spawns and spawns[0] < cutoff:
+            spawns.popleft()
+        return len(spawns) * 60.0 / self.spawn_window
+
+    def features(self, pids):
+        """Lineage columns for `pids` as {column: array}"""
+        now = time.time()
+        parent_pid = np.zeros(len(pids), dtype=np.int64)
+        parent_name = np.empty(len(pids), dtype=object)
+        depth = np.zeros(len(pids), dtype=np.int64)
+        child_count = np.zeros(len(pids), dtype=np.int64)
+        spawn_rate = np.zeros(len(pids))
+
+        for i, pid in enumerate(pids):
+            entry = self._entries.get(pid)
+            if entry is None:
+                parent_name[i] = ""
+                continue
+            ppid = entry[0]
+            parent = self._entries.get(ppid)
+            parent_pid[i] = ppid
+            parent_name[i] = parent[2] if parent is not None else ""
+            depth[i] = self.depth(pid)
+            child_count[i] = len(self._children.get(pid, ()))
+            spawn_rate[i] = self.spawn_rate(pid, now)
+
+        return {"parent_pid": parent_pid, "parent_name": parent_name, "lineage_depth": depth,
+                "child_count": child_count, "spawn_rate": spawn_rate}
+
+    def update_frame(self, df):
+        """Update the index from a snapshot and add the lineage columns to it"""
+        if df.empty:
+            for col in LINEAGE_COLS:
+                df[col] = []
+            return df
+        pids = df["pid"].tolist()
+        self.update(pids, df["create_time"].tolist(), df["process_name"].tolist())
+        for col, values in self.features(pids).items():
+            df[col] = values
+        return df
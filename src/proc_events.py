@@ -0,0 +1,362 @@
+"""
+Process start/exit events between collection ticks.
+
+A tick only sees the processes alive at the moment it samples, so a
+process that starts and exits between two refreshes is never scored.
+ProcessWatcher follows process starts and exits on a background thread
+instead, keeps the live PID set up to date incrementally, and reads each
+new process from /proc as soon as it appears. After each tick the
+collector drains the processes that started and exited without the tick
+seeing them, and scores those.
+
+Two event sources:
+
+    NetlinkSource   the kernel proc connector (fork/exec/exit events as
+                    they happen); needs CAP_NET_ADMIN
+    ProcDiffSource  diffs the /proc directory every `interval` seconds;
+                    works unprivileged but misses processes shorter than that
+
+"auto" uses netlink when it can subscribe and falls back to the diff.
+"""
+
+import errno
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import PROC_EVENTS, PROC_EVENTS_INTERVAL, PROC_EVENTS_MAX_PENDING
+from src.procfs import (PROC_ROOT, _STAT_NUM_THREADS, _STAT_STARTTIME, _STAT_STIME, _STAT_UTIME,
+                        _full_name, _read, procfs_available, read_boot_time)
+
+# <linux/connector.h>, <linux/cn_proc.h>
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+NLMSG_DONE = 3
+
+_NLMSG_HDR = struct.Struct("=IHHII")     # len, type, flags, seq, pid
+_CN_MSG = struct.Struct("=IIIIHH")       # idx, val, seq, ack, len, flags
+_PROC_EVENT = struct.Struct("=IIQ")      # what, cpu, timestamp_ns
+_PIDS = struct.Struct("=IIII")           # fork: parent pid/tgid, child pid/tgid; exit: pid, tgid, code, signal
+_EVENT_OFFSET = _NLMSG_HDR.size + _CN_MSG.size
+
+_STAT_PPID = 1
+
+# Event kinds yielded by the sources
+START, EXEC, EXIT = "start", "exec", "exit"
+
+
+def list_pids(proc_root=PROC_ROOT):
+    return {int(entry) for entry in os.listdir(proc_root) if entry.isdigit()}
+
+
+# ---------- SOURCES ----------
+class NetlinkSource:
+    """Process events from the kernel proc connector"""
+
+    name = "netlink"
+
+    def __init__(self, timeout=PROC_EVENTS_INTERVAL, rcvbuf=1024 * 1024):
+        self.lost = 0  # times the kernel dropped events because we fell behind
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+            self._sock.bind((0, CN_IDX_PROC))
+            listen = struct.pack("=I", PROC_CN_MCAST_LISTEN)
+            cn_msg = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(listen), 0)
+            header = _NLMSG_HDR.pack(_NLMSG_HDR.size + len(cn_msg) + len(listen), NLMSG_DONE, 0, 0, 0)
+            self._sock.send(header + cn_msg + listen)
+            self._sock.settimeout(timeout)
+        except OSError:
+            self._sock.close()
+            raise
+
+    def poll(self):
+        """Events received within the timeout, as (kind, pid) pairs; None after an overflow"""
+        try:
+            data = self._sock.recv(65536)
+        except socket.timeout:
+            return []
+        except OSError as e:
+            if e.errno == errno.ENOBUFS:
+                self.lost += 1
+                return None
+            raise
+
+        events = []
+        offset = 0
+        while offset + _EVENT_OFFSET + _PROC_EVENT.size <= len(data):
+            length = _NLMSG_HDR.unpack_from(data, offset)[0]
+            if length < _EVENT_OFFSET:
+                break
+            what = _PROC_EVENT.unpack_from(data, offset + _EVENT_OFFSET)[0]
+            body = offset + _EVENT_OFFSET + _PROC_EVENT.size
+            # Thread creation and exit are reported too; only thread group leaders are processes
+            if what == PROC_EVENT_FORK:
+                _, _, pid, tgid = _PIDS.unpack_from(data, body)
+                if pid == tgid:
+                    events.append((START, tgid))
+            elif what == PROC_EVENT_EXEC:
+                events.append((EXEC, struct.unpack_from("=II", data, body)[1]))
+            elif what == PROC_EVENT_EXIT:
+                pid, tgid, _, _ = _PIDS.unpack_from(data, body)
+                if pid == tgid:
+                    events.append((EXIT, tgid))
+            offset += (length + 3) & ~3
+        return events
+
+    def close(self):
+        self._sock.close()
+
+
+class ProcDiffSource:
+    """Process starts and exits found by diffing the /proc directory"""
+
+    name = "procdiff"
+
+    def __init__(self, interval=PROC_EVENTS_INTERVAL, proc_root=PROC_ROOT):
+        self.interval = interval
+        self.proc_root = proc_root
+        self.lost = 0
+        self._pids = list_pids(proc_root)
+        self._next = time.monotonic() + interval
+
+    def poll(self):
+        time.sleep(max(0.0, self._next - time.monotonic()))
+        self._next = time.monotonic() + self.interval
+        pids = list_pids(self.proc_root)
+        events = [(START, pid) for pid in pids - self._pids]
+        events += [(EXIT, pid) for pid in self._pids - pids]
+        self._pids = pids
+        return events
+
+    def close(self):
+        pass
+
+
+def make_source(backend=PROC_EVENTS, interval=PROC_EVENTS_INTERVAL, proc_root=PROC_ROOT):
+    """
+    Event source selected by `backend`: "netlink", "procdiff", or "auto"
+    (netlink when permitted, else procdiff). None for "off" or without /proc.
+    """
+    if backend not in ("auto", "netlink", "procdiff", "off"):
+        raise ValueError(f"Unknown process event backend: {backend!r}")
+    if backend == "off" or not procfs_available(proc_root):
+        return None
+
+    if backend != "procdiff" and sys.platform.startswith("linux") and proc_root == PROC_ROOT:
+        try:
+            return NetlinkSource(timeout=interval)
+        except OSError as e:
+            if backend == "netlink":
+                raise
+            print(f"⚠️ Proc connector unavailable ({e.strerror}), diffing /proc every {interval}s")
+    return ProcDiffSource(interval, proc_root)
+
+
+# ---------- WATCHER ----------
+class ProcessWatcher:
+    """
+    Live PID set plus a record of every process started and not seen by
+    a tick yet, maintained from an event source on a daemon thread.
+
+    A started process is read from /proc when its start (or exec) event
+    arrives and re-read every poll while it is alive and not drained yet,
+    so its record holds the latest name and lifetime CPU% and the peak
+    memory seen before it exited. Records are keyed by (pid, create_time),
+    so a PID reused before the next drain keeps both processes. At most
+    `max_pending` records are kept; the oldest are dropped (and counted)
+    beyond that.
+
+    The proc connector reports an exit for the thread group leader when
+    that thread exits, even if other threads keep the process running, so
+    an exit only counts once /proc shows the process gone or a zombie with
+    no threads left. Such processes are re-checked every poll.
+    """
+
+    def __init__(self, source, proc_root=PROC_ROOT, max_pending=PROC_EVENTS_MAX_PENDING):
+        self.source = source
+        self.proc_root = proc_root
+        self.max_pending = max_pending
+        self.started = 0
+        self.exited = 0
+        self.dropped = 0
+        self._clk_tck = os.sysconf("SC_CLK_TCK")
+        self._page_mb = os.sysconf("SC_PAGE_SIZE") / (1024*1024)
+        self._boot_time = read_boot_time(proc_root)
+        self._lock = threading.Lock()
+        self._live = list_pids(proc_root)
+        self._pending = OrderedDict()  # (pid, create_time) -> record, oldest start first
+        self._exited = set()           # pending keys whose process has exited
+        self._leaderless = set()       # live pids whose leader thread has exited
+        self._running = False
+        self._thread = None
+
+    @property
+    def backend(self):
+        return self.source.name
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="proc-events", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.source.close()
+
+    def live_pids(self):
+        with self._lock:
+            return set(self._live)
+
+    def drain(self, seen=()):
+        """
+        Records of started processes that have exited without being seen
+        by a tick. `seen` holds the (pid, create_time) keys the tick just
+        sampled: those records are dropped. Records of processes still
+        running stay pending until a tick sees them or they exit.
+        """
+        seen = {(pid, round(create_time, 2)) for pid, create_time in seen}
+        exited = []
+        with self._lock:
+            for key in list(self._pending):
+                pid, create_time = key
+                if (pid, round(create_time, 2)) in seen:
+                    del self._pending[key]
+                    self._exited.discard(key)
+                elif key in self._exited or pid not in self._live:
+                    exited.append(self._pending.pop(key))
+                    self._exited.discard(key)
+        return exited
+
+    # ---------- EVENT LOOP ----------
+    def _run(self):
+        while self._running:
+            try:
+                events = self.source.poll()
+            except OSError as e:
+                print(f"⚠️ Process event source failed: {e}")
+                time.sleep(1.0)
+                continue
+            if events is None:
+                self._resync()
+                continue
+            with self._lock:
+                for kind, pid in events:
+                    if kind == EXIT:
+                        if self._alive(pid):
+                            self._leaderless.add(pid)
+                        else:
+                            self._exit(pid)
+                        continue
+                    if kind == START:
+                        self._live.add(pid)
+                        self.started += 1
+                    # exec replaces the image (name, memory) the child inherited from its parent
+                    self._capture(pid, fresh=kind == EXEC)
+                for pid in [pid for pid in self._leaderless if not self._alive(pid)]:
+                    self._exit(pid)
+                for pid in {pid for pid, _ in self._pending if pid in self._live}:
+                    self._capture(pid, only_pending=True)
+
+    def _exit(self, pid):
+        self._live.discard(pid)
+        self._leaderless.discard(pid)
+        self.exited += 1
+        # A zombie's stat still has its final CPU time
+        self._capture(pid, only_pending=True)
+        self._exited.update(key for key in self._pending if key[0] == pid)
+
+    def _alive(self, pid):
+        """True while `pid` runs: not gone, and not a zombie unless other threads remain"""
+        try:
+            stat = _read(f"{self.proc_root}/{pid}/stat")
+        except OSError:
+            return False
+        state = stat[stat.rindex(b")") + 2:][:1]
+        if state != b"Z":
+            return True
+        try:
+            return len(os.listdir(f"{self.proc_root}/{pid}/task")) > 1
+        except OSError:
+            return False
+
+    def _resync(self):
+        """Rebuild the live set after the source lost events"""
+        pids = list_pids(self.proc_root)
+        with self._lock:
+            for pid in pids - self._live:
+                self.started += 1
+                self._capture(pid)
+            for pid in self._live - pids:
+                self._exited.update(key for key in self._pending if key[0] == pid)
+            self._live = pids
+            self._leaderless &= pids
+
+    def _capture(self, pid, only_pending=False, fresh=False):
+        if only_pending and not any(key[0] == pid for key in self._pending):
+            return
+        record = self._read(pid)
+        if record is None:
+            return  # gone before it could be read; keep what we had
+        key = (pid, record["create_time"])
+        previous = self._pending.get(key)
+        if previous is None:
+            if only_pending:
+                return
+            # A new process with this pid means any earlier one has exited
+            self._exited.update(k for k in self._pending if k[0] == pid)
+        elif not fresh:
+            record["memory_usage"] = max(record["memory_usage"], previous["memory_usage"])
+        self._pending[key] = record
+        if len(self._pending) > self.max_pending:
+            dropped, _ = self._pending.popitem(last=False)
+            self._exited.discard(dropped)
+            self.dropped += 1
+
+    def _read(self, pid):
+        """One process as a sampler record, with CPU% averaged over its lifetime so far"""
+        root = self.proc_root
+        try:
+            stat = _read(f"{root}/{pid}/stat")
+            statm = _read(f"{root}/{pid}/statm")
+        except OSError:
+            return None
+        rparen = stat.rindex(b")")
+        name = stat[stat.index(b"(") + 1:rparen].decode(errors="replace")
+        if len(name) >= 15:
+            name = _full_name(root, pid, name)
+        fields = stat[rparen + 2:].split()
+
+        create_time = self._boot_time + int(fields[_STAT_STARTTIME]) / self._clk_tck
+        cpu_total = (int(fields[_STAT_UTIME]) + int(fields[_STAT_STIME])) / self._clk_tck
+        age = time.time() - create_time
+        return {
+            "pid": pid,
+            "process_name": name or "Unknown",
+            "create_time": create_time,
+            "cpu_usage": cpu_total / age * 100 if age > 0.01 else 0.0,
+            "memory_usage": int(statm.split(None, 2)[1]) * self._page_mb,
+            "num_threads": int(fields[_STAT_NUM_THREADS]) or 1,
+            "parent_pid": int(fields[_STAT_PPID]),
+        }
+
+
+def make_watcher(backend=PROC_EVENTS, interval=PROC_EVENTS_INTERVAL, proc_root=PROC_ROOT,
+                 max_pending=PROC_EVENTS_MAX_PENDING):
+    """A started ProcessWatcher, or None when process events are off or unsupported"""
+    source = make_source(backend, interval, proc_root)
+    if source is None:
+        return None
+    return ProcessWatcher(source, proc_root, max_pending).start()
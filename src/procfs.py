@@ -0,0 +1,125 @@
+"""
+Direct /proc reader for Linux process collection.
+
+ProcfsSampler produces the same raw samples as the psutil sampler
+(pid, name, create_time, cpu, rss MB, threads) but reads
+/proc/[pid]/stat and /proc/[pid]/statm itself, skipping psutil's
+per-process object overhead. /proc/[pid]/status is not needed: stat
+already carries the name and thread count.
+"""
+
+import os
+import sys
+import time
+
+from src.collector import CpuDeltaTracker
+from src.snapshot import ProcessSnapshot
+
+PROC_ROOT = "/proc"
+
+# Offsets into the stat fields that follow "pid (comm) "
+_STAT_UTIME = 11
+_STAT_STIME = 12
+_STAT_NUM_THREADS = 17
+_STAT_STARTTIME = 19
+
+
+def procfs_available(proc_root=PROC_ROOT):
+    return sys.platform.startswith("linux") and os.path.exists(os.path.join(proc_root, "stat"))
+
+
+def read_boot_time(proc_root=PROC_ROOT):
+    with open(os.path.join(proc_root, "stat"), "rb") as f:
+        for line in f:
+            if line.startswith(b"btime"):
+                return float(line.split()[1])
+    raise RuntimeError(f"btime missing from {proc_root}/stat")
+
+
+def _read(path):
+    with open(path, "rb", buffering=0) as f:
+        return f.read()
+
+
+def _full_name(root, entry, comm):
+    """
+    The kernel truncates comm to 15 bytes; like psutil, recover the full
+    name from argv[0] when it starts with the truncated one.
+    """
+    try:
+        argv0 = _read(f"{root}/{entry}/cmdline").split(b"\0", 1)[0]
+    except OSError:
+        return comm
+    exe_name = os.path.basename(argv0.decode(errors="replace"))
+    return exe_name if exe_name.startswith(comm) else comm
+
+
+class ProcfsSampler:
+    """Single-pass sampler that parses /proc directly"""
+
+    def __init__(self, proc_root=PROC_ROOT):
+        self.proc_root = proc_root
+        self._clk_tck = os.sysconf("SC_CLK_TCK")
+        self._page_mb = os.sysconf("SC_PAGE_SIZE") / (1024*1024)
+        self._boot_time = read_boot_time(proc_root)
+        self._last = {}  # pid -> last appended sample, for carried PIDs
+        self._cpu = CpuDeltaTracker()
+
+    def sample(self, exclude_pids=()):
+        """Return a list of raw per-process samples (dicts)"""
+        snapshot = ProcessSnapshot()
+        self.sample_into(snapshot, exclude_pids)
+        return snapshot.records()
+
+    def sample_into(self, snapshot, exclude_pids=(), pids=None, carry=()):
+        """
+        Append every readable process to `snapshot`; `pids` (e.g. a
+        ProcessWatcher's live set) saves listing /proc and PIDs in `carry`
+        repeat their last sample without reading /proc
+        """
+        now = time.monotonic()
+        root = self.proc_root
+        clk_tck = self._clk_tck
+        append = snapshot.append
+        live = set()
+
+        entries = os.listdir(root) if pids is None else map(str, pids)
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            if pid in exclude_pids:
+                continue
+            if pid in carry:
+                last = self._last.get(pid)
+                if last is not None:
+                    live.add(pid)
+                    append(*last)
+                    continue
+            try:
+                stat = _read(f"{root}/{entry}/stat")
+                statm = _read(f"{root}/{entry}/statm")
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                continue  # exited mid-scan or not readable
+
+            # comm may contain spaces or ')' so split on the last ')'
+            rparen = stat.rindex(b")")
+            name = stat[stat.index(b"(") + 1:rparen].decode(errors="replace")
+            if len(name) >= 15:
+                name = _full_name(root, entry, name)
+            fields = stat[rparen + 2:].split()
+            live.add(pid)
+
+            cpu_total = (int(fields[_STAT_UTIME]) + int(fields[_STAT_STIME])) / clk_tck
+            sample = (pid, name or "Unknown",
+                      self._boot_time + int(fields[_STAT_STARTTIME]) / clk_tck,
+                      self._cpu.update(pid, cpu_total, now),
+                      int(statm.split(None, 2)[1]) * self._page_mb,
+                      int(fields[_STAT_NUM_THREADS]) or 1)
+            self._last[pid] = sample
+            append(*sample)
+
+        self._cpu.retain(live)
+        for pid in [pid for pid in self._last if pid not in live]:
+            del self._last[pid]
+        return snapshot
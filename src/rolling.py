@@ -0,0 +1,194 @@
+"""
+Per-process rolling feature windows.
+
+RollingWindows keeps a fixed-size ring buffer of recent samples for
+every process in one preallocated NumPy array, and maintains running
+sums per window so mean, variance and slope are updated in O(1) per
+process per tick (add the new sample, subtract the one leaving the
+window). The max is read from the ring buffer itself, vectorized over
+all processes. The aggregates are added to the snapshot as extra
+columns, e.g. cpu_usage_mean_12, cpu_usage_slope_12.
+
+The columns feed the dashboards' most-variable view, the sampling
+scheduler and the history, but not the model yet: it is trained on
+FEATURE_COLS only, and neither training nor src/synthetic.py produces
+rolling columns.
+"""
+
+import numpy as np
+
+from src.config import ROLLING_METRICS, ROLLING_WINDOWS
+
+ROLLING_STATS = ["mean", "max", "var", "slope"]
+
+# Running sums are rebuilt from the buffers this often to cancel float drift
+RESYNC_EVERY = 1000
+
+
+def rolling_columns(metrics=ROLLING_METRICS, windows=ROLLING_WINDOWS):
+    return [f"{metric}_{stat}_{w}" for w in windows for metric in metrics for stat in ROLLING_STATS]
+
+
+class RollingWindows:
+    def __init__(self, metrics=ROLLING_METRICS, windows=ROLLING_WINDOWS, capacity=1024):
+        self.metrics = list(metrics)
+        self.windows = sorted(set(int(w) for w in windows))
+        self.size = self.windows[-1]
+        n_metrics = len(self.metrics)
+
+        self._buf = np.zeros((capacity, self.size, n_metrics))
+        self._head = np.zeros(capacity, dtype=np.int64)   # next write position
+        self._count = np.zeros(capacity, dtype=np.int64)  # samples written since reset
+        # Per window: sum x, sum x^2, sum i*x (i = 0 for the oldest sample in the window)
+        self._sx = {w: np.zeros((capacity, n_metrics)) for w in self.windows}
+        self._sxx = {w: np.zeros((capacity, n_metrics)) for w in self.windows}
+        self._sxy = {w: np.zeros((capacity, n_metrics)) for w in self.windows}
+
+        self._slots = {}  # key -> slot
+        self._free = list(range(capacity - 1, -1, -1))
+        self._updates = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    @property
+    def columns(self):
+        return rolling_columns(self.metrics, self.windows)
+
+    # ---------- SLOTS ----------
+    def _grow(self):
+        old = len(self._head)
+        new = old * 2
+        self._buf = np.concatenate([self._buf, np.zeros_like(self._buf)])
+        self._head = np.concatenate([self._head, np.zeros(old, dtype=np.int64)])
+        self._count = np.concatenate([self._count, np.zeros(old, dtype=np.int64)])
+        for sums in (self._sx, self._sxx, self._sxy):
+            for w in self.windows:
+                sums[w] = np.concatenate([sums[w], np.zeros_like(sums[w])])
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def _slots_for(self, keys):
+        """Slot per key; new keys get a freshly reset slot, vanished keys release theirs"""
+        live = set(keys)
+        for key in [key for key in self._slots if key not in live]:
+            self._free.append(self._slots.pop(key))
+
+        slots = np.empty(len(keys), dtype=np.int64)
+        fresh = []
+        for i, key in enumerate(keys):
+            slot = self._slots.get(key)
+            if slot is None:
+                if not self._free:
+                    self._grow()
+                slot = self._free.pop()
+                self._slots[key] = slot
+                fresh.append(slot)
+            slots[i] = slot
+
+        if fresh:
+            self._head[fresh] = 0
+            self._count[fresh] = 0
+            for sums in (self._sx, self._sxx, self._sxy):
+                for w in self.windows:
+                    sums[w][fresh] = 0.0
+        return slots
+
+    # ---------- UPDATE ----------
+    def update(self, keys, values):
+        """
+        Push one sample per key (values: (n, n_metrics)) and return the
+        rolling statistics as an (n, len(columns)) array, ordered like `columns`.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        slots = self._slots_for(keys)
+        head = self._head[slots]
+        count = self._count[slots]
+
+        for w in self.windows:
+            full = (count >= w)[:, None]
+            outgoing = np.where(full, self._buf[slots, (head - w) % self.size], 0.0)
+            sx, sxx, sxy = self._sx[w], self._sxx[w], self._sxy[w]
+            n_before = np.minimum(count, w)[:, None]
+
+            # Sliding drops index 0 and shifts the rest down by one
+            sxy[slots] = np.where(
+                full,
+                sxy[slots] - sx[slots] + outgoing + (w - 1) * values,
+                sxy[slots] + n_before * values,
+            )
+            sx[slots] += values - outgoing
+            sxx[slots] += values * values - outgoing * outgoing
+
+        self._buf[slots, head % self.size] = values
+        self._head[slots] = (head + 1) % self.size
+        self._count[slots] = count + 1
+
+        self._updates += 1
+        if self._updates % RESYNC_EVERY == 0:
+            self._resync()
+
+        return self.stats(slots)
+
+    def update_frame(self, df):
+        """Push the rows of a snapshot and add the rolling columns to it"""
+        if df.empty:
+            for col in self.columns:
+                df[col] = []
+            return df
+        keys = list(zip(df["pid"], df["create_time"]))
+        stats = self.update(keys, df[self.metrics].to_numpy(dtype=np.float64))
+        for i, col in enumerate(self.columns):
+            df[col] = stats[:, i]
+        return df
+
+    # ---------- STATISTICS ----------
+    def _window_positions(self, slots, w):
+        """Buffer positions of the last `w` samples, newest first, and their validity mask"""
+        head = self._head[slots]
+        n = np.minimum(self._count[slots], w)
+        offsets = np.arange(1, w + 1)
+        positions = (head[:, None] - offsets[None, :]) % self.size
+        return positions, offsets[None, :] <= n[:, None]
+
+    def stats(self, slots):
+        n_metrics = len(self.metrics)
+        out = np.empty((len(slots), len(self.windows) * n_metrics * len(ROLLING_STATS)))
+        col = 0
+        for w in self.windows:
+            n = np.minimum(self._count[slots], w).astype(np.float64)[:, None]
+            safe_n = np.maximum(n, 1.0)
+            sx, sxx, sxy = self._sx[w][slots], self._sxx[w][slots], self._sxy[w][slots]
+
+            mean = sx / safe_n
+            var = np.maximum(sxx / safe_n - mean * mean, 0.0)
+            # Least-squares slope per sample over indices 0..n-1
+            si = n * (n - 1) / 2
+            sii = (n - 1) * n * (2 * n - 1) / 6
+            denom = n * sii - si * si
+            slope = np.where(denom > 0, (n * sxy - si * sx) / np.where(denom > 0, denom, 1.0), 0.0)
+
+            positions, valid = self._window_positions(slots, w)
+            window = self._buf[slots[:, None], positions]
+            window[~valid] = -np.inf
+            peak = window.max(axis=1)
+            peak[~np.isfinite(peak)] = 0.0
+
+            for m in range(n_metrics):
+                out[:, col:col + 4] = np.stack([mean[:, m], peak[:, m], var[:, m], slope[:, m]], axis=1)
+                col += 4
+        return out
+
+    def _resync(self):
+        """Recompute every running sum from the ring buffers"""
+        slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+        if not len(slots):
+            return
+        for w in self.windows:
+            positions, valid = self._window_positions(slots, w)
+            n = valid.sum(axis=1)
+            window = np.where(valid[:, :, None], self._buf[slots[:, None], positions], 0.0)
+            # positions are newest first; index from the oldest sample in the window
+            index = np.where(valid, n[:, None] - 1 - np.arange(w)[None, :], 0)[:, :, None]
+            self._sx[w][slots] = window.sum(axis=1)
+            self._sxx[w][slots] = (window * window).sum(axis=1)
+            self._sxy[w][slots] = (window * index).sum(axis=1)
@@ -0,0 +1,151 @@
+"""
+Adaptive per-process sampling cadence.
+
+Most processes on a large host are idle, long-lived and consistently
+normal, yet every tick re-read all of them. SamplingScheduler puts every
+process in one of three tiers after each scored tick. At the start of the
+next tick, carry() names the processes whose tier cadence has not come
+round: the sampler carries their last stat/statm sample forward without
+touching /proc, and ActivityProbe.collect keeps their last activity
+values. Only the processes returned by due() are read in full. A PID that
+a new process reuses in between is picked up at its next read.
+
+    fast    every tick: recently suspicious (threat_probability at or above
+            SAMPLE_HOT_AT in the last SAMPLE_HOLD_TICKS ticks), bursty CPU
+            (coefficient of variation over the rolling window above
+            SAMPLE_FAST_CV) or young processes
+    slow    every SAMPLE_SLOW_EVERY ticks: old processes that have stayed
+            below SAMPLE_QUIET_BELOW for SAMPLE_SETTLE_TICKS ticks
+    normal  every SAMPLE_NORMAL_EVERY ticks: everything else
+
+New processes are always due. When the 1-minute load per CPU goes above
+SAMPLE_BACKOFF_LOAD, `backoff` grows in proportion (capped at
+SAMPLE_MAX_BACKOFF): the normal and slow cadences are stretched by it and
+the collector daemon stretches its tick interval too. The fast tier
+stays at every tick.
+"""
+
+import math
+import os
+import time
+
+import numpy as np
+import psutil
+
+from src.config import (ROLLING_WINDOWS, SAMPLE_BACKOFF_LOAD, SAMPLE_FAST_CV, SAMPLE_HOLD_TICKS,
+                        SAMPLE_HOT_AT, SAMPLE_MAX_BACKOFF, SAMPLE_NORMAL_EVERY, SAMPLE_OLD_SECONDS,
+                        SAMPLE_QUIET_BELOW, SAMPLE_SETTLE_TICKS, SAMPLE_SLOW_EVERY,
+                        SAMPLE_YOUNG_SECONDS)
+
+FAST, NORMAL, SLOW = "fast", "normal", "slow"
+TIERS = [FAST, NORMAL, SLOW]
+
+
+def load_backoff(threshold=SAMPLE_BACKOFF_LOAD, max_backoff=SAMPLE_MAX_BACKOFF):
+    """1.0 up to `threshold` load per CPU, then proportional to the load, capped at `max_backoff`"""
+    try:
+        load = psutil.getloadavg()[0] / (os.cpu_count() or 1)
+    except (OSError, AttributeError):
+        return 1.0
+    return float(min(max_backoff, max(1.0, load / threshold)))
+
+
+class SamplingScheduler:
+    def __init__(self, normal_every=SAMPLE_NORMAL_EVERY, slow_every=SAMPLE_SLOW_EVERY,
+                 hot_at=SAMPLE_HOT_AT, hold_ticks=SAMPLE_HOLD_TICKS, fast_cv=SAMPLE_FAST_CV,
+                 young_seconds=SAMPLE_YOUNG_SECONDS, quiet_below=SAMPLE_QUIET_BELOW,
+                 settle_ticks=SAMPLE_SETTLE_TICKS, old_seconds=SAMPLE_OLD_SECONDS,
+                 backoff_load=SAMPLE_BACKOFF_LOAD, max_backoff=SAMPLE_MAX_BACKOFF,
+                 window=ROLLING_WINDOWS[0]):
+        self.normal_every = normal_every
+        self.slow_every = slow_every
+        self.hot_at = hot_at
+        self.hold_ticks = hold_ticks
+        self.fast_cv = fast_cv
+        self.young_seconds = young_seconds
+        self.quiet_below = quiet_below
+        self.settle_ticks = settle_ticks
+        self.old_seconds = old_seconds
+        self.backoff_load = backoff_load
+        self.max_backoff = max_backoff
+        self.window = window
+        self.tick = 0
+        self.backoff = 1.0
+        self.last_due = 0  # processes returned by the last due() call
+        self._state = {}  # (pid, create_time) -> [tier, next due tick, hot until tick, quiet ticks]
+
+    def cadence(self, tier):
+        """Ticks between two reads of a process in `tier`"""
+        if tier == FAST:
+            return 1
+        every = self.normal_every if tier == NORMAL else self.slow_every
+        return max(1, math.ceil(every * self.backoff))
+
+    def tier_counts(self):
+        counts = dict.fromkeys(TIERS, 0)
+        for tier, *_ in self._state.values():
+            counts[tier] += 1
+        return counts
+
+    # ---------- BEFORE THE READS ----------
+    def carry(self):
+        """Start a tick and return the PIDs to carry forward unread"""
+        self.tick += 1
+        self.backoff = load_backoff(self.backoff_load, self.max_backoff)
+        return {pid for (pid, _), state in self._state.items() if state[1] > self.tick}
+
+    def due(self, pids, create_times):
+        """PIDs of the sampled `pids` that were read this tick, in `pids` order"""
+        due = []
+        for pid, create_time in zip(pids, create_times):
+            state = self._state.get((pid, create_time))
+            if state is None:
+                due.append(pid)
+            elif state[1] <= self.tick:
+                state[1] = self.tick + self.cadence(state[0])
+                due.append(pid)
+        self.last_due = len(due)
+        return due
+
+    # ---------- AFTER SCORING ----------
+    def update(self, df):
+        """Re-tier every process from its scored row; processes not in `df` are forgotten"""
+        state = {}
+        if df.empty:
+            self._state = state
+            return
+
+        age = time.time() - df["create_time"].to_numpy()
+        var_col, mean_col = f"cpu_usage_var_{self.window}", f"cpu_usage_mean_{self.window}"
+        if var_col in df.columns and mean_col in df.columns:
+            # A floor of 1% CPU keeps near-idle processes from looking bursty
+            cv = np.sqrt(np.clip(df[var_col].to_numpy(), 0, None)) / \
+                np.maximum(df[mean_col].to_numpy(), 1.0)
+            bursty = cv > self.fast_cv
+        else:
+            bursty = np.zeros(len(df), dtype=bool)
+
+        for pid, create_time, proba, process_age, is_bursty in zip(
+                df["pid"].tolist(), df["create_time"].tolist(), df["threat_probability"].tolist(),
+                age.tolist(), bursty.tolist()):
+            key = (pid, create_time)
+            _, next_due, hot_until, quiet = self._state.get(key, (FAST, None, 0, 0))
+            if proba >= self.hot_at:
+                hot_until = self.tick + self.hold_ticks
+            quiet = quiet + 1 if proba < self.quiet_below and not is_bursty else 0
+
+            if self.tick <= hot_until or is_bursty or process_age < self.young_seconds:
+                tier = FAST
+            elif quiet >= self.settle_ticks and process_age >= self.old_seconds:
+                tier = SLOW
+            else:
+                tier = NORMAL
+            cadence = self.cadence(tier)
+            if next_due is None:
+                # Spread new processes over the cadence so their re-reads do not all land on one tick
+                next_due = self.tick + 1 + pid % cadence
+            else:
+                # A process moved to a faster tier does not wait out its old cadence
+                next_due = min(next_due, self.tick + cadence)
+            state[key] = [tier, next_due, hot_until, quiet]
+        self._state = state
@@ -0,0 +1,196 @@
+"""
+Threat scoring shared by the dashboards and the collector daemon.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from src.baselines import Baselines
+from src.config import (BASELINES_PATH, FEATURE_COLS, MODEL_PATH, RAW_FOREST_PATH, SCALER_PATH,
+                        SCORE_CACHE_TTL, SCORE_TOLERANCES)
+from src.forest import FlatForest
+
+
+# ---------- INFERENCE ENGINE ----------
+class InferenceEngine:
+    """
+    Flattened forest plus the feature columns it expects. One forest
+    evaluation per batch gives both the labels and the threat
+    probabilities. The forest runs on raw (unscaled) features when the
+    scaler has been folded into its thresholds; `scaler` is only kept
+    for forests that still expect scaled input.
+    """
+
+    def __init__(self, forest, feature_cols=FEATURE_COLS, scaler=None):
+        self.forest = forest
+        self.feature_cols = list(feature_cols)
+        self.scaler = scaler
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, fold=True):
+        forest = FlatForest.from_sklearn(model)
+        if fold:
+            return cls(forest.fold_scaler(scaler))
+        return cls(forest, scaler=scaler)
+
+    def predict(self, X):
+        """Return (labels, probability of the positive class) for the feature rows in X"""
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        elif hasattr(X, "to_numpy"):
+            X = X.to_numpy(dtype=np.float32)
+        labels, proba = self.forest.predict(X)
+        return labels, proba[:, -1]
+
+
+# ---------- INCREMENTAL SCORING ----------
+class ScoreCache:
+    """
+    Per-process cache of model results.
+
+    Entries are keyed by (pid, create_time) so a reused PID never inherits
+    a score. A cached result is reused while the process's quantized
+    feature vector is unchanged and the entry is younger than `ttl`;
+    otherwise the row is re-scored. Only the misses go through the model.
+    """
+
+    def __init__(self, tolerances=SCORE_TOLERANCES, ttl=SCORE_CACHE_TTL):
+        self.tolerances = tolerances
+        self.ttl = ttl
+        self._entries = {}  # (pid, create_time) -> (quantized features, label, probability, expires_at)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def quantize(self, X, feature_cols):
+        step = np.array([self.tolerances.get(col, 0) for col in feature_cols], dtype=np.float64)
+        exact = step <= 0
+        step[exact] = 1.0
+        return np.where(exact, X, np.floor(X / step))
+
+    def score(self, engine, keys, X):
+        """Return (labels, probabilities) for raw feature rows X, one per key"""
+        # float32 rows (a ProcessSnapshot view) are used as they are, without a copy
+        X = np.asarray(X)
+        quantized = self.quantize(X, engine.feature_cols)
+        now = time.monotonic()
+        labels = np.empty(len(X), dtype=engine.forest.classes.dtype)
+        proba = np.empty(len(X), dtype=np.float64)
+        stale = []
+
+        for i, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is not None and entry[3] > now and np.array_equal(entry[0], quantized[i]):
+                labels[i] = entry[1]
+                proba[i] = entry[2]
+            else:
+                stale.append(i)
+
+        if stale:
+            labels[stale], proba[stale] = engine.predict(X[stale])
+            expires_at = now + self.ttl
+            for i in stale:
+                self._entries[keys[i]] = (quantized[i], labels[i], proba[i], expires_at)
+
+        self.hits += len(X) - len(stale)
+        self.misses += len(stale)
+
+        # Processes that are gone drop out of the cache
+        live = set(keys)
+        for key in [key for key in self._entries if key not in live]:
+            del self._entries[key]
+
+        return labels, proba
+
+
+# ---------- LOAD MODEL ----------
+def load_model(model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """Load the trained model and scaler, or raise FileNotFoundError"""
+    if not (os.path.exists(model_path) and os.path.exists(scaler_path)):
+        raise FileNotFoundError(
+            f"Model not found at {model_path}. Train the model first by running train_model.py"
+        )
+    # Only needed for the pickle fallback; the forest file loads without it
+    import joblib
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    return model, scaler
+
+
+def export_raw_forest(model, scaler, path=RAW_FOREST_PATH, feature_cols=FEATURE_COLS):
+    """Save the model as a flattened forest with the scaler folded in"""
+    forest = FlatForest.from_sklearn(model).fold_scaler(scaler)
+    forest.save(path, feature_names=feature_cols)
+    return forest
+
+
+def load_engine(raw_forest_path=RAW_FOREST_PATH, model_path=MODEL_PATH, scaler_path=SCALER_PATH):
+    """
+    Load an InferenceEngine. Prefers the exported raw-space forest and
+    falls back to folding model.pkl + scaler.pkl in memory.
+    """
+    if os.path.exists(raw_forest_path):
+        forest, feature_cols = FlatForest.load(raw_forest_path)
+        engine = InferenceEngine(forest, feature_cols or FEATURE_COLS)
+    else:
+        engine = InferenceEngine.from_sklearn(*load_model(model_path, scaler_path))
+    engine.forest.compile()
+    return engine
+
+
+# ---------- PREDICT THREATS ----------
+_default_baselines = None
+
+
+def threat_score(df, baselines):
+    """
+    Per-process severity: CPU share + memory and packets relative to
+    their baseline quantile (capped at 1) + the privilege flag. Each row
+    only depends on itself and the baselines. A metric whose baseline is
+    still warming up falls back to the maximum of this frame.
+    """
+    score = df["cpu_usage"] / 100 + df["privilege_escalation_attempt"]
+    for metric in baselines.estimators:
+        scale = baselines.scale(metric)
+        if scale is None:
+            scale = df[metric].max()
+        if scale > 0:
+            score = score + (df[metric] / scale).clip(upper=1.0)
+    return score
+
+
+def predict_threats(df, engine, cache=None, baselines=None, features=None):
+    """
+    Add prediction, threat_probability and threat_score to `df`.
+    `features` optionally supplies the model input rows directly, e.g. the
+    zero-copy ProcessSnapshot.feature_matrix() the frame was built from.
+    """
+    global _default_baselines
+    if df.empty:
+        return df
+    if baselines is None:
+        if _default_baselines is None:
+            _default_baselines = Baselines.load(BASELINES_PATH)
+        baselines = _default_baselines
+
+    X = features if features is not None else df[engine.feature_cols]
+    if cache is not None:
+        keys = list(zip(df["pid"], df["create_time"]))
+        df["prediction"], df["threat_probability"] = cache.score(engine, keys, np.asarray(X))
+    else:
+        df["prediction"], df["threat_probability"] = engine.predict(X)
+
+    df["threat_score"] = threat_score(df, baselines)
+    baselines.update(df)
+
+    return df
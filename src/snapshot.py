@@ -0,0 +1,151 @@
+"""
+Columnar in-memory snapshot of the process table.
+
+ProcessSnapshot has a fixed schema and preallocated NumPy buffers that
+grow by doubling. Samplers append one process at a time straight into
+the buffers instead of building a dict per process and letting pandas
+infer types. The model features live in one C-contiguous float32 block
+in FEATURE_COLS order, which is exactly what the forest evaluates, so
+feature_matrix() hands it to the engine without a copy. to_frame() builds
+the DataFrame the dashboards, history and rolling windows work with.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.config import FEATURE_COLS
+
+# Features that are counts or flags; to_frame() returns them as integers
+INTEGER_FEATURES = {"file_access_count", "network_packets", "network_ports",
+                    "privilege_escalation_attempt"}
+
+# Activity tuple order produced by ActivityProbe.collect
+ACTIVITY_FEATURES = ["file_access_count", "network_packets", "network_ports"]
+
+
+class ProcessSnapshot:
+    def __init__(self, capacity=1024, feature_cols=FEATURE_COLS):
+        self.feature_cols = list(feature_cols)
+        self._feature_index = {col: j for j, col in enumerate(self.feature_cols)}
+        self._cpu = self._feature_index["cpu_usage"]
+        self._mem = self._feature_index["memory_usage"]
+        self.n = 0
+        self.timestamp = datetime.now().strftime("%H:%M:%S")
+
+        capacity = max(1, capacity)
+        self._pid = np.zeros(capacity, dtype=np.int64)
+        self._create_time = np.zeros(capacity, dtype=np.float64)
+        self._num_threads = np.zeros(capacity, dtype=np.int64)
+        self._names = np.empty(capacity, dtype=object)
+        self._features = np.zeros((capacity, len(self.feature_cols)), dtype=np.float32)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacity(self):
+        return len(self._pid)
+
+    def clear(self):
+        """Empty the snapshot for reuse, keeping its buffers"""
+        self._features[:self.n] = 0
+        self._names[:self.n] = None
+        self.n = 0
+        self.timestamp = datetime.now().strftime("%H:%M:%S")
+
+    def _grow(self):
+        old = self.capacity
+        self._pid = np.concatenate([self._pid, np.zeros(old, dtype=np.int64)])
+        self._create_time = np.concatenate([self._create_time, np.zeros(old)])
+        self._num_threads = np.concatenate([self._num_threads, np.zeros(old, dtype=np.int64)])
+        self._names = np.concatenate([self._names, np.empty(old, dtype=object)])
+        self._features = np.concatenate([self._features, np.zeros_like(self._features)])
+
+    # ---------- FILL ----------
+    def append(self, pid, process_name, create_time, cpu_usage, memory_usage, num_threads):
+        """Add one sampled process; activity features stay 0 until fill_activity()"""
+        i = self.n
+        if i == len(self._pid):
+            self._grow()
+        self._pid[i] = pid
+        self._names[i] = process_name
+        self._create_time[i] = create_time
+        self._num_threads[i] = num_threads
+        row = self._features[i]
+        row[self._cpu] = cpu_usage
+        row[self._mem] = memory_usage
+        self.n = i + 1
+
+    def fill_activity(self, activity):
+        """Set the activity features from ActivityProbe.collect output ({pid: tuple})"""
+        if not self.n or not activity:
+            return
+        rows = [activity.get(pid, (0, 0, 0)) for pid in self._pid[:self.n].tolist()]
+        cols = [self._feature_index[col] for col in ACTIVITY_FEATURES]
+        self._features[:self.n, cols] = np.asarray(rows, dtype=np.float32)
+
+    @classmethod
+    def from_records(cls, samples, feature_cols=FEATURE_COLS):
+        """Snapshot from sampler dicts (pid, process_name, create_time, cpu_usage, memory_usage, num_threads)"""
+        snapshot = cls(capacity=len(samples), feature_cols=feature_cols)
+        for s in samples:
+            snapshot.append(s["pid"], s["process_name"], s["create_time"], s["cpu_usage"],
+                            s["memory_usage"], s["num_threads"])
+        return snapshot
+
+    # ---------- VIEWS ----------
+    @property
+    def pid(self):
+        return self._pid[:self.n]
+
+    @property
+    def create_time(self):
+        return self._create_time[:self.n]
+
+    @property
+    def process_name(self):
+        return self._names[:self.n]
+
+    @property
+    def num_threads(self):
+        return self._num_threads[:self.n]
+
+    def feature(self, col):
+        """Writable view of one feature column"""
+        return self._features[:self.n, self._feature_index[col]]
+
+    def feature_matrix(self, cols=None):
+        """
+        (n, len(cols)) float32 feature rows. A view of the buffer when
+        `cols` is the snapshot's own feature order, otherwise a gathered copy.
+        """
+        if cols is None or list(cols) == self.feature_cols:
+            return self._features[:self.n]
+        return self._features[:self.n, [self._feature_index[col] for col in cols]]
+
+    def records(self):
+        """Raw samples as dicts, the format samplers returned before snapshots"""
+        return [
+            {"pid": pid, "process_name": name, "create_time": create_time,
+             "cpu_usage": float(cpu), "memory_usage": float(mem), "num_threads": threads}
+            for pid, name, create_time, cpu, mem, threads in zip(
+                self.pid.tolist(), self.process_name, self.create_time.tolist(),
+                self.feature("cpu_usage"), self.feature("memory_usage"), self.num_threads.tolist())
+        ]
+
+    def to_frame(self):
+        """DataFrame with the same columns and dtypes as the old dict-built snapshot"""
+        data = {
+            "process_name": self.process_name,
+            "pid": self.pid,
+            "create_time": self.create_time,
+        }
+        for j, col in enumerate(self.feature_cols):
+            values = self._features[:self.n, j]
+            data[col] = values.astype(np.int64 if col in INTEGER_FEATURES else np.float64)
+        data["num_threads"] = self.num_threads
+        df = pd.DataFrame(data)
+        df["timestamp"] = self.timestamp
+        return df
@@ -0,0 +1,47 @@
+"""
+Shared store for the latest scored snapshot.
+
+The collector daemon publishes one snapshot per tick; any number of
+dashboard sessions read it back without touching psutil themselves.
+Writes go to a temp file and are swapped in with os.replace, so a
+reader never sees a half-written snapshot.
+"""
+
+import os
+import pickle
+import time
+
+from src.config import SNAPSHOT_PATH, STALE_AFTER_INTERVALS
+
+
+def publish_snapshot(df, snapshot_id, interval, path=SNAPSHOT_PATH, stats=None):
+    """Atomically replace the latest snapshot at `path`"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "snapshot_id": snapshot_id,
+        "created_at": time.time(),
+        "interval": interval,
+        "stats": stats or {},
+        "data": df,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def read_latest(path=SNAPSHOT_PATH):
+    """Return the latest published snapshot dict, or None if there is none yet"""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def is_stale(snapshot):
+    """True when `snapshot` is missing or the daemon has missed several ticks"""
+    if snapshot is None:
+        return True
+    stale_after = snapshot["interval"] * STALE_AFTER_INTERVALS
+    return time.time() - snapshot["created_at"] > stale_after
@@ -0,0 +1,325 @@
+"""
+Seeded synthetic telemetry for training, load and benchmark runs.
+
+Two generators, both yielding DataFrame chunks so any number of rows can
+be streamed to CSV, CSV.gz or Parquet through export.write_frames
+without being held in memory:
+
+labeled_frames     training rows (FEATURE_COLS + label) drawn from the
+                   normal / suspicious / borderline profiles of
+                   generate_realistic_logs.py
+timeseries_frames  per-tick snapshots of the process tables of several
+                   hosts. Each process follows a behaviour modelled on
+                   create_test_processes.py: normal, cpu (sustained
+                   load), memory_ramp (steady allocation), network,
+                   file (many writes of high-entropy data), burst
+                   (periodic spikes) and spawner (a dropper starting
+                   short-lived children, linked to it by parent_pid;
+                   the other lineage columns are not generated). Rows
+                   are labelled while the behaviour is active.
+
+The same seed and chunk size always give the same rows.
+
+Usage (from the repository root):
+    python -m src.synthetic labeled --rows 1000000 --output data/generated_behavior.csv
+    python -m src.synthetic timeseries --hosts 20 --processes 500 --ticks 720 \\
+        --output telemetry.parquet
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.config import DATA_DIR, FEATURE_COLS
+from src.export import write_frames
+
+CHUNK_ROWS = 100_000
+
+# ---------- LABELED ROWS ----------
+# (share of rows, label, {column: distribution}); shares follow the 500 / 500 /
+# 100 / 100 split of generate_realistic_logs.py. Distributions:
+#   ("int", low, high)  integers in [low, high)
+#   ("uniform", low, high)
+#   ("choice", values, probabilities)
+LABELED_PROFILES = [
+    (500, 0, {  # normal, with some overlap with suspicious
+        "file_access_count": ("int", 1, 30),
+        "cpu_usage": ("uniform", 5, 60),
+        "memory_usage": ("uniform", 100, 800),
+        "network_packets": ("int", 10, 300),
+        "network_ports": ("int", 0, 3),
+        "privilege_escalation_attempt": ("choice", [0, 1], [0.95, 0.05]),
+        "file_entropy": ("uniform", 0, 5),
+    }),
+    (500, 1, {  # suspicious
+        "file_access_count": ("int", 15, 100),
+        "cpu_usage": ("uniform", 40, 95),
+        "memory_usage": ("uniform", 400, 2000),
+        "network_packets": ("int", 150, 1000),
+        "network_ports": ("int", 1, 5),
+        "privilege_escalation_attempt": ("choice", [0, 1, 2], [0.1, 0.5, 0.4]),
+        "file_entropy": ("uniform", 2, 8),
+    }),
+    (100, 0, {  # normal that looks suspicious
+        "file_access_count": ("int", 25, 40),
+        "cpu_usage": ("uniform", 50, 70),
+        "memory_usage": ("uniform", 600, 900),
+        "network_packets": ("int", 200, 400),
+        "network_ports": ("int", 1, 3),
+        "privilege_escalation_attempt": ("choice", [0, 1], [0.7, 0.3]),
+        "file_entropy": ("uniform", 3, 5),
+    }),
+    (100, 1, {  # suspicious that looks normal
+        "file_access_count": ("int", 10, 25),
+        "cpu_usage": ("uniform", 35, 55),
+        "memory_usage": ("uniform", 300, 700),
+        "network_packets": ("int", 100, 250),
+        "network_ports": ("int", 0, 2),
+        "privilege_escalation_attempt": ("choice", [0, 1], [0.5, 0.5]),
+        "file_entropy": ("uniform", 2, 4),
+    }),
+]
+
+
+def _draw(rng, spec, n):
+    kind = spec[0]
+    if kind == "int":
+        return rng.integers(spec[1], spec[2], n)
+    if kind == "uniform":
+        return rng.uniform(spec[1], spec[2], n)
+    if kind == "choice":
+        return rng.choice(spec[1], n, p=spec[2])
+    raise ValueError(f"Unknown distribution: {kind}")
+
+
+def labeled_frames(rows, seed=42, chunk_rows=CHUNK_ROWS, profiles=LABELED_PROFILES):
+    """`rows` shuffled training rows in chunks of `chunk_rows`"""
+    shares = np.array([share for share, _, _ in profiles], dtype=np.float64)
+    shares /= shares.sum()
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        # One generator per chunk keeps the output independent of how many chunks came before
+        rng = np.random.default_rng([seed, start])
+        group = rng.choice(len(profiles), n, p=shares)
+        data = {col: np.zeros(n, dtype=np.float64 if spec[0] == "uniform" else np.int64)
+                for col, spec in profiles[0][2].items()}
+        label = np.zeros(n, dtype=np.int64)
+        for g, (_, group_label, columns) in enumerate(profiles):
+            rows_g = np.flatnonzero(group == g)
+            label[rows_g] = group_label
+            for col in FEATURE_COLS:
+                data[col][rows_g] = _draw(rng, columns[col], len(rows_g))
+        data["label"] = label
+        yield pd.DataFrame(data)
+
+
+# ---------- MULTI-HOST TIME SERIES ----------
+PATTERNS = ["normal", "cpu", "memory_ramp", "network", "file", "burst", "spawner", "child"]
+_P = {name: i for i, name in enumerate(PATTERNS)}
+
+SUSPICIOUS_NAMES = {
+    "cpu": "cryptominer", "memory_ramp": "mem_hog", "network": "beacon", "file": "encryptor",
+    "burst": "burst_worker", "spawner": "dropper", "child": "payload",
+}
+NORMAL_NAMES = ["sshd", "nginx", "postgres", "python3", "bash", "cron", "dockerd", "node",
+                "java", "redis-server", "chrome", "code", "rsyslogd", "containerd"]
+
+# Ticks between burst_process spikes (it sleeps 3 s between bursts)
+BURST_PERIOD = 3
+
+
+def _population(rng, processes, ticks, suspicious_rate, spawn_rate):
+    """
+    Every process a host will run: pid, parent, behaviour and the ticks
+    [start, end) it is alive. Children of spawners are added here too.
+    """
+    n = max(processes, 2)
+    pid = 1000 + np.arange(n)
+    pid[0] = 1
+    pattern = np.zeros(n, dtype=np.int64)
+    suspicious = np.flatnonzero(rng.random(n) < suspicious_rate)
+    suspicious = suspicious[suspicious > 0]
+    pattern[suspicious] = rng.integers(_P["cpu"], _P["spawner"] + 1, len(suspicious))
+
+    # Normal processes mostly live for the whole run, some come and go
+    start = np.zeros(n, dtype=np.int64)
+    end = np.full(n, ticks, dtype=np.int64)
+    churn = (rng.random(n) < 0.2) & (pattern == _P["normal"])
+    churn[0] = False
+    start[churn] = rng.integers(0, ticks, churn.sum())
+    end[churn] = np.minimum(start[churn] + rng.integers(1, max(ticks // 4, 2), churn.sum()), ticks)
+    # Suspicious behaviour starts somewhere in the run and lasts like a test process
+    start[suspicious] = rng.integers(0, ticks, len(suspicious))
+    end[suspicious] = np.minimum(start[suspicious] + rng.integers(6, 60, len(suspicious)), ticks)
+
+    # Services hang off init, everything else off a random service
+    n_services = max(1, n // 20)
+    ppid = np.where(np.arange(n) <= n_services, 1, pid[rng.integers(1, n_services + 1, n)])
+    ppid[0] = 0
+
+    # Spawners start children at `spawn_rate` per tick; each lives a few ticks
+    child_parent, child_start = [], []
+    for i in np.flatnonzero(pattern == _P["spawner"]):
+        count = rng.poisson(spawn_rate * (end[i] - start[i]))
+        child_parent.append(np.full(count, i))
+        child_start.append(rng.integers(start[i], end[i], count))
+    if child_parent:
+        child_parent = np.concatenate(child_parent)
+        child_start = np.concatenate(child_start)
+        m = len(child_parent)
+        pid = np.concatenate([pid, pid[-1] + 1 + np.arange(m)])
+        ppid = np.concatenate([ppid, pid[child_parent]])
+        pattern = np.concatenate([pattern, np.full(m, _P["child"])])
+        start = np.concatenate([start, child_start])
+        end = np.concatenate([end, np.minimum(child_start + rng.integers(1, 6, m), ticks)])
+        n = len(pid)
+
+    names = np.array([SUSPICIOUS_NAMES.get(PATTERNS[p]) or NORMAL_NAMES[i % len(NORMAL_NAMES)]
+                      for i, p in enumerate(pattern)], dtype=object)
+    names[0] = "systemd"
+    return {
+        "pid": pid, "ppid": ppid, "pattern": pattern, "start": start, "end": end, "name": names,
+        "base_mem": rng.lognormal(4.5, 1.0, n),
+        "mem_slope": rng.uniform(20, 80, n),
+        "entropy": np.where(pattern >= _P["file"], rng.uniform(6, 8, n), rng.uniform(0, 5, n)),
+        "threads": rng.integers(1, 32, n),
+        "priv": (rng.random(n) < np.where(pattern == _P["normal"], 0.02, 0.5)).astype(np.int64),
+    }
+
+
+def _host_rows(rng, pop, t0, t1):
+    """Feature rows of every process alive in ticks [t0, t1) of one host"""
+    ticks = np.arange(t0, t1)
+    alive = (pop["start"][:, None] <= ticks) & (ticks < pop["end"][:, None])
+    proc, col = np.nonzero(alive)
+    t = ticks[col]
+    n = len(proc)
+    pattern = pop["pattern"][proc]
+    age = t - pop["start"][proc]
+    on_burst = (pattern == _P["burst"]) & (age % BURST_PERIOD == 0)
+
+    cpu = rng.gamma(1.0, 3.0, n)
+    cpu = np.where(pattern == _P["cpu"], rng.normal(85, 8, n), cpu)
+    cpu = np.where(on_burst, rng.normal(90, 5, n), cpu)
+    cpu = np.where((pattern == _P["spawner"]) | (pattern == _P["child"]), rng.normal(35, 10, n), cpu)
+
+    memory = pop["base_mem"][proc] * rng.uniform(0.95, 1.05, n)
+    memory = np.where(pattern == _P["memory_ramp"], memory + pop["mem_slope"][proc] * age, memory)
+
+    packets = rng.poisson(np.where(pattern == _P["network"], 600.0,
+                                   np.where(on_burst, 300.0, 20.0)))
+    ports = np.where(pattern == _P["network"], rng.integers(2, 6, n), rng.integers(0, 3, n))
+    files = rng.poisson(np.where(pattern == _P["file"], 60.0, 5.0))
+
+    return {
+        "tick": t,
+        "pid": pop["pid"][proc],
+        "parent_pid": pop["ppid"][proc],
+        "process_name": pop["name"][proc],
+        "start": pop["start"][proc],
+        "file_access_count": files,
+        "cpu_usage": np.clip(cpu, 0, 100),
+        "memory_usage": np.minimum(memory, 16000),
+        "network_packets": packets,
+        "network_ports": ports,
+        "privilege_escalation_attempt": pop["priv"][proc],
+        "file_entropy": pop["entropy"][proc],
+        "num_threads": pop["threads"][proc],
+        "pattern": pattern,
+        "label": (pattern != _P["normal"]).astype(np.int64),
+    }
+
+
+def timeseries_frames(hosts=3, processes=200, ticks=720, interval=5.0, start_time=None,
+                      suspicious_rate=0.05, spawn_rate=0.5, seed=42, chunk_rows=CHUNK_ROWS):
+    """
+    Per-tick process snapshots of `hosts` hosts, in timestamp order, in
+    chunks of about `chunk_rows` rows (whole ticks per chunk)
+    """
+    start_time = time.time() - ticks * interval if start_time is None else start_time
+    populations = [_population(np.random.default_rng([seed, h]), processes, ticks,
+                               suspicious_rate, spawn_rate) for h in range(hosts)]
+    rows_per_tick = max(1, sum(len(pop["pid"]) for pop in populations) * 0.9)
+    block = max(1, int(chunk_rows // rows_per_tick))
+
+    for t0 in range(0, ticks, block):
+        t1 = min(t0 + block, ticks)
+        parts = []
+        for h, pop in enumerate(populations):
+            rows = _host_rows(np.random.default_rng([seed, h, t0]), pop, t0, t1)
+            frame = pd.DataFrame(rows)
+            frame.insert(0, "host", f"host-{h:03d}")
+            parts.append(frame)
+        df = pd.concat(parts, ignore_index=True).sort_values(["tick", "host"], kind="stable")
+        df.insert(0, "timestamp", start_time + df["tick"] * interval)
+        df["create_time"] = start_time + df["start"] * interval
+        df["pattern"] = pd.Categorical.from_codes(df["pattern"], PATTERNS)
+        yield df.drop(columns=["tick", "start"]).reset_index(drop=True)
+
+
+# ---------- OUTPUT ----------
+def format_for(path, fmt=None):
+    if fmt:
+        return fmt
+    if path.endswith(".parquet"):
+        return "parquet"
+    return "csv.gz" if path.endswith(".gz") else "csv"
+
+
+def write(frames, path, fmt=None):
+    """Stream `frames` to `path`; returns the row count"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        rows = write_frames(frames, f, format_for(path, fmt))
+    os.replace(tmp, path)
+    return rows
+
+
+def write_labeled(path=os.path.join(DATA_DIR, "generated_behavior.csv"), rows=1200, seed=42,
+                  fmt=None):
+    return write(labeled_frames(rows, seed), path, fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic telemetry")
+    sub = parser.add_subparsers(dest="kind", required=True)
+
+    labeled = sub.add_parser("labeled", help="training rows (features + label)")
+    labeled.add_argument("--rows", type=int, default=1200)
+    labeled.add_argument("--output", default=os.path.join(DATA_DIR, "generated_behavior.csv"))
+
+    series = sub.add_parser("timeseries", help="per-tick process snapshots of several hosts")
+    series.add_argument("--hosts", type=int, default=3)
+    series.add_argument("--processes", type=int, default=200, help="processes per host")
+    series.add_argument("--ticks", type=int, default=720)
+    series.add_argument("--interval", type=float, default=5.0, help="seconds per tick")
+    series.add_argument("--suspicious-rate", type=float, default=0.05)
+    series.add_argument("--spawn-rate", type=float, default=0.5,
+                        help="children per tick started by each spawner")
+    series.add_argument("--output", default=os.path.join(DATA_DIR, "synthetic_telemetry.parquet"))
+
+    for p in (labeled, series):
+        p.add_argument("--seed", type=int, default=42)
+        p.add_argument("--format", choices=["csv", "csv.gz", "parquet"],
+                       help="default: from the output extension")
+        p.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.kind == "labeled":
+        frames = labeled_frames(args.rows, args.seed, args.chunk_rows)
+    else:
+        frames = timeseries_frames(args.hosts, args.processes, args.ticks, args.interval,
+                                   suspicious_rate=args.suspicious_rate, spawn_rate=args.spawn_rate,
+                                   seed=args.seed, chunk_rows=args.chunk_rows)
+    rows = write(frames, args.output, args.format)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {rows} rows written to {args.output} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Server-side filtering, sorting and paging for the process table.
+
+The dashboards filter and sort the snapshot here and only send the
+visible page to the browser, so the table payload per refresh stays at
+one page however many processes the host runs.
+"""
+
+import math
+
+import pandas as pd
+
+from src.config import TABLE_PAGE_SIZE
+
+SORT_COLUMNS = ["threat_score", "threat_probability", "cpu_usage", "memory_usage",
+                "network_packets", "num_threads", "pid", "process_name"]
+
+PREDICTION_FILTERS = {"All": None, "Suspicious": 1, "Normal": 0}
+
+
+def filter_processes(df, name="", prediction=None, min_probability=0.0, host=None):
+    """
+    Rows whose name contains `name` (case-insensitive), with the given
+    prediction and probability and, for fleet snapshots, from `host`
+    """
+    mask = pd.Series(True, index=df.index)
+    if host is not None:
+        mask &= df["host"] == host
+    if name:
+        mask &= df["process_name"].str.contains(name, case=False, regex=False, na=False)
+    if prediction is not None:
+        mask &= df["prediction"] == prediction
+    if min_probability > 0:
+        mask &= df["threat_probability"] >= min_probability
+    return df if mask.all() else df[mask]
+
+
+def page_count(n_rows, page_size=TABLE_PAGE_SIZE):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def sort_page(df, sort_by="threat_score", ascending=False, page=1, page_size=TABLE_PAGE_SIZE):
+    """
+    Rows of page `page` (1-based) after sorting by `sort_by`. For numeric
+    columns only the rows up to the end of the page are ordered
+    (nlargest / nsmallest) instead of sorting the whole frame.
+    """
+    end = page * page_size
+    if pd.api.types.is_numeric_dtype(df[sort_by]) and end < len(df):
+        top = df.nsmallest(end, sort_by) if ascending else df.nlargest(end, sort_by)
+    else:
+        top = df.sort_values(sort_by, ascending=ascending, kind="stable")
+    return top.iloc[end - page_size:end]
+
+
+def filter_sort_page(df, name="", prediction=None, min_probability=0.0, host=None,
+                     sort_by="threat_score", ascending=False, page=1, page_size=TABLE_PAGE_SIZE):
+    """Filter, sort and page in one call; returns (page rows, matching row count)"""
+    filtered = filter_processes(df, name, prediction, min_probability, host)
+    page = min(max(1, page), page_count(len(filtered), page_size))
+    return sort_page(filtered, sort_by, ascending, page, page_size), len(filtered)
@@ -0,0 +1,369 @@
+"""
+Model training with a bounded hyperparameter search.
+
+Candidates are sampled from SEARCH_SPACE (tree count, depth, leaf size)
+and cross-validated in parallel: every (candidate, fold) fit is one task
+for a process pool, and the dataset is handed to each worker once by the
+pool initializer. Each candidate's fold-0 forest is flattened with the
+fold scaler folded in, exactly as it would be deployed, and timed on
+TICK_ROWS rows in the parent process after the pool has finished.
+
+Selection trades accuracy against cost: candidates must score a tick
+within INFERENCE_BUDGET_MS and stay under MODEL_MAX_BYTES; among those
+whose mean F1 is within TRAIN_F1_TOLERANCE of the best, the fastest is
+refit on all cores and evaluated on a held-out split.
+
+Every run writes a version directory under MODEL_VERSIONS_DIR with the
+model, scaler, raw-feature forest and a manifest.json (features, params,
+CV and hold-out metrics, latency, size, the whole search table, data
+hash, library versions). Promoting a version copies its artifacts to the
+paths the dashboards and the daemon load.
+
+Usage (from the repository root):
+    python -m src.training                      # search, train, promote
+    python -m src.training --list               # versions and their cost
+    python -m src.training --promote 20260101-120000
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import platform
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from src.config import (DATA_DIR, INFERENCE_BUDGET_MS, MODEL_MANIFEST_PATH, MODEL_MAX_BYTES,
+                        MODEL_PATH, MODEL_VERSIONS_DIR, RAW_FOREST_PATH, SCALER_PATH,
+                        TICK_ROWS, TRAIN_CV_FOLDS, TRAIN_F1_TOLERANCE, TRAIN_MAX_CANDIDATES,
+                        TRAIN_N_JOBS)
+from src.forest import FlatForest
+
+DATA_PATH = os.path.join(DATA_DIR, "generated_behavior.csv")
+
+SEARCH_SPACE = {
+    "n_estimators": [25, 50, 100, 200],
+    "max_depth": [6, 10, 16, None],
+    "min_samples_leaf": [1, 2, 5],
+}
+
+# The configuration used before the search existed; always evaluated
+DEFAULT_PARAMS = {"n_estimators": 200, "max_depth": None, "min_samples_leaf": 1}
+
+METRICS = {
+    "accuracy": accuracy_score,
+    "precision": lambda y, p: precision_score(y, p, zero_division=0),
+    "recall": lambda y, p: recall_score(y, p, zero_division=0),
+    "f1": lambda y, p: f1_score(y, p, zero_division=0),
+}
+
+
+def resolve_n_jobs(n_jobs=TRAIN_N_JOBS):
+    return n_jobs if n_jobs > 0 else os.cpu_count() or 1
+
+
+def load_dataset(path=DATA_PATH, label="label"):
+    """(X DataFrame, y Series) from a labelled CSV; every other column is a feature"""
+    df = pd.read_csv(path)
+    return df.drop(label, axis=1), df[label]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ---------- SEARCH ----------
+def sample_candidates(max_candidates=TRAIN_MAX_CANDIDATES, seed=42):
+    """DEFAULT_PARAMS plus a seeded sample of the rest of the grid"""
+    keys = list(SEARCH_SPACE)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*SEARCH_SPACE.values())]
+    others = [params for params in grid if params != DEFAULT_PARAMS]
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(len(others), size=min(max(max_candidates - 1, 0), len(others)), replace=False)
+    return [DEFAULT_PARAMS] + [others[i] for i in sorted(picked)]
+
+
+def make_model(params, seed, n_jobs=1):
+    return RandomForestClassifier(**params, random_state=seed, n_jobs=n_jobs)
+
+
+def fit_flat(params, X, y, seed, n_jobs=1):
+    """Fit scaler + forest and flatten it with the scaler folded in"""
+    scaler = StandardScaler().fit(X)
+    model = make_model(params, seed, n_jobs).fit(scaler.transform(X), y)
+    return model, scaler, FlatForest.from_sklearn(model).fold_scaler(scaler)
+
+
+def evaluate(y_true, y_pred):
+    return {name: float(metric(y_true, y_pred)) for name, metric in METRICS.items()}
+
+
+# Dataset shared with the pool workers, set once per worker by _init_worker
+_worker_X = None
+_worker_y = None
+
+
+def _init_worker(X, y):
+    global _worker_X, _worker_y
+    _worker_X, _worker_y = X, y
+
+
+def _fit_fold(task):
+    """One (candidate, fold) fit: metrics on the fold, plus the flattened forest of fold 0"""
+    candidate, fold, params, train_idx, test_idx, seed = task
+    started = time.perf_counter()
+    _, _, forest = fit_flat(params, _worker_X[train_idx], _worker_y[train_idx], seed)
+    labels, _ = forest.predict(_worker_X[test_idx])
+    metrics = evaluate(_worker_y[test_idx], labels)
+    metrics["fit_seconds"] = time.perf_counter() - started
+    return candidate, fold, metrics, forest if fold == 0 else None
+
+
+def forest_bytes(forest):
+    return int(sum(a.nbytes for a in (forest.feature, forest.threshold, forest.left,
+                                      forest.right, forest.value, forest.roots)))
+
+
+def tick_latency_ms(forest, X, rows=TICK_ROWS, repeats=5):
+    """Best-of-`repeats` time for one predict() over `rows` rows drawn from X"""
+    batch = np.ascontiguousarray(np.resize(np.asarray(X, dtype=np.float32), (rows, X.shape[1])))
+    forest.compile()
+    forest.predict(batch)
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        forest.predict(batch)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def cross_validate(candidates, X, y, folds=TRAIN_CV_FOLDS, seed=42, n_jobs=TRAIN_N_JOBS):
+    """
+    Cross-validate every candidate; returns one result dict per candidate
+    with mean/std metrics, tick latency and flattened size.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(X, y))
+    tasks = [(c, f, params, train_idx, test_idx, seed)
+             for c, params in enumerate(candidates)
+             for f, (train_idx, test_idx) in enumerate(splits)]
+
+    n_jobs = min(resolve_n_jobs(n_jobs), len(tasks))
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(X, y)) as pool:
+            outputs = list(pool.map(_fit_fold, tasks, chunksize=max(1, len(tasks) // (n_jobs * 4))))
+    else:
+        _init_worker(X, y)
+        outputs = [_fit_fold(task) for task in tasks]
+
+    per_candidate = {c: [] for c in range(len(candidates))}
+    forests = {}
+    for candidate, fold, metrics, forest in outputs:
+        per_candidate[candidate].append(metrics)
+        if forest is not None:
+            forests[candidate] = forest
+
+    # Timed after the pool is gone so the workers do not skew the numbers
+    results = []
+    for c, params in enumerate(candidates):
+        frame = pd.DataFrame(per_candidate[c])
+        forest = forests[c]
+        results.append({
+            "params": params,
+            "cv": {name: {"mean": float(frame[name].mean()), "std": float(frame[name].std(ddof=0))}
+                   for name in METRICS},
+            "fit_seconds": float(frame["fit_seconds"].mean()),
+            "latency_ms": tick_latency_ms(forest, X),
+            "size_bytes": forest_bytes(forest),
+            "n_nodes": forest.n_nodes,
+        })
+    return results
+
+
+def select(results, budget_ms=INFERENCE_BUDGET_MS, max_bytes=MODEL_MAX_BYTES,
+           f1_tolerance=TRAIN_F1_TOLERANCE):
+    """
+    Index of the chosen result. Falls back to the fastest candidate when
+    none fits the budget and size cap.
+    """
+    fits = [i for i, r in enumerate(results)
+            if r["latency_ms"] <= budget_ms and r["size_bytes"] <= max_bytes]
+    if not fits:
+        return min(range(len(results)), key=lambda i: results[i]["latency_ms"])
+    best_f1 = max(results[i]["cv"]["f1"]["mean"] for i in fits)
+    close = [i for i in fits if results[i]["cv"]["f1"]["mean"] >= best_f1 - f1_tolerance]
+    return min(close, key=lambda i: (results[i]["latency_ms"], results[i]["size_bytes"]))
+
+
+# ---------- ARTIFACTS ----------
+def _copy_atomic(src, dst):
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    tmp = f"{dst}.tmp"
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _write_json_atomic(obj, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+
+def write_version(model, scaler, forest, feature_cols, manifest, versions_dir=MODEL_VERSIONS_DIR):
+    """Write a new version directory; returns its path"""
+    path = os.path.join(versions_dir, manifest["version"])
+    os.makedirs(path, exist_ok=True)
+    joblib.dump(model, os.path.join(path, os.path.basename(MODEL_PATH)))
+    joblib.dump(scaler, os.path.join(path, os.path.basename(SCALER_PATH)))
+    forest_path = os.path.join(path, os.path.basename(RAW_FOREST_PATH))
+    forest.save(forest_path, feature_names=feature_cols)
+    # size_bytes counts the node arrays in memory; file_bytes adds the file header and alignment
+    manifest["file_bytes"] = os.path.getsize(forest_path)
+    _write_json_atomic(manifest, os.path.join(path, "manifest.json"))
+    return path
+
+
+def promote(version, versions_dir=MODEL_VERSIONS_DIR, model_path=MODEL_PATH,
+            scaler_path=SCALER_PATH, raw_forest_path=RAW_FOREST_PATH,
+            manifest_path=MODEL_MANIFEST_PATH):
+    """Copy a version's artifacts to the paths the dashboards and the daemon load"""
+    path = os.path.join(versions_dir, version)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"No model version {version} in {versions_dir}")
+    # The forest goes last: load_engine prefers it, and it must not pair with an old model
+    for dst in (model_path, scaler_path, raw_forest_path):
+        _copy_atomic(os.path.join(path, os.path.basename(dst)), dst)
+    _copy_atomic(os.path.join(path, "manifest.json"), manifest_path)
+
+
+def list_versions(versions_dir=MODEL_VERSIONS_DIR):
+    """Manifests of every stored version, oldest first"""
+    if not os.path.isdir(versions_dir):
+        return []
+    manifests = []
+    for version in sorted(os.listdir(versions_dir)):
+        manifest_file = os.path.join(versions_dir, version, "manifest.json")
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+# ---------- TRAIN ----------
+def train(data_path=DATA_PATH, versions_dir=MODEL_VERSIONS_DIR, seed=42, n_jobs=TRAIN_N_JOBS,
+          max_candidates=TRAIN_MAX_CANDIDATES, folds=TRAIN_CV_FOLDS,
+          budget_ms=INFERENCE_BUDGET_MS, max_bytes=MODEL_MAX_BYTES, verbose=True):
+    """Search, refit the chosen candidate and write a new version; returns its manifest"""
+    X, y = load_dataset(data_path)
+    feature_cols = list(X.columns)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=seed)
+
+    candidates = sample_candidates(max_candidates, seed)
+    if verbose:
+        print(f"🔎 Cross-validating {len(candidates)} candidates x {folds} folds "
+              f"on {resolve_n_jobs(n_jobs)} workers")
+    started = time.perf_counter()
+    results = cross_validate(candidates, X_train, y_train, folds, seed, n_jobs)
+    search_seconds = time.perf_counter() - started
+
+    chosen = select(results, budget_ms, max_bytes)
+    params = results[chosen]["params"]
+    if verbose:
+        print(f"{'trees':>6} {'depth':>6} {'leaf':>5} {'F1':>13} {'tick ms':>8} {'KB':>8}")
+        for i, r in enumerate(results):
+            p, f1 = r["params"], r["cv"]["f1"]
+            print(f"{p['n_estimators']:>6} {str(p['max_depth']):>6} {p['min_samples_leaf']:>5} "
+                  f"{f1['mean']:>7.3f}±{f1['std']:.3f} {r['latency_ms']:>8.2f} "
+                  f"{r['size_bytes'] / 1024:>8.1f}{'  ←' if i == chosen else ''}")
+
+    model, scaler, forest = fit_flat(params, X_train.to_numpy(dtype=np.float32), y_train, seed,
+                                     resolve_n_jobs(n_jobs))
+    labels, _ = forest.predict(X_test.to_numpy(dtype=np.float32))
+
+    manifest = {
+        "version": time.strftime("%Y%m%d-%H%M%S"),
+        "created_at": time.time(),
+        "features": feature_cols,
+        "params": params,
+        "seed": seed,
+        "data": {"path": os.path.abspath(data_path), "sha256": file_sha256(data_path),
+                 "rows": len(X), "positive_rate": float(np.mean(y))},
+        "cv": results[chosen]["cv"],
+        "holdout": evaluate(y_test, labels),
+        "latency_ms": tick_latency_ms(forest, X_train.to_numpy(dtype=np.float32)),
+        "tick_rows": TICK_ROWS,
+        "size_bytes": forest_bytes(forest),
+        "n_trees": forest.n_trees,
+        "n_nodes": forest.n_nodes,
+        "within_budget": results[chosen]["latency_ms"] <= budget_ms
+                         and results[chosen]["size_bytes"] <= max_bytes,
+        "budget": {"latency_ms": budget_ms, "size_bytes": max_bytes},
+        "search": {"candidates": results, "seconds": search_seconds, "folds": folds},
+        "versions": {"python": platform.python_version(), "numpy": np.__version__,
+                     "pandas": pd.__version__, "sklearn": sklearn.__version__},
+    }
+    path = write_version(model, scaler, forest, feature_cols, manifest, versions_dir)
+
+    if verbose:
+        for name, value in manifest["holdout"].items():
+            print(f"{name.capitalize()}: {value}")
+        if not manifest["within_budget"]:
+            print(f"⚠️ No candidate fits {budget_ms} ms / {max_bytes} bytes; kept the fastest")
+        print(f"✅ Model version {manifest['version']} saved in {path}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and version the threat model")
+    parser.add_argument("--data", default=DATA_PATH, help="labelled training CSV")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-jobs", type=int, default=TRAIN_N_JOBS, help="worker processes (0 = all cores)")
+    parser.add_argument("--max-candidates", type=int, default=TRAIN_MAX_CANDIDATES)
+    parser.add_argument("--folds", type=int, default=TRAIN_CV_FOLDS)
+    parser.add_argument("--budget-ms", type=float, default=INFERENCE_BUDGET_MS,
+                        help=f"inference budget for {TICK_ROWS} processes")
+    parser.add_argument("--max-bytes", type=int, default=MODEL_MAX_BYTES)
+    parser.add_argument("--no-promote", action="store_true",
+                        help="keep the new version without making it the live model")
+    parser.add_argument("--promote", metavar="VERSION", help="make a stored version the live model")
+    parser.add_argument("--list", action="store_true", help="list stored versions")
+    args = parser.parse_args()
+
+    if args.list:
+        for m in list_versions():
+            print(f"{m['version']}  F1 {m['holdout']['f1']:.3f}  {m['latency_ms']:.2f} ms/tick  "
+                  f"{m['size_bytes'] / 1024:.0f} KB  {m['params']}")
+        return
+    if args.promote:
+        promote(args.promote)
+        print(f"✅ Version {args.promote} is now the live model")
+        return
+
+    manifest = train(args.data, seed=args.seed, n_jobs=args.n_jobs,
+                     max_candidates=args.max_candidates, folds=args.folds,
+                     budget_ms=args.budget_ms, max_bytes=args.max_bytes)
+    if not args.no_promote:
+        promote(manifest["version"])
+        print(f"✅ Model, scaler and raw-feature forest copied to {os.path.dirname(MODEL_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the package as src.xxx, like the dashboards and benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+
+from src.alerts import AlertEngine
+
+
+def _frame(*rows):
+    """Scored rows as (pid, threat_probability)"""
+    return pd.DataFrame([{"pid": pid, "process_name": f"proc{pid}", "create_time": 100.0 + pid,
+                          "threat_probability": proba, "threat_score": proba * 100}
+                         for pid, proba in rows])
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event)
+
+
+@pytest.fixture
+def engine():
+    engine = AlertEngine(raise_at=0.8, clear_at=0.5)
+    yield engine
+    engine.close()
+
+
+def _kinds(events):
+    return [(event["event"], event["pid"]) for event in events]
+
+
+def test_raises_once_and_clears_below_the_clear_level(engine):
+    assert _kinds(engine.process(_frame((1, 0.9)))) == [("raised", 1)]
+    assert engine.process(_frame((1, 0.95))) == []
+    assert engine.process(_frame((1, 0.6))) == []  # between the levels: still active
+
+    events = engine.process(_frame((1, 0.4)))
+    assert _kinds(events) == [("cleared", 1)]
+    assert events[0]["reason"] == "below threshold"
+    assert events[0]["peak_probability"] == 0.95
+    assert engine.active == {}
+
+
+def test_hysteresis_stops_flapping(engine):
+    events = []
+    for proba in [0.85, 0.75, 0.82, 0.7, 0.81, 0.45, 0.79, 0.85]:
+        events += engine.process(_frame((1, proba)))
+    assert [event["event"] for event in events] == ["raised", "cleared", "raised"]
+    assert (engine.raised, engine.cleared) == (2, 1)
+
+
+def test_below_raise_level_never_raises(engine):
+    for proba in [0.6, 0.79, 0.7]:
+        assert engine.process(_frame((1, proba))) == []
+
+
+def test_exited_process_is_cleared(engine):
+    engine.process(_frame((1, 0.9), (2, 0.1)))
+    events = engine.process(_frame((2, 0.1)))
+    assert _kinds(events) == [("cleared", 1)]
+    assert events[0]["reason"] == "process exited"
+
+
+def test_reused_pid_is_a_new_process(engine):
+    engine.process(_frame((1, 0.9)))
+    reused = _frame((1, 0.9)).assign(create_time=999.0)
+    events = engine.process(reused)
+    assert _kinds(events) == [("raised", 1), ("cleared", 1)]
+    assert events[0]["create_time"] == 999.0 and events[1]["reason"] == "process exited"
+
+
+def test_empty_and_unscored_frames(engine):
+    engine.process(_frame((1, 0.9), (2, 0.9)))
+    unscored = _frame((2, 0.0)).drop(columns=["threat_probability", "threat_score"])
+    assert _kinds(engine.process(unscored)) == [("cleared", 1)]
+    assert _kinds(engine.process(pd.DataFrame())) == [("cleared", 2)]
+    assert engine.process(pd.DataFrame()) == []
+
+
+def test_report_emits_without_keeping_state(engine):
+    events = engine.report(_frame((1, 0.9), (2, 0.1)))
+    assert _kinds(events) == [("raised", 1)]
+    assert events[0]["reason"] == "short-lived process"
+    assert engine.active == {}
+    assert engine.report(pd.DataFrame()) == []
+
+
+def test_events_reach_the_sinks():
+    sink = ListSink()
+    engine = AlertEngine(sinks=[sink], raise_at=0.8, clear_at=0.5)
+    engine.process(_frame((1, 0.9)))
+    engine.process(_frame((1, 0.1)))
+    engine.close()
+    assert [event["event"] for event in sink.events] == ["raised", "cleared"]
+
+
+def test_clear_level_above_raise_level_is_rejected():
+    with pytest.raises(ValueError):
+        AlertEngine(raise_at=0.5, clear_at=0.8)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.baselines import Baselines, P2Quantile
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+@pytest.mark.parametrize("dist", ["normal", "lognormal", "uniform"])
+def test_p2_tracks_exact_quantile(q, dist):
+    rng = np.random.default_rng(7)
+    stream = getattr(rng, dist)(size=20_000)
+    estimator = P2Quantile(q)
+    for x in stream:
+        estimator.update(x)
+
+    exact = np.quantile(stream, q)
+    spread = np.quantile(stream, 0.999) - np.quantile(stream, 0.001)
+    assert estimator.count == len(stream)
+    assert abs(estimator.value - exact) < 0.02 * spread
+
+
+def test_p2_exact_before_five_samples():
+    estimator = P2Quantile(0.5)
+    assert estimator.value is None
+    for x in [3.0, 1.0, 2.0]:
+        estimator.update(x)
+    assert estimator.value == 2.0
+
+
+def test_p2_rejects_bad_quantile():
+    with pytest.raises(ValueError):
+        P2Quantile(1.0)
+
+
+def _frame(rng, n):
+    return pd.DataFrame({"memory_usage": rng.lognormal(5, 1, n),
+                         "network_packets": rng.poisson(50, n).astype(float)})
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    rng = np.random.default_rng(3)
+    baselines = Baselines(metrics=["memory_usage", "network_packets"], quantile=0.95,
+                          sample_size=32, warmup=50)
+    for _ in range(20):
+        baselines.update(_frame(rng, 100))
+    baselines.save(path)
+
+    restored = Baselines.load(path, metrics=["memory_usage", "network_packets"], quantile=0.95,
+                              warmup=50)
+    for metric in ["memory_usage", "network_packets"]:
+        assert restored.estimators[metric].to_dict() == baselines.estimators[metric].to_dict()
+        assert restored.scale(metric) == baselines.scale(metric)
+
+    # The restored estimators carry on exactly where the saved ones stopped
+    frame = _frame(rng, 20)
+    baselines.update(frame)
+    restored.update(frame)
+    for metric in ["memory_usage", "network_packets"]:
+        assert restored.estimators[metric].to_dict() == baselines.estimators[metric].to_dict()
+
+
+def test_load_ignores_missing_corrupt_and_other_quantile(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    assert Baselines.load(path, metrics=["memory_usage"]).estimators["memory_usage"].count == 0
+
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert Baselines.load(path, metrics=["memory_usage"]).estimators["memory_usage"].count == 0
+
+    saved = Baselines(metrics=["memory_usage"], quantile=0.9)
+    saved.update(pd.DataFrame({"memory_usage": np.arange(10.0)}))
+    saved.save(path)
+    other = Baselines.load(path, metrics=["memory_usage"], quantile=0.95)
+    assert other.estimators["memory_usage"].count == 0
+
+
+def test_scale_waits_for_warmup():
+    baselines = Baselines(metrics=["memory_usage"], sample_size=1000, warmup=100)
+    baselines.update(pd.DataFrame({"memory_usage": np.arange(1.0, 51.0)}))
+    assert baselines.scale("memory_usage") is None
+    baselines.update(pd.DataFrame({"memory_usage": np.arange(51.0, 101.0)}))
+    assert baselines.scale("memory_usage") == pytest.approx(np.quantile(np.arange(1.0, 101.0),
+                                                                        baselines.quantile), rel=0.1)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.batch_score import read_chunks, score_file, scored_chunks
+from src.config import FEATURE_COLS
+from src.scoring import export_raw_forest, load_engine
+
+
+def _features(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.gamma(2.0, 20.0, size=(n, len(FEATURE_COLS))), columns=FEATURE_COLS)
+
+
+@pytest.fixture(scope="module")
+def forest_path(tmp_path_factory):
+    X = _features(2000, 0)
+    y = (X["cpu_usage"] + 0.1 * X["memory_usage"] > 50).astype(np.int64)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0)
+    model.fit(scaler.transform(X), y)
+    path = str(tmp_path_factory.mktemp("model") / "forest.forest")
+    export_raw_forest(model, scaler, path, FEATURE_COLS)
+    return path
+
+
+def _chunks():
+    """Uneven chunks, so workers finish them out of order, tagged with their input position"""
+    start = 0
+    for i, size in enumerate([5000, 10, 3000, 1, 700, 2500, 40, 900]):
+        chunk = _features(size, i + 1)
+        chunk.insert(0, "row", np.arange(start, start + size))
+        start += size
+        yield chunk
+
+
+def test_workers_preserve_input_order(forest_path):
+    stats = {}
+    chunks = list(scored_chunks(_chunks(), workers=3, raw_forest_path=forest_path, stats=stats))
+    out = pd.concat(chunks, ignore_index=True)
+
+    assert [len(chunk) for chunk in chunks] == [5000, 10, 3000, 1, 700, 2500, 40, 900]
+    assert out["row"].tolist() == list(range(len(out)))
+
+    engine = load_engine(forest_path)
+    labels, proba = engine.predict(out[FEATURE_COLS].to_numpy(np.float32))
+    np.testing.assert_array_equal(out["prediction"].to_numpy(), labels)
+    np.testing.assert_array_equal(out["threat_probability"].to_numpy(), proba)
+    assert stats == {"rows": len(out), "suspicious": int((labels == 1).sum())}
+
+
+def test_single_worker_matches_pool(forest_path):
+    single = pd.concat(scored_chunks(_chunks(), workers=1, raw_forest_path=forest_path))
+    pooled = pd.concat(scored_chunks(_chunks(), workers=2, raw_forest_path=forest_path))
+    pd.testing.assert_frame_equal(single, pooled)
+
+
+@pytest.mark.parametrize("suffix", ["csv", "csv.gz", "parquet"])
+def test_score_file_round_trip(tmp_path, forest_path, suffix):
+    source = pd.concat(_chunks(), ignore_index=True)
+    input_path = str(tmp_path / f"in.{suffix}")
+    if suffix == "parquet":
+        source.to_parquet(input_path)
+    else:
+        source.to_csv(input_path, index=False)
+
+    output_path = str(tmp_path / f"out.{suffix}")
+    stats = score_file(input_path, output_path, chunk_rows=1000, workers=2,
+                       raw_forest_path=forest_path, verbose=False)
+    scored = pd.concat(read_chunks(output_path), ignore_index=True)
+    assert stats["rows"] == len(source)
+    assert scored["row"].tolist() == source["row"].tolist()
+    assert {"prediction", "threat_probability"} <= set(scored.columns)
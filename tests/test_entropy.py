@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+
+from src import entropy
+from src.entropy import (NEUTRAL_ENTROPY, EntropyCache, EntropyProbe, _stat_key, byte_entropy,
+                         file_entropy)
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def test_entropy_values(tmp_path):
+    assert byte_entropy(np.zeros(100, dtype=np.uint8)) == 0.0
+    assert byte_entropy(np.arange(256, dtype=np.uint8)) == pytest.approx(8.0)
+    assert file_entropy(_write(tmp_path / "empty", b"")) == 0.0
+    assert file_entropy(_write(tmp_path / "ab", b"ab" * 500)) == pytest.approx(1.0)
+
+    # Files above max_bytes are sampled in blocks
+    data = np.random.default_rng(0).integers(0, 256, 1 << 20, dtype=np.uint8).tobytes()
+    path = _write(tmp_path / "random", data)
+    assert file_entropy(path, max_bytes=64 * 1024) == pytest.approx(8.0, abs=0.01)
+
+
+def test_stat_key_follows_content_not_path(tmp_path):
+    path = _write(tmp_path / "bin", b"\x00" * 100)
+    key = _stat_key(os.stat(path))
+    os.link(path, tmp_path / "hardlink")
+    assert _stat_key(os.stat(tmp_path / "hardlink")) == key
+
+    st = os.stat(path)
+    _write(path, b"\x01" * 200)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    changed = _stat_key(os.stat(path))
+    assert changed[:2] == key[:2] and changed != key
+
+
+def test_lru_eviction():
+    cache = EntropyCache(capacity=2)
+    cache.put((1, 1, 0, 10), 1.0)
+    cache.put((1, 2, 0, 10), 2.0)
+    assert cache.get((1, 1, 0, 10)) == 1.0  # now most recently used
+    cache.put((1, 3, 0, 10), 3.0)
+
+    assert len(cache) == 2
+    assert cache.get((1, 2, 0, 10)) is None
+    assert cache.get((1, 1, 0, 10)) == 1.0 and cache.get((1, 3, 0, 10)) == 3.0
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "entropy.json")
+    cache = EntropyCache(capacity=4)
+    for i in range(4):
+        cache.put((1, i, 1_700_000_000_000_000_000 + i, 4096), float(i))
+    cache.get((1, 0, 1_700_000_000_000_000_000, 4096))
+    cache.save(path)
+    assert not cache.dirty
+
+    restored = EntropyCache.load(path, capacity=4)
+    assert list(restored._entries.items()) == list(cache._entries.items())
+
+    # A smaller capacity keeps the most recently used entries
+    smaller = EntropyCache.load(path, capacity=2)
+    assert list(smaller._entries) == [(1, 3, 1_700_000_000_000_000_003, 4096),
+                                      (1, 0, 1_700_000_000_000_000_000, 4096)]
+
+
+def test_load_missing_or_corrupt(tmp_path):
+    assert len(EntropyCache.load(str(tmp_path / "missing.json"))) == 0
+    path = _write(tmp_path / "corrupt.json", b"[[1, 2")
+    assert len(EntropyCache.load(path)) == 0
+
+
+@pytest.fixture
+def binaries(tmp_path, monkeypatch):
+    exes = {}
+    monkeypatch.setattr(entropy, "_exe_path", lambda pid: exes[pid])
+    return exes
+
+
+def test_probe_hashes_each_binary_once(tmp_path, binaries):
+    shared = _write(tmp_path / "shared", bytes(range(256)) * 4)
+    binaries.update({1: shared, 2: shared, 3: str(tmp_path / "missing")})
+    probe = EntropyProbe(cache=EntropyCache(), budget=10, path=str(tmp_path / "cache.json"))
+
+    out = probe.collect([1, 2, 3], [10.0, 20.0, 30.0], ["a", "a", "b"])
+    assert out.tolist() == [8.0, 8.0, NEUTRAL_ENTROPY]
+    assert len(probe.cache) == 1 and probe.cache.hits == 1
+
+    # Known processes are not looked up again until they exec another binary
+    binaries[1] = _write(tmp_path / "other", b"\x00" * 64)
+    assert probe.collect([1, 2], [10.0, 20.0], ["a", "a"]).tolist() == [8.0, 8.0]
+    assert probe.collect([1, 2], [10.0, 20.0], ["exec", "a"]).tolist() == [0.0, 8.0]
+
+
+def test_probe_defers_hashing_past_budget(tmp_path, binaries):
+    binaries[1] = _write(tmp_path / "bin", bytes(range(256)))
+    probe = EntropyProbe(cache=EntropyCache(), budget=-1, path=str(tmp_path / "cache.json"))
+    assert probe.collect([1], [10.0], ["a"]).tolist() == [NEUTRAL_ENTROPY]
+    assert probe.pending == 1
+
+    probe.budget = 10
+    assert probe.collect([1], [10.0], ["a"]).tolist() == [8.0]
+    assert probe.pending == 0
@@ -0,0 +1,57 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from src import export
+from src.config import FEATURE_COLS
+from src.history import HISTORY_COLS, HistoryStore
+
+NOW = 1_000_000 * 3600
+
+
+def _snapshot(hosts=("web-1", "web-2")):
+    rows = []
+    for i, host in enumerate(hosts):
+        row = {"host": host, "timestamp": "12:00:00", "pid": 10 + i, "create_time": 100.0 + i,
+               "process_name": f"proc{i}", "num_threads": 4, "cpu_usage_mean_12": 1.5}
+        row.update({col: 1.0 for col in FEATURE_COLS})
+        row.update({"prediction": 0, "threat_probability": 0.1, "threat_score": 10.0})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def test_snapshot_rows_keep_every_snapshot_column():
+    df = _snapshot()
+    rows = export.snapshot_rows(df, ts=NOW)
+
+    assert list(rows.columns[:len(HISTORY_COLS)]) == HISTORY_COLS
+    assert set(df.columns) <= set(rows.columns)
+    assert rows["host"].tolist() == ["web-1", "web-2"]
+    assert (rows["ts"] == NOW).all() and (rows["resolution"] == 0).all() and (rows["samples"] == 1).all()
+    assert (rows["cpu_usage_max"] == rows["cpu_usage"]).all()
+
+
+@pytest.mark.parametrize("fmt", list(export.FORMATS))
+def test_snapshot_export_round_trip(fmt):
+    buffer = export.export_to_buffer(export.snapshot_frames(_snapshot(), chunksize=1, ts=NOW), fmt)
+    if fmt == "parquet":
+        back = pd.read_parquet(buffer)
+    else:
+        back = pd.read_csv(io.BytesIO(gzip.decompress(buffer.read())) if fmt == "csv.gz" else buffer)
+    assert len(back) == 2
+    assert list(back.columns) == list(export.snapshot_rows(_snapshot()).columns)
+
+
+def test_history_count_and_export(tmp_path):
+    path = str(tmp_path / "history.db")
+    store = HistoryStore(path)
+    for i in range(3):
+        store.append(_snapshot(), ts=NOW - 100 + i)
+    store.close()
+
+    assert export.count_history(NOW - 200, NOW, path=path) == 6
+    output = str(tmp_path / "history.csv")
+    assert export.export_history(output, NOW - 200, NOW, fmt="csv", path=path, chunksize=4) == 6
+    assert list(pd.read_csv(output).columns) == HISTORY_COLS
@@ -0,0 +1,110 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from src import aggregator
+from src.agent import decode_batch, encode_batch, send_batch
+from src.aggregator import Aggregator, FleetServer, FleetState
+from src.alerts import AlertEngine
+from src.config import STALE_AFTER_INTERVALS
+
+TOKEN = "s3cret"
+
+
+def _batch(n=3):
+    return pd.DataFrame({"pid": list(range(1, n + 1)), "create_time": [100.5] * n,
+                         "process_name": [f"proc{i}" for i in range(n)], "cpu_usage": [1.5] * n})
+
+
+@pytest.fixture
+def server():
+    fleet = FleetState()
+    server = FleetServer(("127.0.0.1", 0), fleet, token=TOKEN)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _status(url, body, token):
+    try:
+        send_batch(url, body, token=token)
+    except urllib.error.HTTPError as e:
+        return e.code
+    return 204
+
+
+def test_batch_round_trip():
+    df = _batch()
+    back, meta = decode_batch(encode_batch(df, "web-1", 7, created_at=123.25))
+    pd.testing.assert_frame_equal(back, df)
+    assert meta == {"host": "web-1", "snapshot_id": 7, "created_at": 123.25}
+
+
+def test_ingest_checks_the_token(server):
+    server, url = server
+    body = encode_batch(_batch(), "web-1", 1)
+
+    assert _status(url, body, "wrong") == 403
+    assert server.fleet.status() == {}
+    assert _status(url, body, TOKEN) == 204
+    assert server.fleet.status()["web-1"]["processes"] == 3
+    assert server.fleet.batches == 1 and server.fleet.bytes == len(body)
+
+
+def test_ingest_rejects_oversize_and_garbage(server, monkeypatch):
+    server, url = server
+    body = encode_batch(_batch(50), "web-1", 1)
+    monkeypatch.setattr(aggregator, "MAX_BATCH_BYTES", len(body) - 1)
+
+    assert _status(url, body, TOKEN) == 413
+    assert _status(url, b"not arrow", TOKEN) == 400
+    assert server.fleet.batches == 0
+
+
+def test_status_lists_hosts(server):
+    server, url = server
+    send_batch(url, encode_batch(_batch(), "web-2", 4), token=TOKEN)
+    with urllib.request.urlopen(f"{url}/status") as response:
+        assert b"web-2" in response.read()
+
+
+def _fake_scoring(df, engine, cache=None, baselines=None):
+    return df.assign(prediction=0, threat_probability=0.1, threat_score=10.0)
+
+
+def test_stale_host_is_dropped(monkeypatch):
+    monkeypatch.setattr(aggregator, "predict_threats", _fake_scoring)
+    fleet = FleetState()
+    agg = Aggregator(engine=None, fleet=fleet, interval=5, baselines=object())
+    stale_after = 5 * STALE_AFTER_INTERVALS
+
+    fleet.ingest(_batch(), {"host": "web-1", "snapshot_id": 1}, 100)
+    fleet.ingest(_batch(2), {"host": "web-2", "snapshot_id": 1}, 100)
+    df = agg.build_snapshot(now=1000.0)
+    assert sorted(df["host"].unique()) == ["web-1", "web-2"] and len(df) == 5
+
+    # Only web-2 keeps reporting
+    fleet.ingest(_batch(2), {"host": "web-2", "snapshot_id": 2}, 100)
+    agg.build_snapshot(now=1000.0 + stale_after / 2)
+    assert agg.hosts == ["web-1", "web-2"]
+    fleet.ingest(_batch(2), {"host": "web-2", "snapshot_id": 3}, 100)
+    df = agg.build_snapshot(now=1000.0 + stale_after + 1)
+    assert agg.hosts == ["web-2"] and df["host"].unique().tolist() == ["web-2"]
+    assert list(fleet.status()) == ["web-2"]
+
+
+def test_fleet_alerts_are_per_host():
+    engine = AlertEngine(raise_at=0.8, clear_at=0.5)
+    df = pd.DataFrame({"host": ["web-1", "web-2"], "pid": [42, 42], "process_name": ["x", "x"],
+                       "create_time": [100.0, 100.0], "threat_probability": [0.9, 0.9],
+                       "threat_score": [90.0, 90.0]})
+    events = engine.process(df)
+    assert sorted(event["host"] for event in events) == ["web-1", "web-2"]
+
+    events = engine.process(df[df["host"] == "web-2"])
+    assert [(event["event"], event["host"]) for event in events] == [("cleared", "web-1")]
+    engine.close()
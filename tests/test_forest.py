@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.forest import FlatForest
+
+N_FEATURES = 7
+
+
+def _data(n, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, N_FEATURES)) * [5, 50, 500, 1000, 20, 1, 2] + [10, 30, 800, 200, 5, 0, 4]
+    y = np.where(X[:, 1] + 0.1 * X[:, 2] + rng.normal(scale=20, size=n) > 110, "Suspicious", "Normal")
+    return X, y
+
+
+def _probe_rows(X, seed=1):
+    """Training-like rows, rows sitting exactly on split thresholds and rows far outside the training range"""
+    rng = np.random.default_rng(seed)
+    lo, hi = X.min(axis=0), X.max(axis=0)
+    span = hi - lo
+    rows = [
+        X[:200],
+        rng.uniform(lo - 10 * span, hi + 10 * span, size=(200, N_FEATURES)),
+        np.full((1, N_FEATURES), -1e30),
+        np.full((1, N_FEATURES), 1e30),
+        np.zeros((1, N_FEATURES)),
+    ]
+    return np.concatenate(rows).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    X, y = _data(2000, 0)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=25, max_depth=5, random_state=0)
+    model.fit(scaler.transform(X), y)
+    return model, scaler, X
+
+
+def _threshold_rows(model):
+    """Rows whose features sit on the split thresholds, in scaled space"""
+    thresholds = np.concatenate([tree.tree_.threshold[tree.tree_.children_left != -1]
+                                 for tree in model.estimators_])
+    return np.tile(thresholds[:, None], (1, N_FEATURES)).astype(np.float32)
+
+
+def test_matches_sklearn_on_scaled_features(fitted):
+    model, scaler, X = fitted
+    forest = FlatForest.from_sklearn(model)
+    rows = np.concatenate([_probe_rows(scaler.transform(X)), _threshold_rows(model)])
+
+    labels, proba = forest.predict(rows)
+    np.testing.assert_allclose(proba, model.predict_proba(rows), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(labels, model.predict(rows))
+
+
+def test_walk_fallback_matches_sklearn(fitted):
+    model, scaler, X = fitted
+    forest = FlatForest.from_sklearn(model)
+    forest._compiled = False  # as for a forest with more than 64 leaves per tree
+    rows = _probe_rows(scaler.transform(X))
+
+    assert forest.compile() is None
+    np.testing.assert_allclose(forest.predict_proba(rows), model.predict_proba(rows), rtol=0, atol=1e-12)
+
+
+def test_deep_trees_fall_back_to_the_walk():
+    X, y = _data(2000, 2)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    forest = FlatForest.from_sklearn(model)
+    rows = _probe_rows(X)
+
+    assert forest.compile() is None
+    np.testing.assert_array_equal(forest.predict(rows)[0], model.predict(rows))
+
+
+def test_folded_scaler_matches_scaled_model(fitted):
+    model, scaler, X = fitted
+    forest = FlatForest.from_sklearn(model).fold_scaler(scaler)
+    rows = _probe_rows(X)
+
+    labels, proba = forest.predict(rows)
+    expected = model.predict_proba(scaler.transform(rows))
+    np.testing.assert_allclose(proba, expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(labels, model.classes_.take(np.argmax(expected, axis=1)))
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load_round_trip(fitted, tmp_path, compiled, mmap):
+    model, scaler, X = fitted
+    forest = FlatForest.from_sklearn(model).fold_scaler(scaler)
+    path = tmp_path / "model.forest"
+    names = [f"f{i}" for i in range(N_FEATURES)]
+    forest.save(str(path), feature_names=names, compiled=compiled)
+
+    loaded, loaded_names = FlatForest.load(str(path), mmap=mmap)
+    rows = _probe_rows(X)
+    assert loaded_names == names
+    assert (loaded._compiled is not None) == compiled
+    np.testing.assert_array_equal(loaded.predict_proba(rows), forest.predict_proba(rows))
+
+
+def test_tables_are_not_stored_by_default(fitted, tmp_path):
+    model, _, _ = fitted
+    forest = FlatForest.from_sklearn(model)
+    forest.save(str(tmp_path / "nodes.forest"))
+    forest.save(str(tmp_path / "tables.forest"), compiled=True)
+    assert (tmp_path / "nodes.forest").stat().st_size < (tmp_path / "tables.forest").stat().st_size
@@ -0,0 +1,140 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.config import FEATURE_COLS
+from src.history import HISTORY_COLS, RAW_COLS, RAW_TABLE, ROLLUP_METRICS, ROLLUP_TABLES, HistoryStore
+
+HOUR = 3600
+NOW = 1_000_000 * HOUR  # on a whole hour, so bucket edges are easy to reason about
+
+
+def _snapshot(pids=(10, 20), cpu=1.0, proba=0.1):
+    rows = []
+    for pid in pids:
+        row = {"pid": pid, "create_time": 100.0 + pid, "process_name": f"proc{pid}"}
+        row.update({col: 0.0 for col in FEATURE_COLS})
+        row.update({"cpu_usage": cpu, "prediction": int(proba >= 0.5), "threat_probability": proba,
+                    "threat_score": proba * 100})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"), retention_raw=6 * HOUR,
+                         retention_1m=7 * 24 * HOUR, retention_1h=90 * 24 * HOUR)
+    yield store
+    store.close()
+
+
+def _count(store, table):
+    return store._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_raw_query(store):
+    store.append(_snapshot(cpu=2.0), ts=NOW - 30)
+    store.append(_snapshot(cpu=4.0), ts=NOW - 20)
+
+    df = store.query(NOW - 60, NOW)
+    assert list(df.columns) == HISTORY_COLS
+    assert len(df) == 4
+    assert (df["resolution"] == 0).all() and (df["samples"] == 1).all()
+    assert df["cpu_usage"].tolist() == [2.0, 2.0, 4.0, 4.0]
+    assert (df["cpu_usage_max"] == df["cpu_usage"]).all()
+    assert store.query(NOW - 60, NOW, pid=20)["pid"].tolist() == [20, 20]
+
+
+def test_compact_rolls_up_by_age(store):
+    store.append(_snapshot(cpu=1.0), ts=NOW - 20 * 24 * HOUR)        # -> 1 hour
+    store.append(_snapshot(cpu=3.0), ts=NOW - 20 * 24 * HOUR + 60)   # same hour
+    store.append(_snapshot(cpu=5.0), ts=NOW - 10 * HOUR)             # -> 1 minute
+    store.append(_snapshot(cpu=7.0, proba=0.9), ts=NOW - 10 * HOUR + 10)  # same minute
+    store.append(_snapshot(cpu=9.0), ts=NOW - 60)                    # stays raw
+
+    store.compact(now=NOW)
+    assert _count(store, RAW_TABLE) == 2
+    assert _count(store, ROLLUP_TABLES[60]) == 2
+    assert _count(store, ROLLUP_TABLES[3600]) == 2
+
+    minute = store.query(NOW - 11 * HOUR, NOW - 9 * HOUR, pid=10, resolution=60).iloc[0]
+    assert minute["samples"] == 2
+    assert minute["cpu_usage"] == 6.0 and minute["cpu_usage_max"] == 7.0
+    assert minute["prediction"] == 1
+    assert minute["create_time"] == 110.0
+    assert pd.isna(minute["file_access_count"])
+
+    hour = store.query(NOW - 21 * 24 * HOUR, NOW - 19 * 24 * HOUR, pid=10, resolution=3600).iloc[0]
+    assert hour["samples"] == 2 and hour["cpu_usage"] == 2.0
+
+
+def test_reused_pid_is_a_separate_process(store):
+    store.append(_snapshot(pids=(10,), cpu=1.0), ts=NOW - 10 * HOUR)
+    store.append(_snapshot(pids=(10,), cpu=9.0).assign(create_time=500.0), ts=NOW - 10 * HOUR)
+    assert len(store.query(NOW - 11 * HOUR, NOW, resolution=0)) == 2
+
+    store.compact(now=NOW)
+    minutes = store.query(NOW - 11 * HOUR, NOW, resolution=60)
+    assert minutes["create_time"].tolist() == [110.0, 500.0]
+    assert minutes["cpu_usage"].tolist() == [1.0, 9.0]
+
+
+def test_version_1_database_is_migrated(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    metrics = ", ".join(f"{m}_avg REAL, {m}_max REAL" for m in ROLLUP_METRICS)
+    conn.execute(f"CREATE TABLE samples ({', '.join(RAW_COLS)}, PRIMARY KEY (ts, pid)) WITHOUT ROWID")
+    conn.execute("CREATE INDEX samples_pid_ts ON samples (pid, ts)")
+    for table in ROLLUP_TABLES.values():
+        conn.execute(f"CREATE TABLE {table} (bucket INTEGER, pid INTEGER, process_name TEXT, n INTEGER, "
+                     f"suspicious INTEGER, {metrics}, PRIMARY KEY (bucket, pid)) WITHOUT ROWID")
+    conn.execute(f"INSERT INTO samples (ts, pid, create_time, cpu_usage) VALUES ({NOW - 60}, 10, 110.0, 2.0)")
+    conn.execute(f"INSERT INTO samples_1m (bucket, pid, process_name, n, suspicious, cpu_usage_avg) "
+                 f"VALUES ({NOW - 10 * HOUR}, 10, 'proc10', 3, 0, 4.0)")
+    conn.commit()
+    conn.close()
+
+    store = HistoryStore(path)
+    df = store.query(NOW - 24 * HOUR, NOW)
+    assert df["resolution"].tolist() == [60, 0]
+    assert df["create_time"].tolist() == [0.0, 110.0] and df["cpu_usage"].tolist() == [4.0, 2.0]
+    store.append(_snapshot(pids=(10,)).assign(create_time=500.0), ts=NOW - 60)
+    assert len(store.query(NOW - 120, NOW)) == 2
+    store.close()
+    assert HistoryStore(path).count(NOW - 24 * HOUR, NOW) == 3
+
+
+def test_compact_expires_past_retention(store):
+    store.append(_snapshot(), ts=NOW - 100 * 24 * HOUR)
+    store.compact(now=NOW)
+    assert _count(store, RAW_TABLE) == 0
+    assert _count(store, ROLLUP_TABLES[60]) == 0
+    assert _count(store, ROLLUP_TABLES[3600]) == 0
+
+
+def test_auto_query_spans_every_tier(store):
+    for age in (20 * HOUR, 10 * HOUR, HOUR, 60):
+        store.append(_snapshot(pids=(10,)), ts=NOW - age)
+    store.compact(now=NOW)
+
+    df = store.query(NOW - 24 * HOUR, NOW)
+    assert df["resolution"].tolist() == [60, 60, 0, 0]
+    assert df["ts"].is_monotonic_increasing
+    # Pinning a resolution reads one table only
+    assert len(store.query(NOW - 24 * HOUR, NOW, resolution=0)) == 2
+
+
+def test_rollup_bucket_straddling_start_is_included(store):
+    store.append(_snapshot(pids=(10,)), ts=NOW - 10 * HOUR + 5)
+    store.compact(now=NOW)
+    df = store.query(NOW - 10 * HOUR + 30, NOW)
+    assert len(df) == 1 and df["ts"].iloc[0] == NOW - 10 * HOUR
+
+
+def test_iter_query_chunks(store):
+    for i in range(5):
+        store.append(_snapshot(), ts=NOW - 100 + i)
+    chunks = list(store.iter_query(NOW - 200, NOW, chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    assert all(list(chunk.columns) == HISTORY_COLS for chunk in chunks)
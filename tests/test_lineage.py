@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+from src.lineage import LINEAGE_COLS, PidIndex
+
+
+class FakeProc:
+    """Stands in for /proc: pid -> parent pid, changed by the tests between ticks"""
+
+    def __init__(self, parents):
+        self.parents = dict(parents)
+
+    def read(self, pid):
+        if pid not in self.parents:
+            raise OSError(f"no such process {pid}")
+        return self.parents[pid], f"/usr/bin/proc{pid}"
+
+
+@pytest.fixture
+def proc():
+    return FakeProc({1: 0, 10: 1, 20: 10, 30: 20, 40: 10})
+
+
+@pytest.fixture
+def index(proc):
+    index = PidIndex(spawn_window=60)
+    index._read = proc.read
+    return index
+
+
+def _tick(index, proc):
+    pids = sorted(proc.parents)
+    index.update(pids, [100.0 + pid for pid in pids], [f"proc{pid}" for pid in pids])
+    return index.features(pids), pids
+
+
+def test_tree_features(index, proc):
+    features, pids = _tick(index, proc)
+    by_pid = {pid: {col: values[i] for col, values in features.items()} for i, pid in enumerate(pids)}
+
+    assert by_pid[1]["lineage_depth"] == 0
+    assert by_pid[30]["lineage_depth"] == 3
+    assert by_pid[30]["parent_pid"] == 20 and by_pid[30]["parent_name"] == "proc20"
+    assert by_pid[10]["child_count"] == 2
+    assert index.get(20) == (10, 120.0, "proc20", "/usr/bin/proc20")
+
+
+def test_first_tick_is_not_counted_as_spawns(index, proc):
+    _tick(index, proc)
+    assert index.spawn_rate(10) == 0.0
+
+    proc.parents.update({50: 10, 51: 10})
+    features, pids = _tick(index, proc)
+    assert features["spawn_rate"][pids.index(10)] == pytest.approx(2.0)
+    assert features["child_count"][pids.index(10)] == 4
+    assert index.added == 2
+
+
+def test_orphans_are_reparented(index, proc):
+    _tick(index, proc)
+    # 20 exits; the kernel hands 30 to init
+    del proc.parents[20]
+    proc.parents[30] = 1
+    features, pids = _tick(index, proc)
+
+    assert index.removed == 1
+    assert features["parent_pid"][pids.index(30)] == 1
+    assert features["lineage_depth"][pids.index(30)] == 1
+    assert features["child_count"][pids.index(10)] == 1
+
+
+def test_reused_pid_is_read_again(index, proc):
+    _tick(index, proc)
+    index.update([1, 10, 40], [101.0, 110.0, 999.0], ["proc1", "proc10", "other"])
+    assert index.get(40) == (10, 999.0, "other", "/usr/bin/proc40")
+    assert (index.added, index.removed) == (1, 3)
+
+
+def test_unreadable_process_is_a_root(index, proc):
+    index.update([1, 99], [101.0, 199.0], ["proc1", "gone"])
+    assert index.get(99)[0] == 0
+    assert index.depth(99) == 0
+
+
+def test_update_frame(index, proc):
+    df = pd.DataFrame({"pid": [1, 10], "create_time": [101.0, 110.0], "process_name": ["proc1", "proc10"]})
+    df = index.update_frame(df)
+    assert df["lineage_depth"].tolist() == [0, 1]
+    assert df["parent_name"].tolist() == ["", "proc1"]
+
+    empty = index.update_frame(pd.DataFrame(columns=["pid", "create_time", "process_name"]))
+    assert empty.empty and set(LINEAGE_COLS) <= set(empty.columns)
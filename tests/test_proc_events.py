@@ -0,0 +1,161 @@
+import os
+import shutil
+
+import pytest
+
+from src.proc_events import EXEC, EXIT, START, ProcessWatcher
+
+BOOT_TIME = 1_700_000_000
+
+
+class ScriptedSource:
+    """Event source that replays one batch of events per poll, then stops the watcher"""
+
+    name = "scripted"
+
+    def __init__(self):
+        self.batches = []
+        self.watcher = None
+
+    def poll(self):
+        if not self.batches:
+            self.watcher._running = False
+            return []
+        return self.batches.pop(0)
+
+    def close(self):
+        pass
+
+
+class FakeProc:
+    def __init__(self, root):
+        self.root = str(root)
+        with open(os.path.join(self.root, "stat"), "w") as f:
+            f.write(f"cpu  100 0 100 1000 0 0 0 0 0 0\nbtime {BOOT_TIME}\n")
+
+    def start(self, pid, starttime, name="short", state="S", threads=1):
+        d = os.path.join(self.root, str(pid))
+        shutil.rmtree(d, ignore_errors=True)
+        os.makedirs(os.path.join(d, "task"))
+        fields = [state, "1"] + ["0"] * 9 + ["5", "5"] + ["0"] * 4 + [str(threads), "0", str(starttime)]
+        fields += ["0"] * 30
+        with open(os.path.join(d, "stat"), "w") as f:
+            f.write(f"{pid} ({name}) {' '.join(fields)}\n")
+        with open(os.path.join(d, "statm"), "w") as f:
+            f.write("2441 256 100 10 0 200 0\n")
+        for tid in range(pid, pid + threads):
+            os.mkdir(os.path.join(d, "task", str(tid)))
+
+    def leader_exits(self, pid):
+        """The leader thread is gone, the other threads still run"""
+        path = os.path.join(self.root, str(pid), "stat")
+        with open(path) as f:
+            stat = f.read()
+        with open(path, "w") as f:
+            f.write(stat.replace(") S ", ") Z ", 1))
+        os.rmdir(os.path.join(self.root, str(pid), "task", str(pid)))
+
+    def exit(self, pid):
+        shutil.rmtree(os.path.join(self.root, str(pid)))
+
+    def create_time(self, starttime):
+        return BOOT_TIME + starttime / os.sysconf("SC_CLK_TCK")
+
+
+@pytest.fixture
+def proc(tmp_path):
+    return FakeProc(tmp_path)
+
+
+@pytest.fixture
+def watcher(proc):
+    source = ScriptedSource()
+    watcher = ProcessWatcher(source, proc_root=proc.root)
+    source.watcher = watcher
+    return watcher
+
+
+def _run(watcher, *batches):
+    watcher.source.batches = list(batches)
+    watcher._running = True
+    watcher._run()
+
+
+def test_drain_sorts_seen_exited_and_running(watcher, proc):
+    for pid in (100, 101, 102):
+        proc.start(pid, starttime=1000 + pid)
+    _run(watcher, [(START, 100), (START, 101), (START, 102)])
+    proc.exit(101)
+    _run(watcher, [(EXIT, 101)])
+
+    seen = [(100, proc.create_time(1100))]
+    exited = watcher.drain(seen)
+    assert [record["pid"] for record in exited] == [101]
+    assert exited[0]["process_name"] == "short"
+    # 102 is still running: pending until a tick sees it or it exits
+    assert watcher.live_pids() == {100, 102}
+    assert watcher.drain() == []
+    proc.exit(102)
+    _run(watcher, [(EXIT, 102)])
+    assert [record["pid"] for record in watcher.drain()] == [102]
+    assert watcher.drain() == []
+    assert (watcher.started, watcher.exited) == (3, 2)
+
+
+def test_leader_exit_keeps_a_multithreaded_process_live(watcher, proc):
+    proc.start(200, starttime=5000, threads=3)
+    _run(watcher, [(START, 200)])
+    proc.leader_exits(200)
+    _run(watcher, [(EXIT, 200)])
+
+    assert 200 in watcher.live_pids()
+    assert watcher.drain() == []
+    assert watcher.exited == 0
+
+    # The last threads exit: the process is a zombie with no threads left
+    for tid in (201, 202):
+        os.rmdir(os.path.join(proc.root, "200", "task", str(tid)))
+    os.mkdir(os.path.join(proc.root, "200", "task", "200"))
+    _run(watcher, [])
+    assert 200 not in watcher.live_pids()
+    assert [record["pid"] for record in watcher.drain()] == [200]
+
+
+def test_reused_pid_keeps_both_records(watcher, proc):
+    proc.start(300, starttime=7000, name="first")
+    _run(watcher, [(START, 300)])
+    proc.exit(300)
+    proc.start(300, starttime=7100, name="second")
+    # The exit and the new start arrive in the same batch, before any drain
+    _run(watcher, [(EXIT, 300), (START, 300)])
+
+    exited = watcher.drain()
+    assert [(record["pid"], record["process_name"]) for record in exited] == [(300, "first")]
+    assert exited[0]["create_time"] == proc.create_time(7000)
+    assert 300 in watcher.live_pids()
+    proc.exit(300)
+    _run(watcher, [(EXIT, 300)])
+    assert [record["process_name"] for record in watcher.drain()] == ["second"]
+
+
+def test_missed_exit_of_a_reused_pid(watcher, proc):
+    """The diff source can miss an exit when the PID comes back within one interval"""
+    proc.start(400, starttime=9000, name="first")
+    _run(watcher, [(START, 400)])
+    proc.start(400, starttime=9050, name="second")
+    _run(watcher, [(EXEC, 400)])
+    assert [record["process_name"] for record in watcher.drain()] == ["first"]
+
+
+def test_pending_is_bounded(proc):
+    source = ScriptedSource()
+    watcher = ProcessWatcher(source, proc_root=proc.root, max_pending=2)
+    source.watcher = watcher
+    for pid in (500, 501, 502):
+        proc.start(pid, starttime=pid)
+    _run(watcher, [(START, 500), (START, 501), (START, 502)])
+    for pid in (500, 501, 502):
+        proc.exit(pid)
+    _run(watcher, [(EXIT, 500), (EXIT, 501), (EXIT, 502)])
+    assert [record["pid"] for record in watcher.drain()] == [501, 502]
+    assert watcher.dropped == 1
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import rolling
+from src.rolling import ROLLING_STATS, RollingWindows
+
+METRICS = ["cpu_usage", "memory_usage"]
+WINDOWS = [3, 5]
+
+
+def _expected(history, w):
+    """mean, max, var, slope of the last `w` samples, computed directly"""
+    window = np.asarray(history[-w:], dtype=np.float64)
+    slope = np.polyfit(np.arange(len(window)), window, 1)[0] if len(window) > 1 else np.zeros(window.shape[1])
+    return np.stack([window.mean(axis=0), window.max(axis=0), window.var(axis=0), slope], axis=1)
+
+
+def _stats(out, windows=WINDOWS, metrics=METRICS):
+    """Split one row of update() output into {window: (n_metrics, 4)}"""
+    per_window = len(metrics) * len(ROLLING_STATS)
+    return {w: out[i * per_window:(i + 1) * per_window].reshape(len(metrics), len(ROLLING_STATS))
+            for i, w in enumerate(windows)}
+
+
+def test_matches_direct_computation():
+    windows = RollingWindows(METRICS, WINDOWS, capacity=2)
+    rng = np.random.default_rng(0)
+    history = {key: [] for key in ["a", "b", "c"]}
+    for _ in range(12):
+        values = rng.random((3, len(METRICS))) * 100
+        out = windows.update(list(history), values)
+        for i, key in enumerate(history):
+            history[key].append(values[i])
+            for w, got in _stats(out[i]).items():
+                np.testing.assert_allclose(got, _expected(history[key], w), atol=1e-9)
+    assert len(windows) == 3
+
+
+def test_new_key_starts_empty():
+    windows = RollingWindows(METRICS, WINDOWS)
+    for _ in range(6):
+        windows.update([("p", 1.0)], [[50.0, 50.0]])
+    # The process exits and its slot is reused by another one
+    windows.update([("q", 2.0)], [[1.0, 2.0]])
+    out = windows.update([("p", 3.0)], [[4.0, 8.0]])
+    for w, got in _stats(out[0]).items():
+        np.testing.assert_allclose(got, _expected([[4.0, 8.0]], w))
+
+
+def test_resync_keeps_sums_exact(monkeypatch):
+    monkeypatch.setattr(rolling, "RESYNC_EVERY", 4)
+    windows = RollingWindows(METRICS, WINDOWS)
+    history = []
+    for i in range(11):
+        values = [[100.0 + i * 0.1, float(i % 3)]]
+        history.append(values[0])
+        out = windows.update(["p"], values)
+    for w, got in _stats(out[0]).items():
+        np.testing.assert_allclose(got, _expected(history, w), rtol=1e-9, atol=1e-6)
+
+
+def test_update_frame_adds_columns():
+    windows = RollingWindows(METRICS, WINDOWS)
+    df = pd.DataFrame({"pid": [1, 2], "create_time": [10.0, 20.0],
+                       "cpu_usage": [1.0, 2.0], "memory_usage": [3.0, 4.0]})
+    df = windows.update_frame(df)
+    assert set(windows.columns) <= set(df.columns)
+    assert df["cpu_usage_mean_3"].tolist() == [1.0, 2.0]
+
+    empty = windows.update_frame(pd.DataFrame(columns=df.columns[:4]))
+    assert empty.empty and set(windows.columns) <= set(empty.columns)
+
+
+@pytest.mark.parametrize("w", WINDOWS)
+def test_constant_series_has_no_variance_or_slope(w):
+    windows = RollingWindows(METRICS, WINDOWS)
+    for _ in range(8):
+        out = windows.update(["p"], [[7.0, 7.0]])
+    mean, peak, var, slope = _stats(out[0])[w][0]
+    assert (mean, peak) == (7.0, 7.0)
+    assert var == pytest.approx(0.0, abs=1e-9) and slope == pytest.approx(0.0, abs=1e-9)
@@ -0,0 +1,162 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from src import scheduler as scheduler_module
+from src.procfs import ProcfsSampler
+from src.scheduler import FAST, NORMAL, SLOW, SamplingScheduler, load_backoff
+from src.snapshot import ProcessSnapshot
+
+WINDOW = 5
+OLD = time.time() - 3600
+
+
+@pytest.fixture(autouse=True)
+def idle_host(monkeypatch):
+    monkeypatch.setattr(scheduler_module.psutil, "getloadavg", lambda: (0.0, 0.0, 0.0))
+
+
+def _scheduler(**kwargs):
+    kwargs = {"normal_every": 3, "slow_every": 6, "hot_at": 0.8, "hold_ticks": 2, "fast_cv": 0.5,
+              "young_seconds": 60, "quiet_below": 0.1, "settle_ticks": 2, "old_seconds": 600,
+              "window": WINDOW, **kwargs}
+    return SamplingScheduler(**kwargs)
+
+
+def _frame(rows):
+    """rows: (pid, create_time, threat_probability[, cpu var, cpu mean])"""
+    rows = [row + (0.0, 1.0) if len(row) == 3 else row for row in rows]
+    return pd.DataFrame(rows, columns=["pid", "create_time", "threat_probability",
+                                       f"cpu_usage_var_{WINDOW}", f"cpu_usage_mean_{WINDOW}"])
+
+
+def _tick(s, df):
+    """One collector tick: returns (carried PIDs, due PIDs)"""
+    carried = s.carry()
+    due = s.due(df["pid"].tolist(), df["create_time"].tolist())
+    s.update(df)
+    return carried, due
+
+
+def _tier(s, pid, create_time):
+    return s._state[(pid, create_time)][0]
+
+
+def test_tiers():
+    s = _scheduler()
+    df = _frame([(1, OLD, 0.9),                # suspicious
+                 (2, OLD, 0.0, 100.0, 5.0),    # bursty: cv = 10 / 5
+                 (3, time.time(), 0.0),        # young
+                 (4, OLD, 0.0),                # idle and old
+                 (5, OLD, 0.3)])               # neither
+    for _ in range(3):
+        _tick(s, df)
+
+    assert [_tier(s, pid, ct) for pid, ct in zip(df["pid"], df["create_time"])] == \
+        [FAST, FAST, FAST, SLOW, NORMAL]
+    assert s.tier_counts() == {FAST: 3, NORMAL: 1, SLOW: 1}
+
+
+def test_suspicion_is_held_then_released():
+    s = _scheduler(hold_ticks=2)
+    _tick(s, _frame([(1, OLD, 0.9)]))
+    quiet = _frame([(1, OLD, 0.0)])
+    _tick(s, quiet)
+    assert _tier(s, 1, OLD) == FAST
+    for _ in range(4):
+        _tick(s, quiet)
+    assert _tier(s, 1, OLD) == SLOW
+
+
+def test_new_processes_are_due_and_reads_are_staggered():
+    s = _scheduler()
+    df = _frame([(pid, OLD, 0.3) for pid in range(6)])
+    carried, due = _tick(s, df)
+    assert carried == set() and due == list(range(6))
+
+    rounds = [_tick(s, df)[1] for _ in range(3)]
+    assert rounds == [[0, 3], [1, 4], [2, 5]]
+    assert s.last_due == 2
+
+    # A process that was not due last tick is carried forward this one
+    carried, due = _tick(s, df)
+    assert due == [0, 3] and carried == {1, 2, 4, 5}
+
+
+def test_reused_pid_is_due():
+    s = _scheduler()
+    _tick(s, _frame([(7, OLD, 0.3)]))
+    assert 7 in s.carry()
+    assert s.due([7], [OLD + 1]) == [7]
+
+
+def test_hot_process_skips_the_rest_of_its_cadence():
+    s = _scheduler(settle_ticks=1)
+    quiet = _frame([(1, OLD, 0.0)])
+    _tick(s, quiet)
+    _tick(s, quiet)
+    assert _tier(s, 1, OLD) == SLOW
+
+    s._state[(1, OLD)][1] = s.tick + 5
+    s.update(_frame([(1, OLD, 0.9)]))
+    assert _tier(s, 1, OLD) == FAST
+    carried, due = _tick(s, quiet)
+    assert carried == set() and due == [1]
+
+
+def test_load_backoff(monkeypatch):
+    monkeypatch.setattr(scheduler_module.os, "cpu_count", lambda: 4)
+    for load, expected in [(2.0, 1.0), (8.0, 2.0), (100.0, 4.0)]:
+        monkeypatch.setattr(scheduler_module.psutil, "getloadavg", lambda: (load, 0.0, 0.0))
+        assert load_backoff(threshold=1.0, max_backoff=4.0) == expected
+
+    def unavailable():
+        raise OSError
+    monkeypatch.setattr(scheduler_module.psutil, "getloadavg", unavailable)
+    assert load_backoff() == 1.0
+
+
+def test_backoff_stretches_slow_cadences(monkeypatch):
+    monkeypatch.setattr(scheduler_module.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(scheduler_module.psutil, "getloadavg", lambda: (2.5, 0.0, 0.0))
+    s = _scheduler(backoff_load=1.0, max_backoff=4.0)
+    s.carry()
+    assert s.backoff == 2.5
+    assert [s.cadence(tier) for tier in (FAST, NORMAL, SLOW)] == [1, 8, 15]
+
+
+# ---------- CARRIED SAMPLES ----------
+def _write_proc(root, pid, rss_pages):
+    d = os.path.join(root, str(pid))
+    os.makedirs(d, exist_ok=True)
+    fields = ["S", "1"] + ["0"] * 9 + ["5", "5"] + ["0"] * 4 + ["1", "0", "100"] + ["0"] * 30
+    with open(os.path.join(d, "stat"), "w") as f:
+        f.write(f"{pid} (idle) {' '.join(fields)}\n")
+    with open(os.path.join(d, "statm"), "w") as f:
+        f.write(f"2441 {rss_pages} 100 10 0 200 0\n")
+
+
+def test_sampler_carries_last_sample(tmp_path):
+    root = str(tmp_path)
+    with open(os.path.join(root, "stat"), "w") as f:
+        f.write("cpu  100 0 100 1000 0 0 0 0 0 0\nbtime 1700000000\n")
+    _write_proc(root, 10, 256)
+    _write_proc(root, 11, 256)
+    sampler = ProcfsSampler(proc_root=root)
+    first = sampler.sample_into(ProcessSnapshot()).records()
+
+    _write_proc(root, 10, 512)
+    _write_proc(root, 11, 512)
+    carried = sampler.sample_into(ProcessSnapshot(), carry={10}).records()
+    by_pid = {row["pid"]: row for row in carried}
+    assert by_pid[10] == next(row for row in first if row["pid"] == 10)
+    assert by_pid[11]["memory_usage"] == pytest.approx(2 * by_pid[10]["memory_usage"])
+
+    # A carried PID that has exited is not repeated
+    os.remove(os.path.join(root, "10", "stat"))
+    os.remove(os.path.join(root, "10", "statm"))
+    os.rmdir(os.path.join(root, "10"))
+    assert [row["pid"] for row in sampler.sample_into(ProcessSnapshot(), carry={10}).records()] == [11]
+    assert 10 not in sampler._last
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src import scoring
+from src.scoring import ScoreCache
+
+FEATURES = ["cpu_usage", "memory_usage"]
+
+
+class CountingEngine:
+    """Scores a row as cpu_usage / 100 and records every row it was asked for"""
+
+    feature_cols = FEATURES
+
+    class forest:
+        classes = np.array([0, 1])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(np.array(X))
+        proba = X[:, 0] / 100.0
+        return (proba >= 0.5).astype(np.int64), proba
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scoring.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _cache(ttl=60):
+    return ScoreCache(tolerances={"cpu_usage": 2.0, "memory_usage": 5.0}, ttl=ttl)
+
+
+def test_hit_within_tolerance_and_miss_outside(clock):
+    engine, cache = CountingEngine(), _cache()
+    keys = [(1, 10.0), (2, 20.0)]
+    labels, proba = cache.score(engine, keys, np.array([[10.0, 100.0], [80.0, 200.0]]))
+    assert labels.tolist() == [0, 1] and proba.tolist() == [0.1, 0.8]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # pid 1 stays in its quantization bucket, pid 2 moves out of it
+    labels, proba = cache.score(engine, keys, np.array([[11.0, 101.0], [20.0, 200.0]]))
+    assert proba.tolist() == [0.1, 0.2]
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert engine.calls[-1].tolist() == [[20.0, 200.0]]
+    assert cache.hit_rate == pytest.approx(0.25)
+
+
+def test_entries_expire_after_ttl(clock):
+    engine, cache = CountingEngine(), _cache(ttl=30)
+    X = np.array([[10.0, 100.0]])
+    cache.score(engine, [(1, 10.0)], X)
+    clock[0] += 29
+    cache.score(engine, [(1, 10.0)], X)
+    assert cache.misses == 1
+    clock[0] += 2
+    cache.score(engine, [(1, 10.0)], X)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_reused_pid_is_rescored(clock):
+    engine, cache = CountingEngine(), _cache()
+    X = np.array([[10.0, 100.0]])
+    cache.score(engine, [(1, 10.0)], X)
+    cache.score(engine, [(1, 99.0)], X)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert list(cache._entries) == [(1, 99.0)]
+
+
+def test_exited_processes_are_dropped(clock):
+    engine, cache = CountingEngine(), _cache()
+    cache.score(engine, [(1, 10.0), (2, 20.0)], np.array([[10.0, 100.0], [20.0, 100.0]]))
+    cache.score(engine, [(2, 20.0)], np.array([[20.0, 100.0]]))
+    assert len(cache) == 1 and cache.hits == 1
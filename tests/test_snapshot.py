@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from src.collector import add_features, build_features
+from src.config import FEATURE_COLS
+from src.snapshot import INTEGER_FEATURES, ProcessSnapshot
+
+SAMPLES = [
+    {"pid": 1, "process_name": "init", "create_time": 1_700_000_000.5, "cpu_usage": 0.5,
+     "memory_usage": 12.25, "num_threads": 1},
+    {"pid": 42, "process_name": "worker", "create_time": 1_700_000_100.0, "cpu_usage": 87.5,
+     "memory_usage": 900.0, "num_threads": 8},
+    {"pid": 7, "process_name": "idle", "create_time": 1_700_000_200.0, "cpu_usage": 0.0,
+     "memory_usage": 1.5, "num_threads": 2},
+]
+
+
+def test_to_frame_columns_and_dtypes():
+    snapshot = add_features(ProcessSnapshot.from_records(SAMPLES),
+                            activity={42: (3, 120, 2)}, entropy=np.array([1.0, 7.5, 4.0]))
+    df = snapshot.to_frame()
+
+    assert list(df.columns) == ["process_name", "pid", "create_time"] + FEATURE_COLS + \
+        ["num_threads", "timestamp"]
+    assert df["pid"].dtype == np.int64
+    assert df["create_time"].dtype == np.float64
+    assert df["num_threads"].dtype == np.int64
+    for col in FEATURE_COLS:
+        assert df[col].dtype == (np.int64 if col in INTEGER_FEATURES else np.float64), col
+    assert pd.api.types.is_string_dtype(df["process_name"])
+    assert pd.api.types.is_string_dtype(df["timestamp"])
+
+    assert df["create_time"].tolist() == [s["create_time"] for s in SAMPLES]
+    assert df.loc[1, ["file_access_count", "network_packets", "network_ports"]].tolist() == [3, 120, 2]
+    assert df["privilege_escalation_attempt"].tolist() == [0, 1, 0]
+    assert df["file_entropy"].tolist() == [1.0, 7.5, 4.0]
+
+
+def test_build_features_matches_snapshot():
+    df = build_features(SAMPLES)
+    assert df["pid"].tolist() == [1, 42, 7]
+    assert df["num_threads"].tolist() == [1, 8, 2]
+    assert df["cpu_usage"].tolist() == [0.5, 87.5, 0.0]
+
+
+def test_growth_keeps_rows():
+    snapshot = ProcessSnapshot(capacity=1)
+    for s in SAMPLES * 3:
+        snapshot.append(s["pid"], s["process_name"], s["create_time"], s["cpu_usage"],
+                        s["memory_usage"], s["num_threads"])
+    assert len(snapshot) == 9 and snapshot.capacity >= 9
+    assert snapshot.records() == SAMPLES * 3
+
+
+def test_feature_matrix_is_a_view_in_own_order():
+    snapshot = ProcessSnapshot.from_records(SAMPLES)
+    matrix = snapshot.feature_matrix()
+    assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+    assert np.shares_memory(matrix, snapshot._features)
+
+    reordered = snapshot.feature_matrix(["memory_usage", "cpu_usage"])
+    assert reordered.tolist() == [[s["memory_usage"], s["cpu_usage"]] for s in SAMPLES]
+
+
+def test_clear_reuses_buffers():
+    snapshot = ProcessSnapshot.from_records(SAMPLES)
+    buffer = snapshot._features
+    snapshot.clear()
+    assert len(snapshot) == 0 and snapshot.to_frame().empty
+    assert snapshot._features is buffer and not buffer.any()
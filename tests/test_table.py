@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.table import (PREDICTION_FILTERS, SORT_COLUMNS, filter_processes, filter_sort_page,
+                       page_count, sort_page)
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(5)
+    n = 95
+    return pd.DataFrame({
+        "host": np.where(np.arange(n) % 2, "web-1", "db-1"),
+        "process_name": [f"{'Nginx' if i % 3 == 0 else 'python'}-{i}" for i in range(n)],
+        "pid": rng.permutation(np.arange(1000, 1000 + n)),
+        "prediction": (np.arange(n) % 4 == 0).astype(np.int64),
+        "threat_probability": rng.permutation(n) / n,
+        "threat_score": rng.permutation(n) / 10,
+        "cpu_usage": rng.permutation(n).astype(float),
+        "memory_usage": rng.permutation(n) * 1.5,
+        "network_packets": rng.permutation(n),
+        "num_threads": rng.permutation(n),
+    })
+
+
+def test_filters(df):
+    assert filter_processes(df) is df
+    assert filter_processes(df, name="nginx")["process_name"].str.startswith("Nginx").all()
+    assert len(filter_processes(df, name="nginx")) == 32
+
+    suspicious = filter_processes(df, prediction=PREDICTION_FILTERS["Suspicious"])
+    assert len(suspicious) == 24 and (suspicious["prediction"] == 1).all()
+    assert len(filter_processes(df, prediction=PREDICTION_FILTERS["Normal"])) == 71
+
+    combined = filter_processes(df, name="python", prediction=0, min_probability=0.5, host="web-1")
+    expected = df[df["process_name"].str.startswith("python") & (df["prediction"] == 0)
+                  & (df["threat_probability"] >= 0.5) & (df["host"] == "web-1")]
+    assert combined.index.tolist() == expected.index.tolist()
+
+
+def test_page_count():
+    assert [page_count(n, 10) for n in (0, 1, 10, 11, 95)] == [1, 1, 1, 2, 10]
+
+
+@pytest.mark.parametrize("sort_by", SORT_COLUMNS)
+@pytest.mark.parametrize("ascending", [False, True])
+def test_pages_match_full_sort(df, sort_by, ascending):
+    full = df.sort_values(sort_by, ascending=ascending, kind="stable")
+    pages = [sort_page(df, sort_by, ascending, page, 10) for page in range(1, page_count(len(df), 10) + 1)]
+    assert [len(page) for page in pages] == [10] * 9 + [5]
+    assert pd.concat(pages).index.tolist() == full.index.tolist()
+
+
+def test_filter_sort_page_clamps_page(df):
+    rows, total = filter_sort_page(df, name="nginx", sort_by="cpu_usage", page=99, page_size=10)
+    assert total == 32
+    nginx = df[df["process_name"].str.startswith("Nginx")].sort_values("cpu_usage", ascending=False)
+    assert rows.index.tolist() == nginx.index[30:].tolist()
+
+    rows, total = filter_sort_page(df, name="no-such-process", page=0, page_size=10)
+    assert total == 0 and rows.empty